@@ -1,14 +1,5 @@
-import pandas as pd
+from engine import run_specs
+from specs import select_specs
 
-# URL de la page FBref
-url = "https://fbref.com/en/comps/Big5/2023-2024/keepersadv/players/2023-2024-Big-5-European-Leagues-Stats"
-
-goalieadv_df = pd.read_html(url, header=1)[0]
-
-goalieadv_df = goalieadv_df.loc[:, ~goalieadv_df.columns.str.contains('^Unnamed')]
-
-goalieadv_df = goalieadv_df[goalieadv_df['Player'] != 'Player']
-
-goalieadv_df = goalieadv_df.reset_index(drop=True)
-
-goalieadv_df.to_csv("goalieadv_cleaned.csv", index=False)
\ No newline at end of file
+# Table FBref "keepersadv" -> goalieadv_cleaned.csv
+run_specs(select_specs(families=["keepersadv"]), layout="legacy")
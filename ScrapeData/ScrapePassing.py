@@ -1,14 +1,5 @@
-import pandas as pd
+from engine import run_specs
+from specs import select_specs
 
-# URL de la page FBref
-url = "https://fbref.com/en/comps/Big5/2023-2024/passing/players/2023-2024-Big-5-European-Leagues-Stats"
-
-passing_df = pd.read_html(url, header=1)[0]
-
-passing_df = passing_df.loc[:, ~passing_df.columns.str.contains('^Unnamed')]
-
-passing_df = passing_df[passing_df['Player'] != 'Player']
-
-passing_df = passing_df.reset_index(drop=True)
-
-passing_df.to_csv("passing_cleaned.csv", index=False)
\ No newline at end of file
+# Table FBref "passing" -> passing_cleaned.csv
+run_specs(select_specs(families=["passing"]), layout="legacy")
@@ -1,14 +1,5 @@
-import pandas as pd
+from engine import run_specs
+from specs import select_specs
 
-# URL de la page FBref
-url = "https://fbref.com/en/comps/Big5/2023-2024/playingtime/players/2023-2024-Big-5-European-Leagues-Stats"
-
-playing_time_df = pd.read_html(url, header=1)[0]
-
-playing_time_df = playing_time_df.loc[:, ~playing_time_df.columns.str.contains('^Unnamed')]
-
-playing_time_df = playing_time_df[playing_time_df['Player'] != 'Player']
-
-playing_time_df = playing_time_df.reset_index(drop=True)
-
-playing_time_df.to_csv("playing_time_cleaned.csv", index=False)
\ No newline at end of file
+# Table FBref "playingtime" -> playing_time_cleaned.csv
+run_specs(select_specs(families=["playingtime"]), layout="legacy")
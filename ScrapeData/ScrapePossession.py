@@ -1,14 +1,5 @@
-import pandas as pd
+from engine import run_specs
+from specs import select_specs
 
-# URL de la page FBref
-url = "https://fbref.com/en/comps/Big5/2023-2024/possession/players/2023-2024-Big-5-European-Leagues-Stats"
-
-possession_df = pd.read_html(url, header=1)[0]
-
-possession_df = possession_df.loc[:, ~possession_df.columns.str.contains('^Unnamed')]
-
-possession_df = possession_df[possession_df['Player'] != 'Player']
-
-possession_df = possession_df.reset_index(drop=True)
-
-possession_df.to_csv("possession_cleaned.csv", index=False)
\ No newline at end of file
+# Table FBref "possession" -> possession_cleaned.csv
+run_specs(select_specs(families=["possession"]), layout="legacy")
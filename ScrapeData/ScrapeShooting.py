@@ -1,14 +1,5 @@
-import pandas as pd
+from engine import run_specs
+from specs import select_specs
 
-# URL de la page FBref
-url = "https://fbref.com/en/comps/Big5/2023-2024/shooting/players/2023-2024-Big-5-European-Leagues-Stats"
-
-shooting_df = pd.read_html(url, header=1)[0]
-
-shooting_df = shooting_df.loc[:, ~shooting_df.columns.str.contains('^Unnamed')]
-
-shooting_df = shooting_df[shooting_df['Player'] != 'Player']
-
-shooting_df = shooting_df.reset_index(drop=True)
-
-shooting_df.to_csv("shooting_cleaned.csv", index=False)
\ No newline at end of file
+# Table FBref "shooting" -> shooting_cleaned.csv
+run_specs(select_specs(families=["shooting"]), layout="legacy")
@@ -0,0 +1,131 @@
+"""
+Benchmark du parsing des tables FBref sur les pages enregistrées (replay.py).
+
+    python ScrapeData/bench.py [--extraction targeted] [--repeat 5]
+                               [--output bench.json] [--baseline bench.json --tolerance 0.2]
+
+Pour chaque famille de tables : pages/s, Mo/s parsés et pic de mémoire
+résidente (RSS). Chaque famille tourne dans un processus neuf pour que le
+pic RSS lui soit propre. Avec --baseline, le script échoue (code 1) si une
+famille est plus lente que la référence au-delà de la tolérance : c'est la
+garde de non-régression des changements du parsing.
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+from engine import EXTRACTION_MODES, clean_table, parse_document, table_from_document
+from extract import read_table
+from replay import FIXTURES_DIR, fixture_path
+from specs import KINDS, select_specs
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Ko sous Linux, octets sous macOS
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def _bench_family(pages, extraction, repeat):
+    """pages : liste de (chemin de fixture, id de table). Exécuté dans un processus dédié."""
+    htmls = [(Path(path).read_text(encoding="utf-8"), table_id) for path, table_id in pages]
+    size = sum(len(html.encode("utf-8")) for html, _ in htmls)
+
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html, table_id in htmls:
+            if extraction == "targeted":
+                df = clean_table(read_table(html, table_id))
+            else:
+                df = table_from_document(parse_document(html), table_id)
+            rows += len(df)
+    elapsed = time.perf_counter() - start
+
+    n_pages = len(htmls) * repeat
+    return {
+        'pages': n_pages,
+        'rows': rows,
+        'seconds': elapsed,
+        'pages_per_s': n_pages / elapsed,
+        'mb_per_s': size * repeat / 1e6 / elapsed,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def fixtures_by_family(fixtures_dir=FIXTURES_DIR):
+    families = {}
+    for spec in select_specs(kinds=list(KINDS)):
+        path = fixture_path(spec.url, fixtures_dir)
+        if path.exists():
+            families.setdefault(spec.family, []).append((str(path), spec.table_id))
+    return families
+
+
+def run_bench(fixtures_dir=FIXTURES_DIR, extraction="targeted", repeat=5):
+    families = fixtures_by_family(fixtures_dir)
+    if not families:
+        raise FileNotFoundError(f"Aucune fixture dans {fixtures_dir} (lancer replay.py record ou synthesize)")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for family, pages in sorted(families.items()):
+        with ctx.Pool(1) as pool:
+            results[family] = pool.apply(_bench_family, (pages, extraction, repeat))
+        res = results[family]
+        rss = "n/a" if res['peak_rss_mb'] is None else f"{res['peak_rss_mb']:.0f} Mo"
+        print(f"  {family:<14} {res['pages_per_s']:7.2f} pages/s  {res['mb_per_s']:7.2f} Mo/s  pic RSS {rss}")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Familles dont le débit (pages/s) a baissé de plus de `tolerance`."""
+    regressions = []
+    for family, res in results.items():
+        ref = baseline.get(family)
+        if ref and res['pages_per_s'] < ref['pages_per_s'] * (1 - tolerance):
+            regressions.append((family, ref['pages_per_s'], res['pages_per_s']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du parsing des tables FBref")
+    parser.add_argument('--fixtures-dir', default=FIXTURES_DIR)
+    parser.add_argument('--extraction', choices=EXTRACTION_MODES, default="targeted")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None, help="Écrit les résultats en JSON")
+    parser.add_argument('--baseline', default=None, help="Résultats JSON de référence")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Baisse de débit tolérée par rapport à la référence (0.2 = 20 %%)")
+    args = parser.parse_args(argv)
+
+    print(f"Benchmark parsing ({args.extraction}, {args.repeat} passes)")
+    results = run_bench(args.fixtures_dir, args.extraction, args.repeat)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for family, ref, now in regressions:
+            print(f"  RÉGRESSION {family} : {ref:.2f} -> {now:.2f} pages/s")
+        if regressions:
+            sys.exit(1)
+        print("Aucune régression par rapport à la référence.")
+
+
+if __name__ == "__main__":
+    main()
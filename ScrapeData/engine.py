@@ -0,0 +1,275 @@
+"""
+Moteur de scraping piloté par les specs (specs.py).
+
+Toutes les tables d'un run partagent le même client HTTP (limite de débit,
+retry), le cache HTML et les documents déjà parsés : une page n'est
+téléchargée et parsée qu'une fois, même si plusieurs specs la lisent.
+
+Les sorties sont rangées par partition saison/compétition
+(data/season=2023-2024/comp=Big5/...). Chaque table est typée selon son
+schéma (schemas.py) et écrite en CSV et en Parquet. En mode incrémental, seules les
+partitions absentes ou périmées sont téléchargées ; le manifeste est écrit
+après chaque page, un run interrompu reprend là où il s'est arrêté.
+
+Deux modes d'extraction :
+    targeted  (défaut) seul le fragment de la table visée est parsé (extract.py)
+    document  toute la page est parsée avec lxml puis la table est lue par pd.read_html
+"""
+import copy
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import lxml.html
+import pandas as pd
+
+from extract import TableNotFound, add_player_id_cells, read_table
+from html_cache import HtmlCache
+from schemas import apply_schema
+from specs import DEFAULT_DATA_DIR, LAYOUTS, group_by_page, season_is_closed
+
+MANIFEST_NAME = ".scrape_manifest.json"
+
+EXTRACTION_MODES = ("targeted", "document")
+
+# Une partition de la saison en cours est rafraîchie au plus une fois par jour
+DEFAULT_STALE_AFTER = 24 * 3600
+
+
+def clean_table(df):
+    """Supprime les colonnes 'Unnamed' et les lignes d'en-tête répétées."""
+    df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+    # Tables joueurs : clé 'Player' ; tables équipes : clé 'Squad'
+    key = 'Player' if 'Player' in df.columns else 'Squad'
+    df = df[df[key] != key]
+    return df.reset_index(drop=True)
+
+
+def load_manifest(output_dir):
+    """Pour chaque fichier déjà produit : empreinte (sha256) de la page source,
+    date de récupération et nombre de lignes."""
+    path = Path(output_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    # Ancien format : fichier -> sha256
+    return {
+        key: entry if isinstance(entry, dict) else {"sha256": entry, "fetched_at": 0, "rows": None}
+        for key, entry in manifest.items()
+    }
+
+
+def save_manifest(output_dir, manifest):
+    path = Path(output_dir) / MANIFEST_NAME
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def parse_document(html):
+    """Arbre lxml de toute la page ; les tables que FBref place en commentaire
+    HTML sont rendues visibles."""
+    return lxml.html.fromstring(html.replace("<!--", "").replace("-->", ""))
+
+
+def table_from_document(doc, table_id, player_ids=False):
+    table = doc.get_element_by_id(table_id, None)
+    if table is None:
+        raise TableNotFound(table_id)
+    if player_ids:
+        # Copie : le document est partagé par les specs de la même page
+        table = add_player_id_cells(copy.deepcopy(table))
+    fragment = lxml.html.tostring(table, encoding="unicode")
+    return clean_table(pd.read_html(io.StringIO(fragment), header=1)[0])
+
+
+def write_outputs_atomic(df, output):
+    """Écrit le CSV et sa version Parquet typée. Chaque fichier est soit
+    complet, soit absent (reprise après interruption) ; le Parquet est écrit
+    en dernier : c'est lui qui marque la table comme produite, et il reste
+    ainsi la version la plus récente (préférée par storage.read_table)."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(output.name + ".tmp")
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, output)
+
+    parquet = output.with_suffix('.parquet')
+    tmp = parquet.with_name(parquet.name + ".tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, parquet)
+
+
+def is_written(output):
+    return output.with_suffix('.parquet').exists()
+
+
+class ScrapeEngine:
+    def __init__(self, cache=None, output_dir=None, workers=4, force=False, extraction="targeted",
+                 layout="partitioned", incremental=False, stale_after=DEFAULT_STALE_AFTER, verbose=True):
+        if extraction not in EXTRACTION_MODES:
+            raise ValueError(f"Mode d'extraction inconnu : {extraction}")
+        if layout not in LAYOUTS:
+            raise ValueError(f"Disposition inconnue : {layout}")
+        self.extraction = extraction
+        self.layout = layout
+        self.cache = cache if cache is not None else HtmlCache()
+        if output_dir is None:
+            output_dir = DEFAULT_DATA_DIR if layout == "partitioned" else Path(__file__).parent
+        self.output_dir = Path(output_dir)
+        self.workers = workers
+        self.force = force
+        self.incremental = incremental
+        self.stale_after = stale_after
+        self.verbose = verbose
+        self._pages = {}
+        self._documents = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def page(self, url):
+        """(html, sha256, source) ; une seule requête par URL et par run,
+        même si un autre run_page demande la même page."""
+        with self._key_lock(("page", url)):
+            if url not in self._pages:
+                self._pages[url] = self.cache.get(url)
+            return self._pages[url]
+
+    def document(self, digest, html):
+        """Arbre lxml de la page, parsé une seule fois par contenu."""
+        with self._key_lock(("doc", digest)):
+            if digest not in self._documents:
+                self._documents[digest] = parse_document(html)
+            return self._documents[digest]
+
+    def extract(self, spec, digest, html):
+        # Tables joueurs : identifiant FBref de chaque joueur (colonne FbrefID)
+        player_ids = spec.kind == "players"
+        if self.extraction == "targeted":
+            return clean_table(read_table(html, spec.table_id, player_ids=player_ids))
+        return table_from_document(self.document(digest, html), spec.table_id, player_ids=player_ids)
+
+    def run_page(self, url, specs, known_digests):
+        """Télécharge une page une seule fois et en extrait toutes les tables
+        demandées (joueurs, équipes pour / contre). Renvoie une ligne de
+        timings par table.
+
+        Les tables dont la page a la même empreinte que lors du run précédent
+        et dont le fichier de sortie existe ne sont pas re-parsées."""
+        start = time.perf_counter()
+        html, digest, source = self.page(url)
+        fetch_s = time.perf_counter() - start
+
+        results = []
+        for spec in specs:
+            table_start = time.perf_counter()
+            output = self.output_path(spec)
+            rows = None
+            if digest == known_digests.get(spec) and is_written(output):
+                table_source = source + "+unchanged"
+            else:
+                df = apply_schema(self.extract(spec, digest, html), spec.family)
+                write_outputs_atomic(df, output)
+                rows = len(df)
+                table_source = source
+            parse_s = time.perf_counter() - table_start
+
+            results.append({
+                'table': self.manifest_key(spec),
+                'rows': rows,
+                'source': table_source,
+                'sha256': digest,
+                'fetch_s': fetch_s,
+                'parse_s': parse_s,
+                'total_s': fetch_s + parse_s,
+            })
+        return results
+
+    def output_path(self, spec):
+        return spec.output_path(self.output_dir, self.layout)
+
+    def manifest_key(self, spec):
+        return self.output_path(spec).relative_to(self.output_dir).as_posix()
+
+    def is_stale(self, spec, entry):
+        """Partition à (re)télécharger : absente, jamais enregistrée, ou de la
+        saison en cours et plus ancienne que stale_after."""
+        if entry is None or not is_written(self.output_path(spec)):
+            return True
+        if season_is_closed(spec.season):
+            return False
+        return time.time() - entry["fetched_at"] > self.stale_after
+
+    def run(self, specs):
+        """Exécute les specs en parallèle et renvoie un DataFrame de timings."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = load_manifest(self.output_dir)
+        results = []
+        errors = {}
+        start = time.perf_counter()
+
+        if self.incremental:
+            todo = [spec for spec in specs if self.is_stale(spec, manifest.get(self.manifest_key(spec)))]
+            if self.verbose:
+                print(f"Mode incrémental : {len(specs) - len(todo)} partitions à jour, {len(todo)} à récupérer")
+            specs = todo
+
+        pages = group_by_page(specs)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {}
+            for url, page_specs in pages.items():
+                known = {} if self.force else {
+                    spec: manifest.get(self.manifest_key(spec), {}).get("sha256") for spec in page_specs
+                }
+                futures[pool.submit(self.run_page, url, page_specs, known)] = page_specs
+            for future in as_completed(futures):
+                try:
+                    page_results = future.result()
+                except Exception as e:
+                    for spec in futures[future]:
+                        errors[self.manifest_key(spec)] = e
+                    if self.verbose:
+                        print(f"  ERREUR {futures[future][0].url} : {e}")
+                    continue
+                for res in page_results:
+                    results.append(res)
+                    previous = manifest.get(res['table'], {})
+                    manifest[res['table']] = {
+                        "sha256": res['sha256'],
+                        "fetched_at": time.time(),
+                        "rows": previous.get("rows") if res['rows'] is None else res['rows'],
+                    }
+                    if self.verbose:
+                        rows = "inchangée" if res['rows'] is None else f"{res['rows']} lignes"
+                        print(f"  {res['table']} : {rows} en {res['total_s']:.2f}s [{res['source']}] "
+                              f"(téléchargement {res['fetch_s']:.2f}s, parsing {res['parse_s']:.2f}s)")
+                # Sauvegarde après chaque page : un run interrompu peut reprendre
+                save_manifest(self.output_dir, manifest)
+
+        wall = time.perf_counter() - start
+        self.cache.flush()
+        self._pages.clear()
+        self._documents.clear()
+
+        if self.verbose:
+            print(f"\n{len(results)}/{len(specs)} tables récupérées depuis {len(pages)} pages "
+                  f"en {wall:.2f}s (temps mur total)")
+
+        if errors:
+            raise RuntimeError(f"Échec du scraping pour : {sorted(errors)}")
+
+        return pd.DataFrame(results, columns=['table', 'rows', 'source', 'fetch_s', 'parse_s', 'total_s'])
+
+
+def run_specs(specs, **kwargs):
+    """Raccourci : exécute les specs avec un moteur par défaut."""
+    return ScrapeEngine(**kwargs).run(specs)
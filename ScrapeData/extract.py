@@ -0,0 +1,156 @@
+"""
+Extraction ciblée d'une table FBref par son id.
+
+Au lieu de parser tout le document (pd.read_html parse chaque table de la
+page, y compris celles cachées en commentaire HTML), on repère la table dans
+le texte brut, on découpe son fragment et on le lit avec un parser lxml
+incrémental ligne par ligne. Les lignes déjà lues sont libérées au fil de
+l'eau, la mémoire reste bornée à une ligne de tableau.
+
+Les tables joueurs peuvent recevoir une colonne FbrefID : l'identifiant
+FBref du joueur (attribut data-append-csv de sa cellule), stable d'un club
+et d'une saison à l'autre, contrairement au nom.
+"""
+import re
+
+from lxml import etree
+from pandas.io.parsers import TextParser
+
+CHUNK_SIZE = 64 * 1024
+
+PLAYER_ID_COLUMN = "FbrefID"
+
+_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+_TEXT = etree.XPath("string()")
+
+
+class TableNotFound(LookupError):
+    """Aucune table avec cet id dans la page."""
+
+
+def find_table_fragment(html, table_id):
+    """Renvoie le texte '<table id=...>...</table>' de la table demandée,
+    qu'elle soit dans le DOM ou dans un commentaire HTML."""
+    match = re.search(r'<table\b[^>]*\bid=["\']%s["\']' % re.escape(table_id), html)
+    if match is None:
+        raise TableNotFound(table_id)
+    # Les tables FBref ne sont jamais imbriquées
+    end = html.find("</table>", match.end())
+    if end == -1:
+        raise TableNotFound(f"{table_id} (balise fermante absente)")
+    return html[match.start():end + len("</table>")]
+
+
+def _cell_text(cell):
+    text = cell.text if len(cell) == 0 else _TEXT(cell)
+    if not text:
+        return ""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _row_cells(row):
+    cells = []
+    for cell in row:
+        if cell.tag not in ("th", "td"):
+            continue
+        text = _cell_text(cell)
+        try:
+            span = int(cell.get("colspan", 1))
+        except ValueError:
+            span = 1
+        cells.extend([text] * span)
+    return cells
+
+
+def _player_cell(row):
+    for cell in row:
+        if cell.get("data-stat") == "player":
+            return cell
+    return None
+
+
+def _row_cells_with_player_id(row):
+    cell = _player_cell(row)
+    return _row_cells(row) + [cell.get("data-append-csv", "") if cell is not None else ""]
+
+
+def iter_table_rows(fragment, row_parser=_row_cells):
+    """Génère ('head' | 'body', row_parser(ligne)) pour chaque ligne du fragment.
+    Les en-têtes répétés dans le corps (class="thead") et le pied de table
+    (totaux des pages de match logs) sont ignorés."""
+    parser = etree.HTMLPullParser(events=("start", "end"), tag=("tbody", "tfoot", "tr"))
+    section = "head"
+
+    for offset in range(0, len(fragment), CHUNK_SIZE):
+        parser.feed(fragment[offset:offset + CHUNK_SIZE])
+        for event, el in parser.read_events():
+            if el.tag in ("tbody", "tfoot"):
+                section = "body" if el.tag == "tbody" else "foot"
+                continue
+            if event == "start":
+                continue
+
+            classes = (el.get("class") or "").split()
+            if section == "head":
+                yield "head", row_parser(el)
+            elif section == "body" and "thead" not in classes and "spacer" not in classes:
+                yield "body", row_parser(el)
+
+            # Libère la ligne et ses sœurs déjà traitées
+            el.clear()
+            parent = el.getparent()
+            while el.getprevious() is not None:
+                del parent[0]
+    parser.close()
+
+
+def read_table(html, table_id, header=None, player_ids=False):
+    """Lit une seule table de la page dans un DataFrame.
+
+    header : index de la ligne d'en-tête à utiliser (défaut : la dernière
+    ligne du <thead>, c'est-à-dire header=1 pour les tables FBref à deux
+    niveaux, comme pd.read_html(url, header=1)). L'inférence des types est
+    celle de pd.read_html.
+    player_ids : ajoute la colonne FbrefID (vide pour une ligne sans joueur).
+    """
+    row_parser = _row_cells_with_player_id if player_ids else _row_cells
+    head, body = [], []
+    for section, cells in iter_table_rows(find_table_fragment(html, table_id), row_parser):
+        if section == "head" and player_ids:
+            cells[-1] = PLAYER_ID_COLUMN
+        (head if section == "head" else body).append(cells)
+
+    if header is None:
+        header = max(len(head) - 1, 0)
+
+    return TextParser(head + body, header=header, thousands=",").read()
+
+
+def _player_link(row):
+    cell = _player_cell(row)
+    if cell is None:
+        return None
+    link = cell.find("a")
+    return _cell_text(cell), cell.get("data-append-csv"), link.get("href") if link is not None else None
+
+
+def add_player_id_cells(table):
+    """Ajoute à une table lxml (mode document) une cellule FbrefID par ligne,
+    lue ensuite par pd.read_html comme une colonne ordinaire."""
+    for row in table.iter("tr"):
+        cell = _player_cell(row)
+        if row.getparent() is not None and row.getparent().tag == "thead":
+            value, tag = PLAYER_ID_COLUMN, "th"
+        else:
+            value, tag = cell.get("data-append-csv", "") if cell is not None else "", "td"
+        etree.SubElement(row, tag).text = value
+    return table
+
+
+def read_player_links(html, table_id):
+    """Liste (Player, identifiant FBref, lien de la fiche) des lignes d'une table joueurs."""
+    links = []
+    for section, link in iter_table_rows(find_table_fragment(html, table_id), row_parser=_player_link):
+        if section == "body" and link is not None and link[1]:
+            links.append(link)
+    return links
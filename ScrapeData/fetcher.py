@@ -0,0 +1,100 @@
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+
+USER_AGENT = "Mozilla/5.0 (SoccerStats scraper)"
+
+# FBref tolère environ 10 requêtes par minute et par client
+DEFAULT_MIN_INTERVAL = 6.0
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class HostRateLimiter:
+    """Espace les requêtes vers un même hôte d'au moins `min_interval` secondes."""
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        # Réservation du créneau sous verrou, attente hors verrou
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Fetcher:
+    """Client HTTP partagé entre threads : limite par hôte + retry avec backoff exponentiel."""
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL, retries=4, backoff=2.0, timeout=30, base_url=None):
+        self.limiter = HostRateLimiter(min_interval)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.base_url = base_url.rstrip('/') if base_url else None
+
+    def resolve(self, url):
+        """Redirige l'URL vers `base_url` (serveur local de test) en conservant le chemin."""
+        if not self.base_url:
+            return url
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        return self.base_url + path
+
+    def request(self, url, headers=None):
+        """Renvoie (status, headers, corps en bytes). Les 304 sont renvoyés tels quels."""
+        url = self.resolve(url)
+        host = urlsplit(url).netloc
+        req_headers = {"User-Agent": USER_AGENT}
+        req_headers.update(headers or {})
+
+        for attempt in range(self.retries + 1):
+            self.limiter.wait(host)
+            req = urllib.request.Request(url, headers=req_headers)
+            try:
+                with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                    return resp.status, dict(resp.headers), resp.read()
+            except urllib.error.HTTPError as e:
+                if e.code == 304:
+                    return 304, dict(e.headers), b""
+                if e.code not in RETRY_STATUS or attempt == self.retries:
+                    raise
+                delay = self._retry_after(e) or self._backoff_delay(attempt)
+            except (urllib.error.URLError, TimeoutError, ConnectionError):
+                if attempt == self.retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+            time.sleep(delay)
+
+    def fetch(self, url):
+        """Télécharge une page et la renvoie décodée."""
+        status, headers, body = self.request(url)
+        return decode_body(headers, body)
+
+    def _backoff_delay(self, attempt):
+        return self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+
+    @staticmethod
+    def _retry_after(error):
+        value = error.headers.get("Retry-After") if error.headers else None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+
+def decode_body(headers, body):
+    content_type = headers.get("Content-Type", "")
+    charset = "utf-8"
+    if "charset=" in content_type:
+        charset = content_type.split("charset=")[-1].split(";")[0].strip()
+    return body.decode(charset, errors="replace")
@@ -0,0 +1,154 @@
+"""
+Cache disque des pages HTML brutes, adressé par contenu.
+
+    <cache_dir>/objects/<sha256>.html   corps de la page (dédupliqué)
+    <cache_dir>/index.json              url -> sha256, ETag, Last-Modified, date de récupération
+
+Chaque page déjà en cache est revalidée par requête conditionnelle
+(If-None-Match / If-Modified-Since) : un 304 ne transfère aucun corps.
+En mode hors ligne, seules les pages en cache sont servies.
+
+L'index est réécrit au plus toutes les INDEX_SAVE_INTERVAL secondes (et à
+la fin du run) : sur des milliers de pages, le réécrire à chaque page
+coûterait plus cher que les pages elles-mêmes. Une entrée perdue lors
+d'un arrêt brutal se traduit seulement par un nouveau téléchargement.
+"""
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from fetcher import Fetcher, decode_body
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / ".html_cache"
+INDEX_SAVE_INTERVAL = 5.0
+
+
+class OfflineCacheMiss(LookupError):
+    """Page absente du cache alors que le mode hors ligne est actif."""
+
+
+def _atomic_write(path, data):
+    """Écrit data (octets) dans path via un fichier temporaire propre à
+    l'appel : deux threads qui écrivent le même fichier ne partagent pas
+    de fichier temporaire."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp",
+                                     delete=False) as f:
+        f.write(data)
+    try:
+        os.replace(f.name, path)
+    except OSError:
+        os.unlink(f.name)
+        raise
+
+
+class HtmlCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, fetcher=None, offline=False, max_age=0):
+        """
+        max_age : durée (s) pendant laquelle une page récupérée est réutilisée
+        sans même être revalidée.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_path = self.cache_dir / "index.json"
+        self.fetcher = fetcher if fetcher is not None else Fetcher()
+        self.offline = offline
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._index = self._load_index()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        atexit.register(self.flush)
+
+    def _load_index(self):
+        if self.index_path.exists():
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        return {}
+
+    def _save_index(self):
+        # Écriture atomique : un run interrompu ne corrompt pas l'index
+        _atomic_write(self.index_path, json.dumps(self._index, indent=1, sort_keys=True).encode("utf-8"))
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def _mark_dirty(self):
+        # Appelé sous self._lock
+        self._dirty = True
+        if time.monotonic() - self._last_save >= INDEX_SAVE_INTERVAL:
+            self._save_index()
+
+    def flush(self):
+        """Écrit l'index s'il a changé depuis la dernière sauvegarde."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def _object_path(self, digest):
+        return self.objects_dir / f"{digest}.html"
+
+    def _read_object(self, digest):
+        return self._object_path(digest).read_bytes()
+
+    def _store(self, url, body, headers):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            _atomic_write(path, body)
+        with self._lock:
+            self._index[url] = {
+                "sha256": digest,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "content_type": headers.get("Content-Type", ""),
+                "fetched_at": time.time(),
+            }
+            self._mark_dirty()
+        return digest
+
+    def _touch(self, url):
+        with self._lock:
+            self._index[url]["fetched_at"] = time.time()
+            self._mark_dirty()
+
+    def get(self, url):
+        """Renvoie (html décodé, sha256 du contenu, source) où source vaut
+        'cache', 'not-modified' ou 'network'."""
+        with self._lock:
+            entry = self._index.get(url)
+        cached = entry is not None and self._object_path(entry["sha256"]).exists()
+
+        if self.offline:
+            if not cached:
+                raise OfflineCacheMiss(url)
+            return self._decode(entry), entry["sha256"], "cache"
+
+        if cached and time.time() - entry["fetched_at"] < self.max_age:
+            return self._decode(entry), entry["sha256"], "cache"
+
+        headers = {}
+        if cached:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        status, resp_headers, body = self.fetcher.request(url, headers=headers)
+        if status == 304 and cached:
+            self._touch(url)
+            return self._decode(entry), entry["sha256"], "not-modified"
+
+        digest = self._store(url, body, resp_headers)
+        return decode_body(resp_headers, body), digest, "network"
+
+    def fetch(self, url):
+        """Même interface que Fetcher.fetch."""
+        return self.get(url)[0]
+
+    def _decode(self, entry):
+        return decode_body({"Content-Type": entry.get("content_type", "")}, self._read_object(entry["sha256"]))
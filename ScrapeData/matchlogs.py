@@ -0,0 +1,263 @@
+"""
+Scraping des match logs par joueur (environ 2 800 pages par saison Big5).
+
+    python ScrapeData/matchlogs.py --season 2023-2024 [--workers 8] [--rps 0.16]
+                                   [--base-url http://127.0.0.1:8000] [--limit 100]
+
+- La liste des joueurs (et leurs identifiants FBref) vient de la table
+  joueurs de la page "stats" de la saison.
+- Les pages à récupérer sont placées dans une file persistante (SQLite) :
+  un run interrompu reprend avec les pages encore en attente.
+- Un pool de threads borné récupère les pages ; le débit global est limité
+  par --rps (requêtes par seconde vers l'hôte).
+- Les résultats sont écrits en Parquet par lots, partitionnés par saison et
+  compétition : data/matchlogs/season=<saison>/comp=<compétition>/part-*.parquet,
+  au schéma fixe schemas.MATCHLOG_SCHEMA. Un lot est nommé d'après ses
+  joueurs (réécrire le même lot remplace le fichier) ; ses pages sont
+  marquées terminées, avec le nom du fichier, dans une seule transaction
+  après l'écriture. Un fichier qu'aucune page ne référence (run interrompu
+  entre l'écriture et la transaction) est supprimé au lancement suivant :
+  ses pages, encore en attente, sont récupérées à nouveau.
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+
+from extract import TableNotFound, read_player_links, read_table
+from fetcher import Fetcher
+from html_cache import DEFAULT_CACHE_DIR, HtmlCache
+from schemas import apply_matchlog_schema
+from specs import DEFAULT_COMPETITION, DEFAULT_DATA_DIR, DEFAULT_SEASON, TableSpec, partition_dir
+
+MATCHLOGS_DIR = DEFAULT_DATA_DIR / "matchlogs"
+MATCHLOG_TABLE_ID = "matchlogs_all"
+FBREF_ROOT = "https://fbref.com"
+
+# Nombre de joueurs par fichier Parquet
+DEFAULT_FLUSH_EVERY = 200
+MAX_ATTEMPTS = 3
+
+
+def matchlog_url(href, season):
+    """/en/players/<id>/<Nom> -> page des match logs de la saison."""
+    parts = href.strip("/").split("/")
+    player_id, slug = parts[2], parts[-1]
+    return f"{FBREF_ROOT}/en/players/{player_id}/matchlogs/{season}/summary/{slug}-Match-Logs"
+
+
+class WorkQueue:
+    """File de travail persistante : une ligne par page, état pending / done / failed."""
+
+    def __init__(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                player_id TEXT PRIMARY KEY,
+                player TEXT,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                part TEXT,
+                updated_at REAL
+            )""")
+        self.conn.commit()
+
+    def enqueue(self, tasks):
+        """tasks : itérable de (player_id, player, url) ; les pages déjà connues sont ignorées."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tasks (player_id, player, url) VALUES (?, ?, ?)", tasks
+            )
+
+    def pending(self, limit=None):
+        query = ("SELECT player_id, player, url FROM tasks "
+                 "WHERE status = 'pending' OR (status = 'failed' AND attempts < ?) ORDER BY player_id")
+        params = [MAX_ATTEMPTS]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.conn.execute(query, params).fetchall()
+
+    def mark_done(self, player_ids, part=None):
+        """Pages terminées et fichier de leur lot (None : lot sans match log)."""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE tasks SET status = 'done', error = NULL, part = ?, updated_at = ? WHERE player_id = ?",
+                [(part, time.time(), pid) for pid in player_ids],
+            )
+
+    def parts(self):
+        """Fichiers Parquet référencés par des pages terminées."""
+        return {row[0] for row in self.conn.execute("SELECT DISTINCT part FROM tasks WHERE part IS NOT NULL")}
+
+    def mark_failed(self, player_id, error):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE tasks SET status = 'failed', attempts = attempts + 1, error = ?, updated_at = ? "
+                "WHERE player_id = ?",
+                (str(error)[:500], time.time(), player_id),
+            )
+
+    def counts(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+
+
+def fetch_matchlog(cache, player_id, player, url):
+    html = cache.fetch(url)
+    try:
+        df = read_table(html, MATCHLOG_TABLE_ID)
+    except TableNotFound:
+        # Joueur sans match log pour la saison : page valide, table vide
+        return pd.DataFrame()
+    df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+    if 'Date' in df.columns:
+        df = df[df['Date'].notna() & (df['Date'] != 'Date')]
+    df.insert(0, 'player_id', player_id)
+    df.insert(1, 'Player', player)
+    return df
+
+
+def part_name(player_ids):
+    """Nom du fichier d'un lot, déterminé par ses joueurs."""
+    digest = hashlib.sha1("\n".join(sorted(player_ids)).encode()).hexdigest()[:16]
+    return f"part-{digest}.parquet"
+
+
+def write_part(frames, output_dir, player_ids):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / part_name(player_ids)
+    tmp = path.with_name(path.name + ".tmp")
+    apply_matchlog_schema(pd.concat(frames, ignore_index=True)).to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def remove_orphan_parts(output_dir, queue, verbose=True):
+    """Supprime les fichiers de lot qu'aucune page terminée ne référence."""
+    known = queue.parts()
+    orphans = [path for path in output_dir.glob("part-*.parquet*") if path.name not in known]
+    for path in orphans:
+        path.unlink()
+        if verbose:
+            print(f"  {path.name} non référencé par la file : supprimé")
+    return orphans
+
+
+def list_players(cache, season, competition):
+    """Joueurs de la saison d'après la table joueurs de la page 'stats'."""
+    spec = TableSpec("stats", season, competition)
+    html = cache.fetch(spec.url)
+    seen = {}
+    for player, player_id, href in read_player_links(html, spec.table_id):
+        # Un joueur transféré apparaît une fois par club
+        if href and player_id not in seen:
+            seen[player_id] = (player_id, player, matchlog_url(href, season))
+    return list(seen.values())
+
+
+def scrape_matchlogs(cache, season=DEFAULT_SEASON, competition=DEFAULT_COMPETITION, output_root=MATCHLOGS_DIR,
+                     workers=8, flush_every=DEFAULT_FLUSH_EVERY, limit=None, verbose=True):
+    output_dir = partition_dir(output_root, season, competition)
+    queue = WorkQueue(output_dir / "_queue.sqlite")
+    remove_orphan_parts(output_dir, queue, verbose)
+
+    queue.enqueue(list_players(cache, season, competition))
+    tasks = queue.pending(limit)
+    if verbose:
+        print(f"File de travail : {queue.counts()} ; {len(tasks)} pages à récupérer")
+
+    buffer, buffered_ids = [], []
+    done = failed = 0
+    start = time.perf_counter()
+
+    def flush():
+        nonlocal buffer, buffered_ids
+        frames = [f for f in buffer if not f.empty]
+        part = write_part(frames, output_dir, buffered_ids).name if frames else None
+        queue.mark_done(buffered_ids, part)
+        buffer, buffered_ids = [], []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        todo = iter(tasks)
+        in_flight = {}
+
+        # Fenêtre bornée : au plus 2 × workers pages en cours
+        def refill():
+            while len(in_flight) < 2 * workers:
+                task = next(todo, None)
+                if task is None:
+                    return
+                in_flight[pool.submit(fetch_matchlog, cache, *task)] = task
+
+        refill()
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                player_id = in_flight.pop(future)[0]
+                try:
+                    buffer.append(future.result())
+                    buffered_ids.append(player_id)
+                    done += 1
+                except Exception as e:
+                    queue.mark_failed(player_id, e)
+                    failed += 1
+                    if verbose:
+                        print(f"  ERREUR {player_id} : {e}")
+            if len(buffered_ids) >= flush_every:
+                flush()
+                if verbose:
+                    elapsed = time.perf_counter() - start
+                    print(f"  {done} pages ({done / elapsed * 3600:.0f} pages/h)")
+            refill()
+
+    flush()
+    cache.flush()
+    elapsed = time.perf_counter() - start
+    if verbose:
+        rate = done / elapsed * 3600 if elapsed else 0.0
+        print(f"\n{done} pages récupérées, {failed} échecs en {elapsed:.1f}s ({rate:.0f} pages/h)")
+        print(f"File de travail : {queue.counts()}")
+    return done, failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping des match logs par joueur")
+    parser.add_argument('--season', default=DEFAULT_SEASON)
+    parser.add_argument('--competition', default=DEFAULT_COMPETITION)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rps', type=float, default=1 / 6,
+                        help="Budget de requêtes par seconde vers l'hôte (défaut : 10 par minute)")
+    parser.add_argument('--retries', type=int, default=4)
+    parser.add_argument('--base-url', default=None,
+                        help="Serveur local servant des pages enregistrées")
+    parser.add_argument('--output-dir', default=MATCHLOGS_DIR)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--offline', action='store_true')
+    parser.add_argument('--flush-every', type=int, default=DEFAULT_FLUSH_EVERY,
+                        help="Nombre de joueurs par fichier Parquet")
+    parser.add_argument('--limit', type=int, default=None, help="Nombre maximal de pages pour ce run")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fetcher = Fetcher(min_interval=1 / args.rps, retries=args.retries, base_url=args.base_url)
+    cache = HtmlCache(args.cache_dir, fetcher=fetcher, offline=args.offline)
+
+    print("=" * 60)
+    print(f"MATCH LOGS {args.competition} {args.season}")
+    print("=" * 60)
+    scrape_matchlogs(cache, args.season, args.competition, Path(args.output_dir), workers=args.workers,
+                     flush_every=args.flush_every, limit=args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Mode rejeu : sert des pages FBref enregistrées depuis un serveur HTTP local.
+
+    python ScrapeData/replay.py record       # copie les pages du cache HTML vers fixtures/
+    python ScrapeData/replay.py synthesize   # fabrique des pages à partir des *_cleaned.csv
+    python ScrapeData/replay.py serve --port 8000
+
+puis :
+
+    python ScrapeData/scrape_all.py --base-url http://127.0.0.1:8000 --min-interval 0
+
+Une page est rangée sous fixtures/<chemin de l'URL>.html. Le serveur gère
+ETag / If-None-Match pour que le cache HTML se comporte comme en ligne.
+"""
+import argparse
+import hashlib
+import html as html_lib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+import pandas as pd
+
+from extract import PLAYER_ID_COLUMN
+from html_cache import DEFAULT_CACHE_DIR
+from specs import select_specs
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def fixture_path(url, fixtures_dir=FIXTURES_DIR):
+    path = unquote(urlsplit(url).path).strip("/")
+    return Path(fixtures_dir) / f"{path}.html"
+
+
+def record(cache_dir=DEFAULT_CACHE_DIR, fixtures_dir=FIXTURES_DIR):
+    """Copie toutes les pages du cache HTML dans le dossier de fixtures et
+    signale les tables des scripts Scrape*.py qui n'y sont pas."""
+    cache_dir = Path(cache_dir)
+    with open(cache_dir / "index.json", encoding="utf-8") as f:
+        index = json.load(f)
+
+    for url, entry in sorted(index.items()):
+        target = fixture_path(url, fixtures_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes((cache_dir / "objects" / f"{entry['sha256']}.html").read_bytes())
+
+    missing = sorted({spec.url for spec in select_specs()} - set(index))
+    for url in missing:
+        print(f"  absente du cache : {url}")
+    print(f"{len(index)} pages enregistrées dans {fixtures_dir}")
+
+
+def _table_html(table_id, df, repeat_header_every=25):
+    """Table au format FBref : en-tête sur deux niveaux, en-têtes répétés dans
+    le corps ; la colonne FbrefID devient l'attribut data-append-csv de la
+    cellule du joueur."""
+    esc = html_lib.escape
+    ids = df[PLAYER_ID_COLUMN] if PLAYER_ID_COLUMN in df.columns else pd.Series(pd.NA, index=df.index)
+    df = df.drop(columns=PLAYER_ID_COLUMN, errors='ignore')
+    head = "".join(f"<th>{esc(str(c))}</th>" for c in df.columns)
+    rows = []
+    for i, (player_id, row) in enumerate(zip(ids, df.itertuples(index=False))):
+        if i and i % repeat_header_every == 0:
+            rows.append(f'<tr class="thead">{head}</tr>')
+        cells = []
+        for col, v in zip(df.columns, row):
+            text = '' if pd.isna(v) else esc(str(v))
+            if col == 'Player' and not pd.isna(player_id):
+                cells.append(f'<td data-stat="player" data-append-csv="{esc(str(player_id))}">{text}</td>')
+            else:
+                cells.append(f"<td>{text}</td>")
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+    return (f'<table id="{table_id}"><thead><tr><th colspan="{len(df.columns)}"></th></tr>'
+            f"<tr>{head}</tr></thead><tbody>{''.join(rows)}</tbody></table>")
+
+
+def synthesize(data_dir=Path(__file__).parent, fixtures_dir=FIXTURES_DIR):
+    """Fabrique une page par table à partir des CSV nettoyés (sans réseau).
+    Comme sur FBref, la table est placée dans un commentaire HTML, après
+    une autre table de la page."""
+    for spec in select_specs(kinds=["players"]):
+        source = Path(data_dir) / spec.output_name
+        if not source.exists():
+            continue
+        df = pd.read_csv(source)
+        page = ("<html><body><table id=\"stats_squads\"><tr><th>Squad</th></tr></table>"
+                f"<div><!--\n{_table_html(spec.table_id, df)}\n--></div></body></html>")
+        target = fixture_path(spec.url, fixtures_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(page, encoding="utf-8")
+        print(f"  {target.relative_to(fixtures_dir)}")
+
+
+def make_handler(fixtures_dir):
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            target = fixture_path(self.path, fixtures_dir)
+            if not target.is_file():
+                self.send_error(404)
+                return
+            body = target.read_bytes()
+            etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ReplayHandler
+
+
+def start_server(fixtures_dir=FIXTURES_DIR, host="127.0.0.1", port=0):
+    """Démarre le serveur dans un thread ; renvoie (serveur, base_url).
+    port=0 choisit un port libre."""
+    server = ThreadingHTTPServer((host, port), make_handler(Path(fixtures_dir)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rejeu hors ligne des pages FBref")
+    parser.add_argument('command', choices=['record', 'synthesize', 'serve'])
+    parser.add_argument('--fixtures-dir', default=FIXTURES_DIR)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        record(args.cache_dir, args.fixtures_dir)
+    elif args.command == 'synthesize':
+        synthesize(fixtures_dir=args.fixtures_dir)
+    else:
+        server, base_url = start_server(args.fixtures_dir, args.host, args.port)
+        print(f"Rejeu de {args.fixtures_dir} sur {base_url} (Ctrl+C pour arrêter)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Schémas typés des tables FBref, appliqués une fois à l'ingestion.
+
+    entiers (nullables)  compteurs : MP, Starts, Min, buts, tacles...
+    catégories           Nation, Pos, Squad, Comp
+    chaîne               Player, FbrefID, Matches
+    float64              tout le reste (xG, pourcentages, valeurs /90...)
+
+Les tables typées sont écrites en Parquet à côté du CSV : les consommateurs
+(assembler_v2.load_csv_files) n'ont plus à ré-inférer les types.
+
+Les match logs (matchlogs.py) ont un schéma fixe, colonnes comprises
+(MATCHLOG_SCHEMA) : chaque lot écrit a les mêmes colonnes et les mêmes types.
+
+    python ScrapeData/schemas.py [dossier]   # convertit les *_cleaned.csv existants
+"""
+import sys
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+from specs import FAMILIES
+
+META_SCHEMA = {
+    'Rk': 'Int32',
+    'Player': 'string',
+    'FbrefID': 'string',
+    'Nation': 'category',
+    'Pos': 'category',
+    'Squad': 'category',
+    'Comp': 'category',
+    'Age': 'float64',
+    'Born': 'Int16',
+    'Matches': 'string',
+    '# Pl': 'Int16',
+}
+
+# Compteurs entiers de chaque famille ; les autres colonnes numériques sont en float64
+COUNT_COLUMNS = {
+    'stats': ['MP', 'Starts', 'Min', 'Gls', 'Ast', 'G+A', 'G-PK', 'PK', 'PKatt', 'CrdY', 'CrdR',
+              'PrgC', 'PrgP', 'PrgR'],
+    'defense': ['Tkl', 'TklW', 'Def 3rd', 'Mid 3rd', 'Att 3rd', 'Tkl.1', 'Att', 'Lost', 'Blocks',
+                'Sh', 'Pass', 'Int', 'Tkl+Int', 'Clr', 'Err'],
+    'gca': ['SCA', 'PassLive', 'PassDead', 'TO', 'Sh', 'Fld', 'Def', 'GCA',
+            'PassLive.1', 'PassDead.1', 'TO.1', 'Sh.1', 'Fld.1', 'Def.1'],
+    'keepersadv': ['GA', 'PKA', 'FK', 'CK', 'OG', 'Cmp', 'Att', 'Att (GK)', 'Thr', 'Att.1',
+                   'Opp', 'Stp', '#OPA'],
+    'keepers': ['MP', 'Starts', 'Min', 'GA', 'SoTA', 'Saves', 'W', 'D', 'L', 'CS',
+                'PKatt', 'PKA', 'PKsv', 'PKm'],
+    'misc': ['CrdY', 'CrdR', '2CrdY', 'Fls', 'Fld', 'Off', 'Crs', 'Int', 'TklW', 'PKwon', 'PKcon',
+             'OG', 'Recov', 'Won', 'Lost'],
+    'passing': ['Cmp', 'Att', 'TotDist', 'PrgDist', 'Cmp.1', 'Att.1', 'Cmp.2', 'Att.2', 'Cmp.3', 'Att.3',
+                'Ast', 'KP', '1/3', 'PPA', 'CrsPA', 'PrgP'],
+    'passing_types': ['Att', 'Live', 'Dead', 'FK', 'TB', 'Sw', 'Crs', 'TI', 'CK', 'In', 'Out', 'Str',
+                      'Cmp', 'Off', 'Blocks'],
+    'playingtime': ['MP', 'Min', 'Starts', 'Compl', 'Subs', 'unSub', 'onG', 'onGA', '+/-'],
+    'possession': ['Touches', 'Def Pen', 'Def 3rd', 'Mid 3rd', 'Att 3rd', 'Att Pen', 'Live', 'Att',
+                   'Succ', 'Tkld', 'Carries', 'TotDist', 'PrgDist', 'PrgC', '1/3', 'CPA', 'Mis', 'Dis',
+                   'Rec', 'PrgR'],
+    'shooting': ['Gls', 'Sh', 'SoT', 'FK', 'PK', 'PKatt'],
+}
+
+# Match logs d'un joueur (table "summary"), dans l'ordre de la page
+MATCHLOG_SCHEMA = {
+    'player_id': 'string',
+    'Player': 'string',
+    'Date': 'string',
+    'Day': 'string',
+    'Comp': 'string',
+    'Round': 'string',
+    'Venue': 'string',
+    'Result': 'string',
+    'Squad': 'string',
+    'Opponent': 'string',
+    'Start': 'string',
+    'Pos': 'string',
+    **dict.fromkeys(['Min', 'Gls', 'Ast', 'PK', 'PKatt', 'Sh', 'SoT', 'CrdY', 'CrdR', 'Touches',
+                     'Tkl', 'Int', 'Blocks'], 'Int32'),
+    **dict.fromkeys(['xG', 'npxG', 'xAG'], 'float64'),
+    **dict.fromkeys(['SCA', 'GCA', 'Cmp', 'Att'], 'Int32'),
+    'Cmp%': 'float64',
+    **dict.fromkeys(['PrgP', 'Carries', 'PrgC', 'Att.1', 'Succ'], 'Int32'),
+    'Match Report': 'string',
+}
+
+# Radical du fichier de sortie -> famille, pour les tables déjà écrites
+FAMILY_BY_STEM = {stem: family for family, (stem, _) in FAMILIES.items()}
+
+
+class SchemaError(ValueError):
+    """Une colonne ne respecte pas le type déclaré par le schéma."""
+
+
+def schema_for(family, columns):
+    """Type de chaque colonne présente : méta, compteur ou float64."""
+    counts = set(COUNT_COLUMNS.get(family, []))
+    schema = {}
+    for col in columns:
+        if col in META_SCHEMA:
+            schema[col] = META_SCHEMA[col]
+        elif col in counts:
+            schema[col] = 'Int32'
+        else:
+            schema[col] = 'float64'
+    return schema
+
+
+def _to_numeric(series, col):
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    text = series.astype('string').str.replace(',', '', regex=False).str.strip()
+    if col == 'Age':
+        # FBref affiche l'âge au format "23-123" (années-jours)
+        text = text.str.split('-').str[0]
+    values = pd.to_numeric(text, errors='coerce')
+    invalid = values.isna() & text.notna() & (text != '')
+    if invalid.any():
+        raise SchemaError(f"{col} : valeurs non numériques {text[invalid].unique()[:5].tolist()}")
+    return values
+
+
+def _convert(series, col, dtype):
+    if dtype in ('string', 'category'):
+        return series.astype('string').astype(dtype)
+    values = _to_numeric(series, col)
+    if dtype.startswith('Int'):
+        non_integer = values.notna() & (values != values.round())
+        if non_integer.any():
+            raise SchemaError(f"{col} : valeurs non entières {values[non_integer].unique()[:5].tolist()}")
+    return values.astype(dtype)
+
+
+def apply_schema(df, family):
+    """Convertit chaque colonne vers son type déclaré ; échoue sur une valeur invalide."""
+    schema = schema_for(family, df.columns)
+    return pd.DataFrame({col: _convert(df[col], col, dtype) for col, dtype in schema.items()}, index=df.index)
+
+
+def apply_matchlog_schema(df):
+    """
+    Match logs vers MATCHLOG_SCHEMA : colonnes absentes de la page ajoutées
+    (valeurs manquantes), colonnes hors schéma écartées avec un
+    avertissement. Les matchs sans minutes jouées (« On matchday squad, but
+    did not play », texte répété dans toutes les colonnes de stats) ont des
+    stats manquantes.
+    """
+    unknown = [col for col in df.columns if col not in MATCHLOG_SCHEMA]
+    if unknown:
+        warnings.warn(f"Match logs : colonnes hors schéma ignorées {unknown}")
+    minutes = df['Min'] if 'Min' in df.columns else pd.Series(index=df.index, dtype='float64')
+    played = pd.to_numeric(minutes.astype('string').str.replace(',', '', regex=False), errors='coerce').notna()
+    out = {}
+    for col, dtype in MATCHLOG_SCHEMA.items():
+        if col not in df.columns:
+            out[col] = pd.Series(index=df.index, dtype=dtype)
+            continue
+        series = df[col]
+        if dtype != 'string' and not pd.api.types.is_numeric_dtype(series):
+            series = series.where(played)
+        out[col] = _convert(series, col, dtype)
+    return pd.DataFrame(out, index=df.index)
+
+
+def convert_directory(data_dir="."):
+    """Écrit la version Parquet typée de chaque *_cleaned.csv du dossier."""
+    for path in sorted(Path(data_dir).glob("*_cleaned.csv")):
+        stem = path.name[:-len("_cleaned.csv")]
+        for kind in ("_squads_for", "_squads_against"):
+            stem = stem.removesuffix(kind)
+        family = FAMILY_BY_STEM.get(stem)
+        if family is None:
+            warnings.warn(f"{path.name} : famille inconnue, fichier ignoré")
+            continue
+        df = apply_schema(pd.read_csv(path), family)
+        df.to_parquet(path.with_suffix('.parquet'), index=False)
+        print(f"  {path.with_suffix('.parquet').name} : {df.shape[0]} lignes, {df.shape[1]} colonnes")
+
+
+if __name__ == "__main__":
+    convert_directory(sys.argv[1] if len(sys.argv) > 1 else Path(__file__).parent)
@@ -0,0 +1,87 @@
+"""
+Orchestrateur de scraping : récupère les tables FBref en parallèle et écrit
+les fichiers *_cleaned.csv.
+
+Usage :
+    python ScrapeData/scrape_all.py [--families defense passing] [--seasons 2022-2023 2023-2024]
+                                    [--competitions Big5] [--kinds players squads_for squads_against]
+                                    [--workers 4] [--min-interval 6]
+
+Les tables demandées sur une même page (joueurs, équipes pour / contre)
+sont extraites d'un seul téléchargement.
+
+Les sorties sont rangées dans ScrapeData/data/season=<saison>/comp=<compétition>/
+(--layout legacy pour les chemins historiques ScrapeData/*_cleaned.csv).
+--incremental ne récupère que les partitions absentes ou périmées : construire
+un historique de dix saisons devient un job qu'on peut relancer après une
+interruption sans refaire ce qui est déjà fait.
+
+--base-url redirige toutes les requêtes vers un serveur local qui sert des
+pages enregistrées (même chemin que sur fbref.com).
+
+Les pages passent par le cache HTML (html_cache.py) : une page inchangée
+depuis le dernier run n'est ni retéléchargée ni re-parsée (--offline pour
+travailler uniquement depuis le cache, --force pour tout re-parser).
+"""
+import argparse
+
+from engine import DEFAULT_STALE_AFTER, EXTRACTION_MODES, ScrapeEngine
+from fetcher import DEFAULT_MIN_INTERVAL, Fetcher
+from html_cache import DEFAULT_CACHE_DIR, HtmlCache
+from specs import COMPETITIONS, FAMILIES, KINDS, LAYOUTS, select_specs
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping parallèle des tables FBref")
+    parser.add_argument('--families', nargs='*', default=None, choices=sorted(FAMILIES),
+                        help="Familles de statistiques (défaut : toutes)")
+    parser.add_argument('--seasons', nargs='*', default=None,
+                        help="Saisons au format 2023-2024 (défaut : 2023-2024)")
+    parser.add_argument('--competitions', nargs='*', default=None, choices=sorted(COMPETITIONS),
+                        help="Compétitions (défaut : Big5)")
+    parser.add_argument('--kinds', nargs='*', default=None, choices=KINDS,
+                        help="Tables à extraire de chaque page : players, squads_for, squads_against "
+                             "(défaut : players)")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--min-interval', type=float, default=DEFAULT_MIN_INTERVAL,
+                        help="Délai minimal entre deux requêtes vers le même hôte (s)")
+    parser.add_argument('--retries', type=int, default=4)
+    parser.add_argument('--base-url', default=None,
+                        help="Serveur local servant des pages enregistrées")
+    parser.add_argument('--output-dir', default=None,
+                        help="Racine des sorties (défaut : ScrapeData/data, ou ScrapeData en layout legacy)")
+    parser.add_argument('--layout', choices=LAYOUTS, default="partitioned")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Ne récupère que les partitions absentes ou périmées")
+    parser.add_argument('--stale-after', type=float, default=DEFAULT_STALE_AFTER / 3600,
+                        help="Âge (h) au-delà duquel une partition de la saison en cours est périmée")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--offline', action='store_true',
+                        help="N'utilise que les pages en cache, aucune requête réseau")
+    parser.add_argument('--max-age', type=float, default=0,
+                        help="Réutilise une page en cache plus récente que N secondes sans la revalider")
+    parser.add_argument('--force', action='store_true',
+                        help="Re-parse toutes les pages même si leur contenu n'a pas changé")
+    parser.add_argument('--extraction', choices=EXTRACTION_MODES, default="targeted",
+                        help="targeted : parse uniquement la table visée ; document : parse toute la page")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    specs = select_specs(args.families, args.seasons, args.competitions, args.kinds)
+
+    fetcher = Fetcher(min_interval=args.min_interval, retries=args.retries, base_url=args.base_url)
+    cache = HtmlCache(args.cache_dir, fetcher=fetcher, offline=args.offline, max_age=args.max_age)
+    engine = ScrapeEngine(cache, output_dir=args.output_dir, workers=args.workers,
+                          force=args.force, extraction=args.extraction, layout=args.layout,
+                          incremental=args.incremental, stale_after=args.stale_after * 3600)
+
+    print("=" * 60)
+    print(f"SCRAPING PARALLÈLE DES TABLES FBREF ({len(specs)} tables)")
+    print("=" * 60)
+    engine.run(specs)
+
+
+if __name__ == "__main__":
+    main()
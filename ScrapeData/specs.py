@@ -0,0 +1,155 @@
+"""
+Registre des tables FBref à scraper.
+
+Une table est décrite par sa famille de statistiques (defense, passing, ...),
+la saison, la compétition, son type (joueurs, équipes pour / contre) et le
+nom du fichier de sortie. Le moteur (engine.py) exécute n'importe quel
+sous-ensemble de ces specs ; les specs qui partagent une URL sont extraites
+d'un seul téléchargement de la page.
+"""
+import datetime
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_SEASON = "2023-2024"
+DEFAULT_COMPETITION = "Big5"
+
+# famille FBref -> (radical du fichier de sortie, radical des ids de table)
+FAMILIES = {
+    "stats": ("players", "standard"),
+    "defense": ("defensive", "defense"),
+    "gca": ("gsc", "gca"),
+    "keepersadv": ("goalieadv", "keeper_adv"),
+    "keepers": ("keepers", "keeper"),
+    "misc": ("misc", "misc"),
+    "passing_types": ("passing_types", "passing_types"),
+    "passing": ("passing", "passing"),
+    "playingtime": ("playing_time", "playing_time"),
+    "possession": ("possession", "possession"),
+    "shooting": ("shooting", "shooting"),
+}
+
+# Tables présentes sur une page de statistiques : joueurs, équipes (stats
+# réalisées) et équipes adverses (stats concédées)
+KINDS = ("players", "squads_for", "squads_against")
+
+# compétition -> (identifiant FBref, nom utilisé dans l'URL)
+COMPETITIONS = {
+    "Big5": ("Big5", "Big-5-European-Leagues"),
+    "Premier-League": ("9", "Premier-League"),
+    "La-Liga": ("12", "La-Liga"),
+    "Serie-A": ("11", "Serie-A"),
+    "Bundesliga": ("20", "Bundesliga"),
+    "Ligue-1": ("13", "Ligue-1"),
+}
+
+FBREF = "https://fbref.com/en/comps"
+
+# Disposition des fichiers de sortie :
+#   partitioned  <racine>/season=<saison>/comp=<compétition>/<fichier>
+#   legacy       <racine>/<fichier> (chemins historiques des scripts Scrape*.py)
+LAYOUTS = ("partitioned", "legacy")
+DEFAULT_DATA_DIR = Path(__file__).parent / "data"
+
+
+def partition_dir(root, season=DEFAULT_SEASON, competition=DEFAULT_COMPETITION):
+    """Dossier de la partition saison/compétition."""
+    return Path(root) / f"season={season}" / f"comp={competition}"
+
+
+def partition_of(data_dir):
+    """(saison, compétition) d'un dossier de tables, d'après sa disposition :
+    season=<saison>/comp=<compétition>, <compétition>/<saison> (legacy), ou
+    saison et compétition par défaut (fichiers à plat)."""
+    path = Path(data_dir).resolve()
+    parent, name = path.parent.name, path.name
+    if parent.startswith("season=") and name.startswith("comp="):
+        return parent[len("season="):], name[len("comp="):]
+    if parent in COMPETITIONS and re.fullmatch(r"\d{4}-\d{4}", name):
+        return name, parent
+    return DEFAULT_SEASON, DEFAULT_COMPETITION
+
+
+def season_is_closed(season, today=None):
+    """Une saison '2022-2023' est terminée à partir du 1er juillet 2023 :
+    ses tables ne changent plus et n'ont jamais besoin d'être rafraîchies."""
+    today = today or datetime.date.today()
+    end_year = int(season.split("-")[-1])
+    return today >= datetime.date(end_year, 7, 1)
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    family: str
+    season: str = DEFAULT_SEASON
+    competition: str = DEFAULT_COMPETITION
+    kind: str = "players"
+
+    @property
+    def output_name(self):
+        stem = FAMILIES[self.family][0]
+        if self.kind == "players":
+            return f"{stem}_cleaned.csv"
+        return f"{stem}_{self.kind}_cleaned.csv"
+
+    @property
+    def table_id(self):
+        key = FAMILIES[self.family][1]
+        if self.kind == "players":
+            return f"stats_{key}"
+        side = self.kind.split("_")[1]
+        prefix = "teams" if self.competition == "Big5" else "squads"
+        return f"stats_{prefix}_{key}_{side}"
+
+    @property
+    def url(self):
+        comp_id, comp_slug = COMPETITIONS[self.competition]
+        if self.competition == "Big5":
+            # Les pages Big5 séparent les tables joueurs des tables équipes
+            page = "players" if self.kind == "players" else "squads"
+            return f"{FBREF}/{comp_id}/{self.season}/{self.family}/{page}/{self.season}-{comp_slug}-Stats"
+        # Page de compétition : les trois tables sont sur la même page
+        return f"{FBREF}/{comp_id}/{self.season}/{self.family}/{self.season}-{comp_slug}-Stats"
+
+    def output_path(self, root, layout="partitioned"):
+        root = Path(root)
+        if layout == "partitioned":
+            return partition_dir(root, self.season, self.competition) / self.output_name
+        # legacy : fichier à plat pour la saison/compétition par défaut,
+        # sous-dossier <compétition>/<saison> sinon
+        if self.season == DEFAULT_SEASON and self.competition == DEFAULT_COMPETITION:
+            return root / self.output_name
+        return root / self.competition / self.season / self.output_name
+
+
+def select_specs(families=None, seasons=None, competitions=None, kinds=None):
+    """Produit cartésien des familles × saisons × compétitions × types demandés."""
+    families = families or list(FAMILIES)
+    seasons = seasons or [DEFAULT_SEASON]
+    competitions = competitions or [DEFAULT_COMPETITION]
+    kinds = kinds or ["players"]
+
+    unknown = (
+        [f for f in families if f not in FAMILIES]
+        + [c for c in competitions if c not in COMPETITIONS]
+        + [k for k in kinds if k not in KINDS]
+    )
+    if unknown:
+        raise ValueError(f"Familles, compétitions ou types inconnus : {unknown}")
+
+    return [
+        TableSpec(family, season, competition, kind)
+        for competition in competitions
+        for season in seasons
+        for family in families
+        for kind in kinds
+    ]
+
+
+def group_by_page(specs):
+    """Regroupe les specs par URL (ordre conservé) : une requête par page."""
+    pages = {}
+    for spec in specs:
+        pages.setdefault(spec.url, []).append(spec)
+    return pages
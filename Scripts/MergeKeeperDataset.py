@@ -1,13 +1,19 @@
-import pandas as pd
+import sys
+from pathlib import Path
 
-keepers_df = pd.read_csv("./../ScrapeData/keepers_cleaned.csv")
-goalieadv_df = pd.read_csv("./../ScrapeData/goalieadv_cleaned.csv")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from assembler_v2 import GOALKEEPER_FILES, assemble_goalkeepers, load_csv_files
+from player_registry import PlayerRegistry
+from storage import write_table
 
-new_columns = [col for col in goalieadv_df.columns if col not in keepers_df.columns]
+# Branche gardiens de assembler_v2 seule (assembler_v2.py produit déjà
+# keepers_enrichis avec les autres postes, en un seul chargement)
+dataframes = load_csv_files("./../ScrapeData", GOALKEEPER_FILES)
 
-merged_df = pd.merge(keepers_df, goalieadv_df[['Player'] + new_columns], on='Player', how='left')
+registry = PlayerRegistry()
+merged_df = assemble_goalkeepers(dataframes, registry)
 
-if 'Matches' in merged_df.columns:
-    merged_df = merged_df.drop(columns=['Matches'])
-
-merged_df.to_csv("./../ressources/keepers_enrichis.csv", index=False)
\ No newline at end of file
+csv = "--csv" in sys.argv
+if registry.added:
+    registry.save(csv=csv)
+write_table(merged_df, "./../ressources/cleaned_data/keepers_enrichis.csv", csv=csv)
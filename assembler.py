@@ -1,7 +1,9 @@
-import pandas as pd
+import argparse
 import os
 from pathlib import Path
 
+from storage import exists, read_tables, write_table
+
 def load_csv_files():
 
     scrape_data_dir = Path("ScrapeData")
@@ -18,19 +20,19 @@ def load_csv_files():
         "shooting_cleaned.csv"
     ]
     
-    dataframes = {}
-    
-    print("Chargement des fichiers CSV...")
+    print("Chargement des fichiers (en parallèle)...")
     for filename in files_to_assemble:
-        filepath = scrape_data_dir / filename
-        if filepath.exists():
-            print(f"  - Chargement de {filename}")
-            df = pd.read_csv(filepath)
-            dataframes[filename] = df
-            print(f"    Dimensions: {df.shape[0]} lignes, {df.shape[1]} colonnes")
-        else:
+        if not exists(scrape_data_dir / filename):
             print(f"  - ATTENTION: {filename} n'existe pas!")
     
+    paths = [scrape_data_dir / filename for filename in files_to_assemble]
+    tables, report = read_tables(paths)
+    dataframes = {path.name: df for path, df in tables.items()}
+    for stats in report:
+        print(f"  - {stats['file']}")
+        print(f"    Dimensions: {stats['rows']} lignes, {stats['columns']} colonnes, "
+              f"{stats['bytes'] / 1e6:.2f} Mo lus en {stats['seconds']:.3f}s")
+    
     return dataframes
 
 def identify_common_columns(dataframes):
@@ -127,9 +129,9 @@ def assemble_data(dataframes):
 
     return assembled_df
 
-def save_assembled_data(assembled_df, output_filename="assembled_data.csv"):
-    print(f"\nSauvegarde dans {output_filename}...")
-    assembled_df.to_csv(output_filename, index=False)
+def save_assembled_data(assembled_df, output_filename="assembled_data.csv", csv=False):
+    print(f"\nSauvegarde dans {Path(output_filename).with_suffix('.parquet')}...")
+    write_table(assembled_df, output_filename, csv=csv)
     print(f"Fichier sauvegardé avec {assembled_df.shape[0]} lignes et {assembled_df.shape[1]} colonnes")
 
 
@@ -137,6 +139,10 @@ def main():
     """
     Fonction principale
     """
+    parser = argparse.ArgumentParser(description="Assemblage des données de football")
+    parser.add_argument('--csv', action='store_true', help="Écrire aussi la sortie en CSV")
+    args = parser.parse_args()
+
     print("ASSEMBLAGE DES DONNÉES DE FOOTBALL")
     print("="*50)
     
@@ -156,7 +162,7 @@ def main():
         
         assembled_df = remove_goalkeepers(assembled_df)
         
-        save_assembled_data(assembled_df)
+        save_assembled_data(assembled_df, csv=args.csv)
 
         
     except Exception as e:
@@ -1,181 +1,344 @@
 import pandas as pd
 from pathlib import Path
+import argparse
 import sys
+from dataclasses import dataclass, field
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from column_schema import DERIVED, META, ColumnResolutionError, ColumnSchema, family_of, save_schemas, stats
+from instrumentation import RunReport, count_rows
+from player_registry import PlayerRegistry, add_player_ids
+from storage import read_tables, table_columns, exists, write_table
+
+# Registre des tables scrapées (ScrapeData/specs.py) : saison de la partition lue
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'ScrapeData'))
+from specs import DEFAULT_SEASON, partition_of
 
 DEFAULT_KEYS = ['Player', 'Born', 'Squad']
-META_COLS = ['Rk', 'Player', 'Nation', 'Pos', 'Squad', 'Comp', 'Age', 'Born', 'Matches']
+META_COLS = ['Rk', 'Player', 'FbrefID', 'Nation', 'Pos', 'Squad', 'Comp', 'Age', 'Born', 'Matches']
+MAIN_TABLE = "players_cleaned.csv"
+GK_TABLE = "keepers_cleaned.csv"
 
-# Colonnes communes à tous les postes
-COMMON_COLS = [
-    'Rk', 'Player', 'Nation', 'Pos', 'Squad', 'Comp', 'Age', 'Born', 'MainPos',
-    'MP', 'Starts', 'Min', '90s', 'CrdY', 'CrdR'
+OUTFIELD_FILES = [
+    "players_cleaned.csv",
+    "defensive_cleaned.csv",
+    "misc_cleaned.csv",
+    "passing_cleaned.csv",
+    "passing_types_cleaned.csv",
+    "playing_time_cleaned.csv",
+    "possession_cleaned.csv",
+    "shooting_cleaned.csv"
 ]
+# Tables de la branche gardiens (table principale en premier)
+GOALKEEPER_FILES = [GK_TABLE, "goalieadv_cleaned.csv"]
+
+# Profils de poste : statistiques logiques (famille, nom brut), résolues
+# en noms physiques par le schéma de l'assemblage (column_schema.py)
+
+# Colonnes communes à tous les postes
+IDENTITY_COLS = stats(DERIVED, 'PlayerID', 'Season') + stats(META, 'Rk', 'Player', 'Nation', 'Pos', 'Squad', 'Comp', 'Age', 'Born')
+
+COMMON_COLS = IDENTITY_COLS + [(DERIVED, 'MainPos')] + stats('players', 'MP', 'Starts', 'Min', '90s', 'CrdY', 'CrdR')
 
 # Colonnes pertinentes pour les Défenseurs
 DEFENDER_COLS = COMMON_COLS + [
 
-    'Tkl', 'TklW', 'Def 3rd', 'Mid 3rd', 'Att 3rd', 'Tkl%', 
-    'Blocks', 'Int', 'Tkl+Int', 'Clr', 'Err',
+    *stats('defensive', 'Tkl', 'TklW', 'Def 3rd', 'Mid 3rd', 'Att 3rd', 'Tkl%',
+           'Blocks', 'Int', 'Tkl+Int', 'Clr', 'Err'),
     
-    'Won', 'Lost_misc', 'Won%',
+    *stats('misc', 'Won', 'Lost', 'Won%'),
     
-    'Cmp', 'Att_passing', 'Cmp%', 'TotDist', 'PrgDist',
-    'PrgP', 'PrgP_passing', 'KP', '1/3', 'PPA',
+    *stats('passing', 'Cmp', 'Att', 'Cmp%', 'TotDist', 'PrgDist'),
+    ('players', 'PrgP'), *stats('passing', 'PrgP', 'KP', '1/3', 'PPA'),
 
-    'Touches', 'Def Pen', 'Def 3rd_possession', 'Mid 3rd_possession',
-    'Carries', 'PrgC', 'PrgDist_possession',
+    *stats('possession', 'Touches', 'Def Pen', 'Def 3rd', 'Mid 3rd',
+           'Carries'),
+    ('players', 'PrgC'), ('possession', 'PrgDist'),
     
-    'Ast', 'xAG', 'xA', 'A-xAG',
+    *stats('players', 'Ast', 'xAG'), *stats('passing', 'xA', 'A-xAG'),
     
-    'Recov',
+    ('misc', 'Recov'),
     
-    'Fls', 'Fld',
+    *stats('misc', 'Fls', 'Fld'),
     
-    'Min%', 'Compl', 'Subs', 'PPM', 'onG', 'onGA', '+/-', '+/-90'
+    *stats('playing_time', 'Min%', 'Compl', 'Subs', 'PPM', 'onG', 'onGA', '+/-', '+/-90')
 ]
 
 # Colonnes pertinentes pour les Milieux de terrain
 MIDFIELDER_COLS = COMMON_COLS + [
 
-    'Cmp', 'Att_passing', 'Cmp%', 'TotDist', 'PrgDist',
-    'KP', '1/3', 'PPA', 'CrsPA', 'PrgP', 'PrgP_passing',
-    'Ast', 'xAG', 'xA', 'A-xAG',
+    *stats('passing', 'Cmp', 'Att', 'Cmp%', 'TotDist', 'PrgDist',
+           'KP', '1/3', 'PPA', 'CrsPA'),
+    ('players', 'PrgP'), ('passing', 'PrgP'),
+    ('players', 'Ast'), ('players', 'xAG'), ('passing', 'xA'), ('passing', 'A-xAG'),
     
-    'Live', 'Dead', 'FK', 'TB', 'Sw', 'Crs', 'TI', 'CK',
+    *stats('passing_types', 'Live', 'Dead', 'FK', 'TB', 'Sw'), ('misc', 'Crs'), *stats('passing_types', 'TI', 'CK'),
     
-    'Touches', 'Mid 3rd_possession', 'Att 3rd_possession',
-    'Att_possession', 'Succ', 'Succ%', 'Tkld', 'Tkld%',
-    'Carries', 'TotDist_possession', 'PrgDist_possession', 
-    'PrgC', 'PrgC_possession', 'CPA', 'Rec', 'PrgR',
+    *stats('possession', 'Touches', 'Mid 3rd', 'Att 3rd',
+           'Att', 'Succ', 'Succ%', 'Tkld', 'Tkld%',
+           'Carries', 'TotDist', 'PrgDist'),
+    ('players', 'PrgC'), *stats('possession', 'PrgC', 'CPA', 'Rec'), ('players', 'PrgR'),
     
-    'Tkl', 'TklW', 'Mid 3rd', 'Int', 'Tkl+Int', 'Recov',
+    *stats('defensive', 'Tkl', 'TklW', 'Mid 3rd', 'Int', 'Tkl+Int'), ('misc', 'Recov'),
     
-    'Gls', 'Sh_shooting', 'SoT', 'SoT%', 'Sh/90', 'SoT/90',
-    'xG', 'npxG', 'G-xG', 'np:G-xG',
+    ('players', 'Gls'), *stats('shooting', 'Sh', 'SoT', 'SoT%', 'Sh/90', 'SoT/90'),
+    *stats('players', 'xG', 'npxG'), *stats('shooting', 'G-xG', 'np:G-xG'),
     
-    'Won', 'Lost_misc', 'Won%',
+    *stats('misc', 'Won', 'Lost', 'Won%'),
     
-    'Fls', 'Fld',
+    *stats('misc', 'Fls', 'Fld'),
     
-    'Min%', 'Compl', 'Subs', 'PPM', 'onG', 'onGA', '+/-', '+/-90',
-    'onxG', 'onxGA', 'xG+/-', 'xG+/-90'
+    *stats('playing_time', 'Min%', 'Compl', 'Subs', 'PPM', 'onG', 'onGA', '+/-', '+/-90',
+           'onxG', 'onxGA', 'xG+/-', 'xG+/-90')
 ]
 
 # Colonnes pertinentes pour les Attaquants
 FORWARD_COLS = COMMON_COLS + [
 
-    'Gls', 'Sh_shooting', 'SoT', 'SoT%', 'Sh/90', 'SoT/90',
-    'G/Sh', 'G/SoT', 'Dist', 'FK_shooting',
-    'xG', 'npxG', 'xG_shooting', 'npxG_shooting', 'npxG/Sh',
-    'G-xG', 'np:G-xG', 'PK', 'PKatt',
+    ('players', 'Gls'), *stats('shooting', 'Sh', 'SoT', 'SoT%', 'Sh/90', 'SoT/90',
+                              'G/Sh', 'G/SoT', 'Dist', 'FK'),
+    *stats('players', 'xG', 'npxG'), *stats('shooting', 'xG', 'npxG', 'npxG/Sh',
+                                             'G-xG', 'np:G-xG'), *stats('players', 'PK', 'PKatt'),
     
-    'Ast', 'KP', 'xAG', 'xA', 'A-xAG', 'PPA', 'CrsPA',
+    ('players', 'Ast'), ('passing', 'KP'), ('players', 'xAG'), *stats('passing', 'xA', 'A-xAG', 'PPA', 'CrsPA'),
     
-    'Touches', 'Att 3rd_possession', 'Att Pen',
-    'Att_possession', 'Succ', 'Succ%', 'Tkld', 'Tkld%',
-    'Carries', 'PrgC', 'PrgDist_possession', 'CPA', 'Mis', 'Dis',
+    *stats('possession', 'Touches', 'Att 3rd', 'Att Pen',
+           'Att', 'Succ', 'Succ%', 'Tkld', 'Tkld%'),
+    ('possession', 'Carries'), ('players', 'PrgC'), *stats('possession', 'PrgDist', 'CPA', 'Mis', 'Dis'),
     
-    'PrgR', 'PrgC_possession', '1/3_possession',
+    ('players', 'PrgR'), *stats('possession', 'PrgC', '1/3'),
     
-    'Cmp', 'Att_passing', 'Cmp%', 'PrgP',
+    *stats('passing', 'Cmp', 'Att', 'Cmp%'), ('players', 'PrgP'),
     
-    'Fls', 'Fld', 'Recov',
+    *stats('misc', 'Fls', 'Fld', 'Recov'),
     
-    'Won', 'Lost_misc', 'Won%',
+    *stats('misc', 'Won', 'Lost', 'Won%'),
     
-    'Min%', 'Compl', 'Subs', 'PPM', 'onG', 'onGA', '+/-', '+/-90',
-    'onxG', 'onxGA', 'xG+/-', 'xG+/-90'
+    *stats('playing_time', 'Min%', 'Compl', 'Subs', 'PPM', 'onG', 'onGA', '+/-', '+/-90',
+           'onxG', 'onxGA', 'xG+/-', 'xG+/-90')
 ]
 
-def load_csv_files(data_dir=".", files=None, verbose=True):
-    if files is None:
-        files = [
-            "players_cleaned.csv",
-            "defensive_cleaned.csv", 
-            "misc_cleaned.csv",
-            "passing_cleaned.csv",
-            "passing_types_cleaned.csv",
-            "playing_time_cleaned.csv",
-            "possession_cleaned.csv",
-            "shooting_cleaned.csv"
-        ]
-    
-    dataframes = {}
+# Colonnes pertinentes pour les Gardiens
+GOALKEEPER_COLS = IDENTITY_COLS + [
+    *stats('keepers', 'MP', 'Starts', 'Min', '90s'),
+
+    *stats('keepers', 'GA', 'GA90', 'SoTA', 'Saves', 'Save%', 'W', 'D', 'L', 'CS', 'CS%',
+           'PKatt', 'PKA', 'PKsv', 'PKm', 'Save%.1'),
+
+    *stats('goalieadv', 'FK', 'CK', 'OG', 'PSxG', 'PSxG/SoT', 'PSxG+/-', '/90'),
+
+    *stats('goalieadv', 'Cmp', 'Att', 'Cmp%', 'Att (GK)', 'Thr', 'Launch%', 'AvgLen',
+           'Att.1', 'Launch%.1', 'AvgLen.1'),
+
+    *stats('goalieadv', 'Opp', 'Stp', 'Stp%', '#OPA', '#OPA/90', 'AvgDist')
+]
+
+PROFILES = {'DF': DEFENDER_COLS, 'MF': MIDFIELDER_COLS, 'FW': FORWARD_COLS, 'GK': GOALKEEPER_COLS}
+
+# Colonnes lues pour le registre des joueurs (player_registry.py), hors profils
+REGISTRY_COLS = stats(META, 'FbrefID')
+
+# Colonnes utilisées en aval (références logiques)
+PIPELINE_COLS = set(DEFENDER_COLS + MIDFIELDER_COLS + FORWARD_COLS + GOALKEEPER_COLS + REGISTRY_COLS)
+
+# Agrégation des transferts : compteurs sommés, taux moyennés
+TRANSFER_SUM_COLS = [
+    'MP', 'Starts', 'Min', 'Gls', 'Ast', 'G+A', 'G-PK', 'PK', 'PKatt', 'CrdY', 'CrdR', 'Matches'
+]
+TRANSFER_MEAN_COLS = [
+    'Min%', 'PPM', '+/-90', 'Sh/90', 'SoT/90', 'Cmp%', 'Won%', 'Succ%', 'Tkld%', 'SoT%', 'G/Sh', 'G/SoT'
+]
+GK_SUM_COLS = TRANSFER_SUM_COLS + [
+    '90s', 'GA', 'SoTA', 'Saves', 'W', 'D', 'L', 'CS', 'PKA', 'PKsv', 'PKm',
+    'FK', 'CK', 'OG', 'PSxG', 'PSxG+/-', 'Cmp', 'Att', 'Att (GK)', 'Thr', 'Att.1', 'Opp', 'Stp', '#OPA'
+]
+GK_MEAN_COLS = TRANSFER_MEAN_COLS + [
+    'GA90', 'Save%', 'CS%', 'Save%.1', 'PSxG/SoT', '/90', 'Launch%', 'AvgLen', 'Launch%.1', 'AvgLen.1',
+    'Stp%', '#OPA/90', 'AvgDist'
+]
+
+def build_schemas(headers, keys=DEFAULT_KEYS, meta_cols=META_COLS):
+    """
+    Schéma de chaque assemblage (joueurs de champ, gardiens) à partir des
+    en-têtes des tables (dict fichier -> colonnes) : dict table principale
+    -> ColumnSchema, avec les colonnes calculées du pipeline.
+    """
+    schemas = {}
+    for group, main_table in split_assemblies(headers):
+        if main_table not in group:
+            continue
+        schema = ColumnSchema.from_headers(group, main_table, keys, meta_cols)
+        schema.derive('PlayerID', 'int64')
+        schema.derive('Season', 'object')
+        if main_table == MAIN_TABLE:
+            schema.derive('MainPos', 'object')
+        schemas[main_table] = schema
+    return schemas
+
+def read_schemas(data_dir=".", files=None):
+    """build_schemas sur les en-têtes des tables présentes (seuls les en-têtes sont lus)."""
     data_path = Path(data_dir)
-    
-    for filename in files:
-        filepath = data_path / filename
-        try:
-            if verbose: 
-                print(f"  - Chargement de {filename}")
-            df = pd.read_csv(filepath)
-            dataframes[filename] = df
-            if verbose: 
-                print(f"    {df.shape[0]} lignes, {df.shape[1]} colonnes")
-        except FileNotFoundError:
-            if verbose: 
-                print(f"  - ATTENTION: {filepath} n'existe pas!")
-    
-    return dataframes
+    files = OUTFIELD_FILES + GOALKEEPER_FILES if files is None else files
+    return build_schemas({f: table_columns(data_path / f) for f in files if exists(data_path / f)})
 
-def remove_goalkeepers(df, pos_col='Pos', verbose=True):
-    if pos_col not in df.columns:
-        if verbose: 
-            print(f"Colonne {pos_col} absente, pas de suppression GK.")
-        return df
+def projection_for(schemas, files, columns, keys=DEFAULT_KEYS):
+    """Colonnes à lire dans chaque fichier pour obtenir les colonnes
+    logiques `columns` ; les noms assemblés sont donnés par le schéma,
+    indépendamment des colonnes effectivement lues."""
+    projection = {}
+    for group, main_table in split_assemblies(dict.fromkeys(files)):
+        if main_table not in schemas:
+            continue
+        needed = schemas[main_table].projection(columns, keys)
+        for filename in group:
+            family = family_of(filename)
+            cols = list(keys) + needed.get(family, [])
+            if filename == main_table:
+                cols += needed.get(META, [])
+            projection[filename] = list(dict.fromkeys(cols))
+    return projection
+
+def split_assemblies(tables):
+    """[(tables joueurs de champ, MAIN_TABLE), (tables gardiens, GK_TABLE)] ;
+    tables : dict fichier -> table."""
+    outfield = {f: t for f, t in tables.items() if f not in GOALKEEPER_FILES}
+    goalkeepers = {f: t for f, t in tables.items() if f in GOALKEEPER_FILES}
+    return [(outfield, MAIN_TABLE), (goalkeepers, GK_TABLE)]
+
+def load_csv_files(data_dir=".", files=None, columns=None, row_filters=None, workers=4, metrics=None, verbose=True,
+                   schemas=None):
+    """
+    Charge les tables en parallèle (joueurs de champ et gardiens en une
+    seule lecture).
+
+    columns : colonnes logiques utiles (PIPELINE_COLS par exemple) ; seules
+    les colonnes nécessaires de chaque fichier sont alors lues. None : tout lire.
+    schemas : schémas des assemblages (read_schemas) ; lus sur les en-têtes
+    s'ils ne sont pas fournis.
+    row_filters : dict fichier -> prédicat pyarrow appliqué à la lecture.
+    metrics : dict complété avec les octets lus et le temps par fichier.
+    """
+    if files is None:
+        files = OUTFIELD_FILES + GOALKEEPER_FILES
     
-    initial = len(df)
-    df = df[~df[pos_col].str.startswith('GK', na=False)].copy()
+    data_path = Path(data_dir)
+    for filename in files:
+        if verbose and not exists(data_path / filename):
+            print(f"  - ATTENTION: {data_path / filename} n'existe pas!")
+    paths = {filename: data_path / filename for filename in files if exists(data_path / filename)}
+    
+    projection = None
+    if columns is not None and paths:
+        if schemas is None:
+            schemas = build_schemas({filename: table_columns(path) for filename, path in paths.items()})
+        projected = projection_for(schemas, list(paths), columns)
+        projection = {paths[f]: cols for f, cols in projected.items()}
+    
+    row_filters = {paths[f]: expr for f, expr in (row_filters or {}).items() if f in paths}
+    tables, report = read_tables(list(paths.values()), projection, row_filters, workers=workers)
+    dataframes = {filename: tables[path] for filename, path in paths.items()}
+    if metrics is not None:
+        metrics['files'] = report
     
     if verbose:
-        print(f"Suppression GK: {initial-len(df)} supprimés, {len(df)} restants")
+        for stats in report:
+            print(f"  - {stats['file']} : {stats['rows']} lignes, {stats['columns']} colonnes, "
+                  f"{stats['bytes'] / 1e6:.2f} Mo lus en {stats['seconds']:.3f}s")
     
-    return df
+    return dataframes
+
+def key_codes(frames, keys=DEFAULT_KEYS):
+    """
+    Code entier unique de la clé (keys) pour chaque ligne de chaque table.
 
-def assemble_data(dataframes, keys=DEFAULT_KEYS, meta_cols=META_COLS, verbose=True):
-    """Assemble tous les dataframes en un seul"""
+    Chaque colonne de clé est factorisée une seule fois sur l'ensemble des
+    tables ; les NaN sont une valeur comme une autre, comme pour merge.
+    """
+    sizes = [len(df) for df in frames]
+    codes = np.zeros(sum(sizes), dtype='int64')
+    for key in keys:
+        values = pd.concat([df[key] for df in frames], ignore_index=True)
+        column_codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        codes = codes * len(uniques) + column_codes
+    return np.split(codes, np.cumsum(sizes)[:-1])
+
+def assemble_data(dataframes, keys=DEFAULT_KEYS, meta_cols=META_COLS, main_name=MAIN_TABLE, schema=None,
+                  metrics=None, verbose=True):
+    """
+    Assemble tous les dataframes en un seul.
+
+    Jointure gauche multi-tables en une passe : la clé est indexée une fois,
+    chaque table est alignée sur les lignes du dataframe principal, puis
+    toutes les colonnes sont concaténées en une seule allocation. Mêmes
+    règles de suffixe qu'une suite de merge : une colonne déjà présente
+    prend le suffixe _<table>.
+
+    main_name : table principale (première table sinon).
+    schema : ColumnSchema de l'assemblage, qui donne le nom de chaque
+    colonne ; construit sur les tables reçues s'il n'est pas fourni. Il est
+    complété avec le type des colonnes assemblées.
+    metrics : dict complété avec le taux d'appariement de chaque table
+    (part des lignes principales qui y trouvent leur clé).
+    """
     if not dataframes:
         raise ValueError("Vérifier chemin des fichiers.")
     
-    main_name = "players_cleaned.csv"
-    
     if main_name not in dataframes:
         main_name = list(dataframes.keys())[0]
     
-    main = dataframes[main_name].copy()
+    main = dataframes[main_name]
     if verbose: 
         print(f"\nDataframe principal: {main_name} ({main.shape})")
     
+    tables = {}
     for fname, df in dataframes.items():
         if fname == main_name: 
             continue
-        
         missing = [k for k in keys if k not in df.columns]
         if missing:
             if verbose: 
                 print(f"  {fname} ignoré (manque {missing})")
             continue
+        tables[fname] = df
+    
+    if schema is None:
+        headers = {main_name: list(main.columns), **{f: list(df.columns) for f, df in tables.items()}}
+        schema = ColumnSchema.from_headers(headers, main_name, keys, meta_cols)
+    
+    main_codes, *table_codes = key_codes([main] + list(tables.values()), keys)
+    
+    blocks = [main]
+    n_cols = main.shape[1]
+    for (fname, df), codes in zip(tables.items(), table_codes):
+        first = ~pd.Series(codes).duplicated().to_numpy()
+        if verbose and not first.all():
+            print(f"  {fname}: {(~first).sum()} doublons supprimés")
         
-        before = len(df)
-        df = df.drop_duplicates(subset=keys, keep='first')
-        if verbose and before != len(df):
-            print(f"  {fname}: {before-len(df)} doublons supprimés")
-        
+        family = family_of(fname)
         add_cols = [c for c in df.columns if c not in meta_cols]
-        merge_cols = keys + add_cols
-        
-        main = main.merge(
-            df[merge_cols], 
-            on=keys, 
-            how='left', 
-            suffixes=('', f'_{fname.replace("_cleaned.csv", "")}')
-        )
+        block = df.loc[first, add_cols].set_axis(codes[first], axis=0).reindex(main_codes)
+        block.index = main.index
+        if metrics is not None:
+            matched = np.isin(main_codes, codes[first])
+            metrics.setdefault('join_match_rates', {})[fname] = round(float(matched.mean()), 4) if len(main) else None
+        block.columns = [schema.physical(family, c) for c in add_cols]
+        blocks.append(block)
         
+        n_cols += len(add_cols)
         if verbose: 
-            print(f"{fname} fusionné → {main.shape}")
+            print(f"{fname} fusionné → {(len(main), n_cols)}")
     
-    return main
+    assembled = pd.concat(blocks, axis=1)
+    schema.bind(assembled)
+    return assembled
+
+def add_season(df, season=DEFAULT_SEASON):
+    """Colonne Season en tête : saison de la partition lue (une partition
+    = une saison, specs.partition_of)."""
+    df.insert(0, 'Season', season)
+    return df
 
 def extract_main_position(df, pos_col='Pos', verbose=True):
     df['MainPos'] = df[pos_col].str.split(',').str[0].str.strip()
@@ -186,24 +349,58 @@ def extract_main_position(df, pos_col='Pos', verbose=True):
     
     return df
 
-def aggregate_transfers(df, verbose=True):
-    sum_cols = [
-        'MP', 'Starts', 'Min', 'Gls', 'Ast', 'G+A', 'G-PK', 'PK', 'PKatt', 'CrdY', 'CrdR', 'Matches'
-    ]
-    mean_cols = [
-        'Min%', 'PPM', '+/-90', 'Sh/90', 'SoT/90', 'Cmp%', 'Won%', 'Succ%', 'Tkld%', 'SoT%', 'G/Sh', 'G/SoT'
-    ]
+def aggregate_transfers(df, weight_col='Min', sum_cols=TRANSFER_SUM_COLS, mean_cols=TRANSFER_MEAN_COLS,
+                        season_col='Season', verbose=True):
+    """
+    Fusionne les lignes d'un joueur transféré en cours de saison (une ligne
+    par club) en une seule, en un seul groupby par joueur et par saison
+    (season_col, si présente) : les saisons d'un même joueur restent des
+    lignes distinctes.
+
+        compteurs (sum_cols)   somme (NaN si aucune valeur)
+        taux (mean_cols)       moyenne pondérée par les minutes de chaque
+                               ligne ; moyenne simple si aucune minute
+        autres colonnes        dernière valeur non nulle (clubs triés)
+    """
+    # Avec PlayerID (player_registry.py), un joueur est regroupé sur un
+    # entier, même si son nom est écrit différemment d'un club à l'autre
+    id_cols = ['PlayerID'] if 'PlayerID' in df.columns else ['Player', 'Born', 'Age']
+    if season_col in df.columns:
+        id_cols.append(season_col)
+    sum_cols = [col for col in sum_cols if col in df.columns]
+    mean_cols = [col for col in mean_cols if col in df.columns]
+    last_cols = [col for col in df.columns if col not in id_cols + sum_cols + mean_cols]
+
+    df = df.sort_values(by=id_cols + ['Squad', 'Comp'])
 
-    id_cols = ['Player', 'Born', 'Age']
+    # Un seul regroupement, réutilisé par toutes les réductions
+    grouped = df.groupby(id_cols)
+    last = grouped[last_cols].last()
+    sums = grouped[sum_cols + mean_cols].sum()
+    counts = grouped[sum_cols + mean_cols].count()
 
-    df = df.sort_values(by=['Player', 'Born', 'Age', 'Squad', 'Comp'])
-    last_rows = df.groupby(id_cols, as_index=False).last()
-    sum_df = df.groupby(id_cols)[[col for col in sum_cols if col in df.columns]].sum(min_count=1).reset_index()
-    mean_df = df.groupby(id_cols)[[col for col in mean_cols if col in df.columns]].mean().reset_index()
+    out = {col: sums[col].where(counts[col] > 0) for col in sum_cols}
 
-    merged = last_rows.drop(columns=[col for col in sum_cols + mean_cols if col in last_rows.columns], errors='ignore') \
-        .merge(sum_df, on=id_cols, how='left') \
-        .merge(mean_df, on=id_cols, how='left')
+    # Moyenne pondérée : somme(x·w) / somme(w) sur les lignes où x est
+    # renseigné, sommées par numéro de groupe (np.bincount) ; moyenne
+    # simple en repli
+    group_ids = grouped.ngroup().to_numpy()
+    in_group = ~np.isnan(group_ids)
+    group_ids = group_ids[in_group].astype('int64')
+    if weight_col in df.columns:
+        weights = pd.to_numeric(df[weight_col], errors='coerce').astype('float64').fillna(0).to_numpy()[in_group]
+    else:
+        weights = np.zeros(len(group_ids))
+    for col in mean_cols:
+        values = df[col].astype('float64').to_numpy()[in_group]
+        present = ~np.isnan(values)
+        weighted_sum = np.bincount(group_ids, np.where(present, values * weights, 0.0), grouped.ngroups)
+        weight_sum = np.bincount(group_ids, np.where(present, weights, 0.0), grouped.ngroups)
+        plain = sums[col] / counts[col].where(counts[col] > 0)
+        weighted = pd.Series(weighted_sum, index=sums.index) / pd.Series(weight_sum, index=sums.index).where(weight_sum > 0)
+        out[col] = weighted.fillna(plain)
+
+    merged = pd.concat([last, pd.DataFrame(out, index=last.index)], axis=1).reset_index()
 
     if verbose:
         n_avant = len(df)
@@ -212,67 +409,314 @@ def aggregate_transfers(df, verbose=True):
 
     return merged
 
-def filter_relevant_columns(df, position, verbose=True):
-    if position == 'DF':
-        relevant_cols = DEFENDER_COLS
-        position_name = "Défenseurs"
-    elif position == 'MF':
-        relevant_cols = MIDFIELDER_COLS
-        position_name = "Milieux"
-    elif position == 'FW':
-        relevant_cols = FORWARD_COLS
-        position_name = "Attaquants"
-    else:
+def filter_relevant_columns(df, position, schema, verbose=True):
+    """
+    Colonnes du profil du poste (PROFILES), résolues par le schéma de
+    l'assemblage. Une colonne du profil absente du schéma ou de df lève
+    ColumnResolutionError : elle n'est pas ignorée silencieusement.
+    """
+    position_names = {'DF': "Défenseurs", 'MF': "Milieux", 'FW': "Attaquants", 'GK': "Gardiens"}
+    if position not in PROFILES:
         return df
     
-    available_cols = [col for col in relevant_cols if col in df.columns]
+    relevant_cols = schema.resolve(PROFILES[position])
     missing_cols = [col for col in relevant_cols if col not in df.columns]
+    if missing_cols:
+        raise ColumnResolutionError(missing_cols)
     
-    if verbose and missing_cols:
-        print(f"{position_name} - Colonnes manquantes ({len(missing_cols)}) : {missing_cols[:5]}...")
-    
-    df_filtered = df[available_cols].copy()
+    df_filtered = df[relevant_cols].copy()
     
     if verbose:
-        print(f"{position_name} : {len(available_cols)} colonnes pertinentes conservées (sur {len(df.columns)} totales)")
+        print(f"{position_names[position]} : {len(relevant_cols)} colonnes pertinentes conservées "
+              f"(sur {len(df.columns)} totales)")
     
     return df_filtered
 
-def split_by_position(df, verbose=True):
-    df_DF = df[df['MainPos'] == 'DF'].copy()
-    df_MF = df[df['MainPos'] == 'MF'].copy()
-    df_FW = df[df['MainPos'] == 'FW'].copy()
-    
-    if verbose:
-        print(f"\n=== Répartition par poste ===")
-        print(f"  Défenseurs (DF) : {len(df_DF)} joueurs")
-        print(f"  Milieux (MF)    : {len(df_MF)} joueurs")
-        print(f"  Attaquants (FW) : {len(df_FW)} joueurs")
-        print(f"  TOTAL           : {len(df_DF) + len(df_MF) + len(df_FW)} joueurs")
-        
-        total_classified = len(df_DF) + len(df_MF) + len(df_FW)
-        if total_classified < len(df):
-            unclassified = len(df) - total_classified
-            print(f"Non classés  : {unclassified} joueurs")
-    
-    return df_DF, df_MF, df_FW
+def assemble_goalkeepers(dataframes, registry=None, schema=None, season=DEFAULT_SEASON, metrics=None, verbose=True):
+    """
+    Branche gardiens : keepers (table principale) + goalieadv joints sur
+    la clé (Player, Born, Squad), comme les tables des joueurs de champ.
+    Une clé en double dans keepers n'est gardée qu'une fois (goalieadv est
+    dédoublonné par assemble_data) : un homonyme ne multiplie plus les
+    lignes. Puis saison, identifiants, agrégation des transferts et profil
+    GOALKEEPER_COLS. None si keepers est absent.
+    """
+    goalkeepers = split_assemblies(dataframes)[1][0]
+    if GK_TABLE not in goalkeepers:
+        if verbose:
+            print(f"  {GK_TABLE} absent : pas de branche gardiens")
+        return None
+    if schema is None:
+        schema = build_schemas({f: list(df.columns) for f, df in goalkeepers.items()})[GK_TABLE]
+    
+    main = goalkeepers[GK_TABLE]
+    duplicated = pd.Series(key_codes([main])[0]).duplicated().to_numpy()
+    if verbose and duplicated.any():
+        print(f"  {GK_TABLE}: {duplicated.sum()} doublons supprimés")
+    goalkeepers = dict(goalkeepers, **{GK_TABLE: main[~duplicated]})
+    
+    df = assemble_data(goalkeepers, main_name=GK_TABLE, schema=schema, metrics=metrics, verbose=verbose)
+    df = add_season(df, season)
+    df = add_player_ids(df, registry, verbose=verbose)
+    df = aggregate_transfers(df, sum_cols=GK_SUM_COLS, mean_cols=GK_MEAN_COLS, verbose=verbose)
+    return filter_relevant_columns(df, 'GK', schema, verbose=verbose)
+
+@dataclass
+class RowFilter:
+    """Filtre de lignes sur une colonne de la table principale, sous deux
+    formes : masque pandas (après assemblage) et prédicat pyarrow (lecture)."""
+    label: str
+    column: str
+    mask: object        # DataFrame -> Series booléenne
+    predicate: object   # () -> pyarrow.compute.Expression
+
+def _not_goalkeeper_mask(df, pos_col='Pos'):
+    return ~df[pos_col].astype('string').str.startswith('GK').fillna(False).astype(bool)
+
+def not_goalkeeper(pos_col='Pos'):
+    """Prédicat pyarrow des joueurs de champ : Pos vide ou sans 'GK' en tête."""
+    pos = pc.field(pos_col).cast(pa.string())
+    return pos.is_null() | ~pc.starts_with(pos, 'GK')
+
+OUTFIELD_FILTER = RowFilter("Pos vide ou sans 'GK' en tête", 'Pos', _not_goalkeeper_mask, not_goalkeeper)
+
+def split_and_project(df, schema, positions=('DF', 'MF', 'FW'), verbose=True):
+    """Découpage par poste principal et profil du poste (PROFILES) en une
+    sélection lignes × colonnes par poste, à partir d'un seul regroupement
+    des lignes par MainPos : pas de copie pleine largeur."""
+    rows = df.groupby('MainPos', observed=True, sort=False).indices
+    frames = {}
+    for position in positions:
+        relevant_cols = schema.resolve(PROFILES[position])
+        missing_cols = [col for col in relevant_cols if col not in df.columns]
+        if missing_cols:
+            raise ColumnResolutionError(missing_cols)
+        frames[position] = df.iloc[rows.get(position, np.array([], dtype='int64')),
+                                   df.columns.get_indexer(relevant_cols)]
+        if verbose:
+            print(f"  {position} : {len(frames[position])} joueurs, {len(relevant_cols)} colonnes")
+    return tuple(frames[position] for position in positions)
+
+@dataclass
+class PlanNode:
+    op: str
+    args: dict = field(default_factory=dict)
+
+    def describe(self):
+        args = self.args
+        if self.op == 'scan':
+            columns = 'toutes colonnes' if args['columns'] is None else f"{len(args['columns'])} colonnes logiques"
+            filters = ''.join(f", filtre {f} : {flt.label}" for f, flt in args['row_filters'].items())
+            return f"scan({args['data_dir']}, {columns}{filters})"
+        if self.op == 'filter':
+            return f"filter({args['filter'].label})"
+        if self.op in ('split', 'project', 'split_project'):
+            return f"{self.op}({', '.join(args['positions'])})"
+        return self.op
+
+class LazyAssembly:
+    """
+    Assemblage différé : chaque méthode ajoute un nœud au plan et renvoie
+    le plan ; rien n'est lu ni calculé avant collect(), qui optimise le plan
+    puis l'exécute en une passe :
+
+        - projection : les colonnes logiques des nœuds en aval (profils de
+          project et de goalkeepers, identifiant FBref pour le registre)
+          sont lues fichier par fichier par le scan, via le schéma de chaque assemblage (lu sur les en-têtes) ;
+        - prédicat : un filter placé avant toute étape qui change les lignes
+          (seuls assemble, jointure gauche sur la table principale, peut le
+          précéder) et qui porte sur une colonne de la table principale est
+          appliqué par le scan (prédicat pyarrow) ;
+        - split + project fusionnés : un regroupement des lignes par poste
+          et une sélection lignes × colonnes par poste.
+
+    Un filtre sur MainPos ne peut pas descendre sous aggregate_transfers :
+    le poste principal d'un joueur transféré dépend de la ligne retenue par
+    l'agrégation. explain() décrit le plan tel qu'il sera exécuté.
+    """
+    # Étapes qui conservent les lignes de la table principale et ses colonnes
+    ROW_PRESERVING = ('assemble',)
+
+    def __init__(self, data_dir=".", files=None, workers=4):
+        self.files = OUTFIELD_FILES + GOALKEEPER_FILES if files is None else files
+        self.workers = workers
+        self.nodes = [PlanNode('scan', {'data_dir': data_dir, 'columns': None, 'row_filters': {}})]
+        self.schemas = {}
+
+    def _add(self, op, **args):
+        self.nodes.append(PlanNode(op, args))
+        return self
+
+    def assemble(self):
+        return self._add('assemble')
+
+    def filter(self, row_filter):
+        return self._add('filter', filter=row_filter)
+
+    def player_ids(self, registry):
+        return self._add('player_ids', registry=registry)
+
+    def goalkeepers(self, registry):
+        return self._add('goalkeepers', registry=registry)
+
+    def aggregate_transfers(self):
+        return self._add('aggregate_transfers')
+
+    def main_position(self):
+        return self._add('extract_main_position')
+
+    def split(self, positions=('DF', 'MF', 'FW')):
+        return self._add('split', positions=tuple(positions))
+
+    def project(self, positions=('DF', 'MF', 'FW')):
+        return self._add('project', positions=tuple(positions))
+
+    def optimize(self):
+        """Plan optimisé (nouvelle liste de nœuds ; self.nodes est inchangé)."""
+        scan, *nodes = [PlanNode(node.op, dict(node.args)) for node in self.nodes]
+        scan.args['row_filters'] = dict(scan.args['row_filters'])
 
-def save_position_files(df_DF, df_MF, df_FW, output_dir=".", verbose=True):
-    """Sauvegarde les 3 fichiers par poste"""
+        # Projection : union des profils utilisés en aval et des colonnes du registre
+        columns = set()
+        for node in nodes:
+            if node.op == 'project':
+                columns.update(col for position in node.args['positions'] for col in PROFILES[position])
+            elif node.op == 'goalkeepers':
+                columns.update(PROFILES['GK'] + REGISTRY_COLS)
+            elif node.op == 'player_ids':
+                columns.update(REGISTRY_COLS)
+        if any(node.op == 'project' for node in nodes):
+            scan.args['columns'] = columns
+
+        # Prédicats poussés dans le scan
+        optimized, preserving = [], True
+        for node in nodes:
+            if node.op == 'filter' and preserving and MAIN_TABLE not in scan.args['row_filters']:
+                scan.args['row_filters'][MAIN_TABLE] = node.args['filter']
+                continue
+            preserving = preserving and node.op in self.ROW_PRESERVING
+            optimized.append(node)
+
+        # split suivi de project sur les mêmes postes : une seule sélection
+        fused = []
+        for node in optimized:
+            if node.op == 'project' and fused and fused[-1].op == 'split' \
+                    and fused[-1].args['positions'] == node.args['positions']:
+                fused[-1] = PlanNode('split_project', node.args)
+            else:
+                fused.append(node)
+        return [scan] + fused
+
+    def explain(self, optimize=True):
+        nodes = self.optimize() if optimize else self.nodes
+        return "\n".join([nodes[0].describe()] + [f"  -> {node.describe()}" for node in nodes[1:]])
+
+    def collect(self, report=None, optimize=True, verbose=True):
+        """
+        Exécute le plan (optimisé si optimize) ; renvoie (df_DF, df_MF,
+        df_FW, df_GK), df_GK à None sans table de gardiens. Chaque nœud est
+        mesuré dans report (RunReport) s'il est fourni.
+        """
+        report = report or RunReport("assembler_v2", trace_memory=False)
+        nodes = self.optimize() if optimize else self.nodes
+        state = {'df': None, 'frames': None, 'gk': None}
+        for node in nodes:
+            rows_in = state['frames'] if state['frames'] is not None else state['df']
+            with report.stage(node.op, rows_in=rows_in) as stage:
+                output = getattr(self, f'_run_{node.op}')(node.args, state, stage, verbose)
+                stage.output(output)
+        if state['frames'] is None:
+            raise ValueError("Plan sans découpage par poste (split / project)")
+        return (*state['frames'], state['gk'])
+
+    # Exécution des nœuds : chacun lit et met à jour state
+
+    def _run_scan(self, args, state, stage, verbose):
+        self.schemas = read_schemas(args['data_dir'], self.files)
+        row_filters = {f: flt.predicate() for f, flt in args['row_filters'].items()}
+        tables = load_csv_files(args['data_dir'], self.files, columns=args['columns'], row_filters=row_filters,
+                                workers=self.workers, metrics=stage.metrics, verbose=verbose, schemas=self.schemas)
+        if not tables:
+            raise FileNotFoundError(f"Aucune table trouvée dans {args['data_dir']}")
+        (state['outfield'], _), (state['goalkeepers'], _) = split_assemblies(tables)
+        state['season'], _ = partition_of(args['data_dir'])
+        return tables
+
+    def _run_assemble(self, args, state, stage, verbose):
+        stage.rows_in = count_rows(state['outfield'])
+        state['df'] = add_season(assemble_data(state.pop('outfield'), schema=self.schemas.get(MAIN_TABLE),
+                                               metrics=stage.metrics, verbose=verbose), state['season'])
+        return state['df']
+
+    def _run_filter(self, args, state, stage, verbose):
+        df = state['df']
+        state['df'] = df[args['filter'].mask(df).to_numpy()]
+        if verbose:
+            print(f"  filtre {args['filter'].label} : {len(df) - len(state['df'])} lignes supprimées")
+        return state['df']
+
+    def _run_player_ids(self, args, state, stage, verbose):
+        state['df'] = add_player_ids(state['df'], args['registry'], verbose=verbose)
+        return state['df']
+
+    def _run_goalkeepers(self, args, state, stage, verbose):
+        # Les tables sources ne sont plus utiles ensuite : libérées
+        stage.rows_in = count_rows(state['goalkeepers'])
+        state['gk'] = assemble_goalkeepers(state.pop('goalkeepers'), args['registry'],
+                                           schema=self.schemas.get(GK_TABLE), season=state['season'],
+                                           metrics=stage.metrics, verbose=verbose)
+        return state['gk']
+
+    def _run_aggregate_transfers(self, args, state, stage, verbose):
+        state['df'] = aggregate_transfers(state['df'], verbose=verbose)
+        return state['df']
+
+    def _run_extract_main_position(self, args, state, stage, verbose):
+        state['df'] = extract_main_position(state['df'], verbose=verbose)
+        return state['df']
+
+    def _run_split(self, args, state, stage, verbose):
+        df = state['df']
+        state['frames'] = tuple(df[df['MainPos'] == position].copy() for position in args['positions'])
+        stage.metrics['unclassified'] = len(df) - sum(len(frame) for frame in state['frames'])
+        return state['frames']
+
+    def _run_project(self, args, state, stage, verbose):
+        schema = self.schemas[MAIN_TABLE]
+        state['frames'] = tuple(filter_relevant_columns(frame, position, schema, verbose=verbose)
+                                for frame, position in zip(state['frames'], args['positions']))
+        return state['frames']
+
+    def _run_split_project(self, args, state, stage, verbose):
+        df = state.pop('df')
+        state['frames'] = split_and_project(df, self.schemas[MAIN_TABLE], args['positions'], verbose=verbose)
+        stage.metrics['unclassified'] = len(df) - sum(len(frame) for frame in state['frames'])
+        return state['frames']
+
+def assembly_plan(data_dir=".", registry=None, workers=4):
+    """Plan de l'assemblage, dans l'ordre logique des étapes."""
+    return (LazyAssembly(data_dir, workers=workers)
+            .assemble()
+            .filter(OUTFIELD_FILTER)
+            .player_ids(registry)
+            .goalkeepers(registry)
+            .aggregate_transfers()
+            .main_position()
+            .split()
+            .project())
+
+def save_position_files(df_DF, df_MF, df_FW, output_dir=".", csv=False, df_GK=None, verbose=True):
+    """Sauvegarde les fichiers par poste (Parquet, + CSV si csv=True) ; les
+    gardiens dans keepers_enrichis"""
     files_saved = []
     output_path = Path(output_dir)
     
-    file_DF = output_path / 'assembled_data_DF.csv'
-    df_DF.to_csv(file_DF, index=False)
-    files_saved.append((file_DF.name, len(df_DF), df_DF.shape[1]))
-    
-    file_MF = output_path / 'assembled_data_MF.csv'
-    df_MF.to_csv(file_MF, index=False)
-    files_saved.append((file_MF.name, len(df_MF), df_MF.shape[1]))
-    
-    file_FW = output_path / 'assembled_data_FW.csv'
-    df_FW.to_csv(file_FW, index=False)
-    files_saved.append((file_FW.name, len(df_FW), df_FW.shape[1]))
+    outputs = [(f'assembled_data_{position}.csv', df) for position, df in (('DF', df_DF), ('MF', df_MF), ('FW', df_FW))]
+    if df_GK is not None:
+        outputs.append(('keepers_enrichis.csv', df_GK))
+    for filename, df in outputs:
+        file_pos = write_table(df, output_path / filename, csv=csv)
+        files_saved.append((file_pos.name, len(df), df.shape[1]))
     
     if verbose:
         print(f"\n=== Fichiers générés ===")
@@ -286,46 +730,55 @@ def main():
     print("ASSEMBLAGE DES DONNÉES PAR POSTE (v2)")
     print("=" * 60)
     
-    if len(sys.argv) > 1:
-        data_dir = sys.argv[1]
-    else:
-        data_dir = "."
+    parser = argparse.ArgumentParser(description="Assemblage des données par poste")
+    parser.add_argument('data_dir', nargs='?', default=".", help="Dossier des *_cleaned.csv / .parquet")
+    parser.add_argument('--csv', action='store_true', help="Écrire aussi les sorties en CSV")
+    parser.add_argument('--workers', type=int, default=4, help="Fichiers lus en parallèle")
+    parser.add_argument('--no-optimize', dest='optimize', action='store_false',
+                        help="Exécuter le plan tel qu'écrit (sans projection, prédicat au scan ni fusion)")
+    parser.add_argument('--report', default=None,
+                        help="Fichier JSON du rapport d'exécution (temps, mémoire, lignes par étape)")
+    args = parser.parse_args()
+    data_dir = args.data_dir
     
     print(f"Répertoire des données : {Path(data_dir).absolute()}")
     
-    print("\n[1/6] Chargement des fichiers CSV...")
-    dataframes = load_csv_files(data_dir=data_dir)
-    
-    if not dataframes:
-        print("ERREUR : Aucun fichier CSV trouvé.")
+    report = RunReport("assembler_v2", trace_memory=bool(args.report))
+    registry = PlayerRegistry()
+    
+    plan = assembly_plan(data_dir, registry, workers=args.workers)
+    print(f"\nPlan{' optimisé' if args.optimize else ''} :")
+    print(plan.explain(optimize=args.optimize))
+    print()
+    try:
+        df_DF, df_MF, df_FW, df_GK = plan.collect(report, optimize=args.optimize)
+    except FileNotFoundError as e:
+        print(f"ERREUR : {e} (*_cleaned.parquet / .csv).")
         print("Usage :")
         print(f"python3 {sys.argv[0]} [chemin_vers_dossier_csv]")
         print(f"Exemple : python3 {sys.argv[0]} ./data")
         print(f"Exemple : python3 {sys.argv[0]} .")
         sys.exit(1)
-    
-    print("\n[2/6] Assemblage des données...")
-    assembled = assemble_data(dataframes)
-    
-    print("\n[3/6] Suppression des gardiens...")
-    assembled = remove_goalkeepers(assembled)
-    
-    print("\n[4/6] Gestion des transferts (fusion des lignes multi-clubs)...")
-    assembled = aggregate_transfers(assembled)
-    
-    print("\n[5/6] Extraction du poste principal...")
-    assembled = extract_main_position(assembled)
-    
-    df_DF, df_MF, df_FW = split_by_position(assembled)
-    
-    print("\n[6/6] Filtrage des colonnes pertinentes par poste...")
-    df_DF = filter_relevant_columns(df_DF, 'DF', verbose=True)
-    df_MF = filter_relevant_columns(df_MF, 'MF', verbose=True)
-    df_FW = filter_relevant_columns(df_FW, 'FW', verbose=True)
+    schemas = plan.schemas
     
     print("\n[Sauvegarde] Création du dossier ./ressources/cleaned_data si besoin...")
     Path("./ressources/cleaned_data").mkdir(parents=True, exist_ok=True)
-    save_position_files(df_DF, df_MF, df_FW, output_dir="./ressources/cleaned_data")
+    frames = [df for df in (df_DF, df_MF, df_FW, df_GK) if df is not None]
+    with report.stage("save", rows_in=frames) as stage:
+        files_saved = save_position_files(df_DF, df_MF, df_FW, output_dir="./ressources/cleaned_data", csv=args.csv,
+                                          df_GK=df_GK)
+        stage.metrics['files'] = [name for name, _, _ in files_saved]
+        # Schéma des colonnes assemblées, pour les consommateurs (KPI...)
+        save_schemas({family_of(main): schema for main, schema in schemas.items()},
+                     "./ressources/cleaned_data/column_schema.json")
+        if registry.added:
+            registry.save(csv=args.csv)
+        stage.metrics['registry_added'] = registry.added
+    
+    print("\n=== Temps et volumes par étape ===")
+    print(report.summary())
+    if args.report:
+        print(f"Rapport : {report.write(args.report)}")
     
     print("\n" + "=" * 60)
     print("ASSEMBLAGE TERMINÉ AVEC SUCCÈS")
@@ -0,0 +1,309 @@
+"""
+Build incrémental du pipeline de données.
+
+    python build.py                 # reconstruit ce qui est périmé
+    python build.py normalize_DF    # une cible et ce dont elle dépend
+    python build.py --dry-run       # affiche ce qui serait reconstruit et pourquoi
+    python build.py --list
+
+Chaque étape déclare ses entrées (tables), son script, ses paramètres et
+ses sorties ; son code est le script et les modules du dépôt qu'il importe,
+suivis de proche en proche (specs.py pour normalize_ratio.py...). Le manifeste .build_manifest.json enregistre,
+pour chaque étape, l'empreinte (sha256) de tout cela au dernier build :
+une étape n'est relancée que si l'une de ces empreintes a changé ou si une
+sortie manque. Les empreintes portent sur le contenu (fichiers .parquet et
+.csv d'une table, ou le fichier lui-même pour le schéma JSON), pas sur les
+dates : une étape relancée qui reproduit exactement les mêmes sorties
+n'invalide pas la suite (coupure précoce).
+
+Les tables scrapées (ScrapeData/*_cleaned) sont les sources du graphe :
+après `python ScrapeData/scrape_all.py --families defense --layout legacy`,
+`python build.py` ne relance que l'assemblage et ce qui en dépend. Les
+notebooks restent hors du graphe.
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from storage import csv_path, exists, parquet_path
+
+ROOT = Path(__file__).resolve().parent
+MANIFEST_PATH = ROOT / ".build_manifest.json"
+# Dossiers des modules du dépôt, en plus du dossier de l'importeur : la
+# racine et ScrapeData (ajouté à sys.path par normalize_ratio.py)
+MODULE_DIRS = [ROOT, ROOT / "ScrapeData"]
+
+# Registre des joueurs (player_registry.py) : lu et complété par l'assemblage,
+# déclaré en sortie (une modification ou une suppression hors build relance
+# l'assemblage)
+PLAYER_REGISTRY = "ressources/player_registry.csv"
+
+# Correspondance colonnes logiques -> colonnes assemblées (column_schema.py),
+# écrite par l'assemblage et lue par la normalisation et les KPI
+COLUMN_SCHEMA = "ressources/cleaned_data/column_schema.json"
+
+OUTFIELD_TABLES = ["players", "defensive", "misc", "passing", "passing_types", "playing_time",
+                   "possession", "shooting"]
+GOALKEEPER_TABLES = ["keepers", "goalieadv"]
+
+
+@dataclass
+class Step:
+    name: str
+    script: str
+    inputs: list
+    outputs: list
+    args: list = field(default_factory=list)
+    # Modules importés par le script, pris en compte dans la version du code
+    # Code lu sans être importé ; les modules importés sont trouvés par code_dependencies
+    code: list = field(default_factory=list)
+    cwd: str = "."
+
+    def command(self, csv=False):
+        return [sys.executable, str(ROOT / self.script)] + self.args + (["--csv"] if csv else [])
+
+
+STEPS = [
+    Step("assemble", "assembler_v2.py",
+         inputs=[f"ScrapeData/{table}_cleaned.csv" for table in OUTFIELD_TABLES + GOALKEEPER_TABLES],
+         outputs=[f"ressources/cleaned_data/assembled_data_{pos}.csv" for pos in ("DF", "MF", "FW")]
+                 + ["ressources/cleaned_data/keepers_enrichis.csv", COLUMN_SCHEMA, PLAYER_REGISTRY],
+         args=["ScrapeData"]),
+] + [
+    Step(f"normalize_{pos}", "normalize_ratio.py",
+         inputs=[f"ressources/cleaned_data/{source}", COLUMN_SCHEMA],
+         outputs=[f"ressources/normalized_data/{source.replace('.csv', '_normalized.csv')}"],
+         args=["--files", source, "--compact"])
+    for pos, source in (("DF", "assembled_data_DF.csv"), ("MF", "assembled_data_MF.csv"),
+                        ("FW", "assembled_data_FW.csv"), ("GK", "keepers_enrichis.csv"))
+] + [
+    Step("kpi", "kpi_engine.py",
+         inputs=["ressources/normalized_data/assembled_data_FW_normalized.csv",
+                 "ressources/normalized_data/assembled_data_DF_normalized.csv",
+                 "ressources/KPI/kpi_sum_FW.csv", "ressources/KPI/KPI_sum_DF.csv", COLUMN_SCHEMA],
+         outputs=["ressources/KPI/kpi_fw.csv", "ressources/KPI/KPI_df.csv"]),
+    Step("ranks", "percentiles.py",
+         inputs=[f"ressources/normalized_data/{source.replace('.csv', '_normalized.csv')}" for source in
+                 ("assembled_data_DF.csv", "assembled_data_MF.csv", "assembled_data_FW.csv", "keepers_enrichis.csv")],
+         outputs=[f"ressources/normalized_data/ranks_{scope}.csv" for scope in ("position", "position_league", "all")]),
+    Step("kpi_ranks", "percentiles.py",
+         inputs=["ressources/KPI/kpi_fw.csv", "ressources/KPI/KPI_df.csv"],
+         outputs=["ressources/KPI/kpi_fw_ranks.csv", "ressources/KPI/KPI_df_ranks.csv"],
+         args=["--kpi"]),
+]
+
+
+def local_imports(path):
+    """Modules du dépôt importés par le fichier path (import x, from x import y)."""
+    names = set()
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.split(".")[0])
+    modules = []
+    for name in sorted(names):
+        found = next((d / f"{name}.py" for d in [path.parent] + MODULE_DIRS if (d / f"{name}.py").exists()), None)
+        if found is not None:
+            modules.append(found)
+    return modules
+
+
+def code_dependencies(script):
+    """Le script et les modules du dépôt qu'il importe, directement ou non
+    (chemins relatifs à ROOT)."""
+    seen, todo = set(), [ROOT / script]
+    while todo:
+        path = todo.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        todo.extend(local_imports(path))
+    return sorted(path.relative_to(ROOT).as_posix() for path in seen)
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def table_digest(path):
+    """Empreinte d'une table : contenu de ses versions .parquet et .csv présentes."""
+    h = hashlib.sha256()
+    found = False
+    for sibling in (parquet_path(ROOT / path), csv_path(ROOT / path)):
+        if sibling.exists():
+            h.update(sibling.suffix.encode())
+            h.update(file_digest(sibling).encode())
+            found = True
+    return h.hexdigest() if found else None
+
+
+def is_table(path):
+    return Path(path).suffix in (".csv", ".parquet")
+
+
+def artifact_digest(path):
+    """Empreinte d'une entrée ou d'une sortie : table (.csv / .parquet) ou
+    simple fichier (schéma des colonnes en JSON...) ; None si absente."""
+    if is_table(path):
+        return table_digest(path)
+    return file_digest(ROOT / path) if (ROOT / path).exists() else None
+
+
+def artifact_exists(path):
+    return exists(ROOT / path) if is_table(path) else (ROOT / path).exists()
+
+
+def load_manifest():
+    if MANIFEST_PATH.exists():
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(manifest):
+    tmp = MANIFEST_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def step_state(step, csv=False):
+    """Empreintes courantes des entrées, du code et des paramètres d'une étape."""
+    return {
+        "inputs": {path: artifact_digest(path) for path in step.inputs},
+        "code": {path: file_digest(ROOT / path) for path in code_dependencies(step.script) + step.code},
+        "params": step.command(csv)[2:],
+    }
+
+
+def outdated_reasons(step, state, entry, csv=False, stale=()):
+    """
+    Raisons de reconstruire l'étape ; liste vide si elle est à jour.
+    stale : sorties d'étapes qui seraient reconstruites plus tôt dans le
+    même build (--dry-run) ; les étapes qui les lisent sont périmées.
+    """
+    missing_inputs = [path for path, digest in state["inputs"].items() if digest is None and path not in stale]
+    if missing_inputs:
+        raise FileNotFoundError(f"{step.name} : entrées absentes {missing_inputs}")
+    stale_inputs = [f"entrée périmée : {path}" for path in step.inputs if path in stale]
+    if entry is None:
+        return ["jamais construite"] + stale_inputs
+
+    reasons = stale_inputs + [f"sortie absente : {path}" for path in step.outputs if not artifact_exists(path)]
+    if csv:
+        reasons += [f"CSV absent : {path}" for path in step.outputs
+                    if is_table(path) and not csv_path(ROOT / path).exists()]
+    for kind in ("inputs", "code"):
+        for path, digest in state[kind].items():
+            if entry[kind].get(path) != digest:
+                reasons.append(f"{'entrée' if kind == 'inputs' else 'code'} modifiée : {path}")
+    if entry["params"] != state["params"]:
+        reasons.append(f"paramètres : {entry['params']} -> {state['params']}")
+    # Sortie modifiée à la main depuis le dernier build
+    for path, digest in entry.get("outputs", {}).items():
+        if artifact_exists(path) and artifact_digest(path) != digest:
+            reasons.append(f"sortie modifiée hors build : {path}")
+    return reasons
+
+
+def select_steps(targets):
+    """Étapes demandées et toutes celles dont elles dépendent, dans l'ordre du graphe."""
+    if not targets:
+        return list(STEPS)
+    by_name = {step.name: step for step in STEPS}
+    unknown = [t for t in targets if t not in by_name]
+    if unknown:
+        raise ValueError(f"Cibles inconnues : {unknown} (voir --list)")
+    producer = {output: step for step in STEPS for output in step.outputs}
+
+    needed = set()
+    todo = list(targets)
+    while todo:
+        name = todo.pop()
+        if name in needed:
+            continue
+        needed.add(name)
+        todo += [producer[path].name for path in by_name[name].inputs if path in producer]
+    return [step for step in STEPS if step.name in needed]
+
+
+def build(targets=None, force=False, dry_run=False, csv=False, show_output=False, verbose=True):
+    manifest = load_manifest()
+    built = []
+    # Sorties des étapes à reconstruire, sans les reconstruire (--dry-run)
+    stale = set()
+    start = time.perf_counter()
+
+    for step in select_steps(targets):
+        state = step_state(step, csv)
+        reasons = ["--force"] if force else outdated_reasons(step, state, manifest.get(step.name), csv, stale)
+        if not reasons:
+            if verbose:
+                print(f"  {step.name} : à jour")
+            continue
+
+        if verbose:
+            print(f"  {step.name} : reconstruction ({'; '.join(reasons)})")
+        if dry_run:
+            built.append(step.name)
+            stale.update(step.outputs)
+            continue
+
+        step_start = time.perf_counter()
+        subprocess.run(step.command(csv), cwd=ROOT / step.cwd, check=True,
+                       stdout=None if show_output else subprocess.DEVNULL)
+        seconds = time.perf_counter() - step_start
+
+        outputs = {path: artifact_digest(path) for path in step.outputs}
+        unchanged = (manifest.get(step.name) or {}).get("outputs") == outputs
+        manifest[step.name] = dict(state, outputs=outputs, built_at=time.time(), seconds=round(seconds, 3))
+        save_manifest(manifest)
+        built.append(step.name)
+        if verbose:
+            print(f"    {seconds:.2f}s{' (sorties identiques)' if unchanged else ''}")
+
+    if verbose:
+        print(f"{len(built)} étape(s) {'à reconstruire' if dry_run else 'reconstruite(s)'} "
+              f"en {time.perf_counter() - start:.2f}s")
+    return built
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build incrémental du pipeline de données")
+    parser.add_argument('targets', nargs='*', help="Étapes à construire (défaut : toutes)")
+    parser.add_argument('--force', action='store_true', help="Reconstruire sans tenir compte du manifeste")
+    parser.add_argument('--dry-run', action='store_true', help="Afficher ce qui serait reconstruit")
+    parser.add_argument('--csv', action='store_true', help="Écrire aussi les sorties en CSV")
+    parser.add_argument('--list', action='store_true', help="Lister les étapes et leurs dépendances")
+    parser.add_argument('--show-output', action='store_true', help="Afficher la sortie des scripts")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for step in STEPS:
+            print(f"{step.name:14s} {step.script}")
+            for path in step.inputs:
+                print(f"{'':14s}   <- {path}")
+            for path in step.outputs:
+                print(f"{'':14s}   -> {path}")
+        return
+
+    print("=" * 60)
+    print("BUILD DU PIPELINE")
+    print("=" * 60)
+    build(args.targets, force=args.force, dry_run=args.dry_run, csv=args.csv, show_output=args.show_output)
+
+
+if __name__ == "__main__":
+    main()
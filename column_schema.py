@@ -0,0 +1,161 @@
+"""
+Registre des colonnes assemblées : statistique logique -> colonne physique.
+
+Une statistique logique est un couple (famille, nom brut) : ('passing', 'Att'),
+('possession', 'Att 3rd'), ('misc', 'Lost'). Son nom physique dans la table
+assemblée dépend de l'ordre de jointure (Att_passing, Att 3rd_possession,
+Lost_misc) : le schéma est construit une fois, à partir des en-têtes des
+tables, avec les règles de nommage de assembler_v2.assemble_data, puis sert
+à tous les consommateurs (profils de poste, projection au chargement, KPI).
+
+    schema = ColumnSchema.from_headers(headers, main_name="players_cleaned.csv")
+    schema.physical('passing', 'Att')                 # 'Att_passing'
+    schema.resolve([('misc', 'Lost'), (META, 'Player')])
+
+Familles particulières :
+    META     colonnes d'identification (Player, Squad...), prises dans la
+             table principale
+    DERIVED  colonnes calculées par le pipeline (PlayerID, MainPos)
+
+resolve() échoue sur toute statistique inconnue (ColumnResolutionError,
+avec la liste complète) au lieu de la laisser de côté : un changement de
+colonnes côté FBref ou de l'ordre des tables se voit immédiatement.
+"""
+import json
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+META = "meta"
+DERIVED = "derived"
+
+
+class ColumnResolutionError(KeyError):
+    def __init__(self, missing):
+        self.missing = list(missing)
+        super().__init__(f"Colonnes introuvables dans le schéma : {self.missing}")
+
+
+def family_of(filename):
+    """'passing_cleaned.csv' -> 'passing'."""
+    return Path(filename).name.replace("_cleaned.csv", "")
+
+
+def stats(family, *raws):
+    """Références logiques d'une famille : stats('misc', 'Won', 'Lost')."""
+    return [(family, raw) for raw in raws]
+
+
+@dataclass(frozen=True)
+class Column:
+    family: str
+    raw: str
+    physical: str
+    dtype: str = None
+
+
+class ColumnSchema:
+    def __init__(self, columns=()):
+        self._logical = {}
+        self._physical = {}
+        for column in columns:
+            self.add(column)
+
+    def __len__(self):
+        return len(self._logical)
+
+    def __iter__(self):
+        return iter(self._logical.values())
+
+    def __contains__(self, ref):
+        return tuple(ref) in self._logical
+
+    def add(self, column):
+        self._logical[(column.family, column.raw)] = column
+        self._physical[column.physical] = column
+
+    def derive(self, name, dtype=None):
+        """Déclare une colonne calculée par le pipeline."""
+        self.add(Column(DERIVED, name, name, dtype))
+
+    @classmethod
+    def from_headers(cls, headers, main_name, keys=(), meta_cols=()):
+        """
+        headers : dict fichier -> colonnes, dans l'ordre de jointure. Les
+        colonnes de la table principale gardent leur nom (les meta_cols et
+        les clés sont rangées dans la famille META) ; dans les autres
+        tables, les meta_cols sont ignorées et une colonne dont le nom brut
+        est déjà pris reçoit le suffixe _<famille>.
+        """
+        schema = cls()
+        taken = set()
+        ordered = [main_name] + [f for f in headers if f != main_name]
+        for filename in ordered:
+            family = family_of(filename)
+            for raw in headers[filename]:
+                if filename == main_name:
+                    column = Column(META if raw in meta_cols or raw in keys else family, raw, raw)
+                elif raw in meta_cols:
+                    continue
+                else:
+                    column = Column(family, raw, f"{raw}_{family}" if raw in taken else raw)
+                taken.add(raw)
+                schema.add(column)
+        return schema
+
+    def physical(self, family, raw):
+        try:
+            return self._logical[(family, raw)].physical
+        except KeyError:
+            raise ColumnResolutionError([(family, raw)]) from None
+
+    def resolve(self, refs):
+        """Noms physiques des références logiques, dans l'ordre."""
+        missing = [ref for ref in refs if tuple(ref) not in self._logical]
+        if missing:
+            raise ColumnResolutionError(missing)
+        return [self._logical[tuple(ref)].physical for ref in refs]
+
+    def logical(self, physical):
+        """Colonne (famille, nom brut, type) d'un nom physique."""
+        return self._physical[physical]
+
+    def projection(self, refs, keys=()):
+        """Colonnes brutes à lire dans chaque famille pour obtenir refs ;
+        les références absentes du schéma sont ignorées."""
+        needed = {}
+        for ref in refs:
+            column = self._logical.get(tuple(ref))
+            if column is not None and column.family != DERIVED:
+                needed.setdefault(column.family, []).append(column.raw)
+        for family in needed:
+            needed[family] = list(keys) + [raw for raw in dict.fromkeys(needed[family]) if raw not in keys]
+        return needed
+
+    def bind(self, df):
+        """Enregistre le type des colonnes présentes dans la table assemblée."""
+        dtypes = df.dtypes
+        for physical, column in list(self._physical.items()):
+            if physical in dtypes.index:
+                self.add(replace(column, dtype=str(dtypes[physical])))
+        return self
+
+    def to_list(self):
+        return [asdict(column) for column in self._logical.values()]
+
+    @classmethod
+    def from_list(cls, columns):
+        return cls(Column(**column) for column in columns)
+
+
+def save_schemas(schemas, path):
+    """Écrit les schémas (dict nom -> ColumnSchema) en JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({name: schema.to_list() for name, schema in schemas.items()}, f, indent=1, ensure_ascii=False)
+    return path
+
+
+def load_schemas(path):
+    with open(path, encoding="utf-8") as f:
+        return {name: ColumnSchema.from_list(columns) for name, columns in json.load(f).items()}
@@ -7,11 +7,14 @@ import os
 from data.loader import (
     load_and_prepare_data, 
     calculate_percentiles, 
+    load_kpi_ranks,
     get_position_metrics, 
     get_metric_labels,
     load_kpi_natural_names,
     get_natural_name
 )
+# storage.py est rendu importable par data.loader
+from storage import exists as table_exists, read_table
 
 # Configuration
 st.set_page_config(
@@ -148,7 +151,22 @@ def create_bar_chart(data, x_col, y_col, color_col=None, title="Bar Chart"):
     fig.update_layout(height=500)
     return fig
 
-def create_radar_chart(data, player_names, position):
+def player_key(data):
+    """Colonne identifiant un joueur : PlayerID (entier, registre des joueurs)
+    si toutes les lignes en ont un, sinon le nom."""
+    if 'PlayerID' in data.columns and data['PlayerID'].notna().all():
+        return 'PlayerID'
+    return 'Player'
+
+def player_choices(data):
+    """Identifiants des joueurs triés par nom, et leur libellé."""
+    key = player_key(data)
+    labels = data.drop_duplicates(key).set_index(key)['Player'].astype(str)
+    return sorted(labels.index, key=lambda player: labels[player]), labels.to_dict()
+
+def create_radar_chart(data, players, position, key=None):
+    """players : identifiants de la colonne key (par défaut player_key des
+    joueurs du poste, celle de player_choices(pos_data))."""
     position_metrics = get_position_metrics()
     metric_labels = get_metric_labels()
     
@@ -158,19 +176,13 @@ def create_radar_chart(data, player_names, position):
     
     fig = go.Figure()
     
-    pos_data = data[data['Position'] == position]
+    # Percentiles au sein du poste (table précalculée ranks_position)
+    pos_data = calculate_percentiles(data, position)
     colors = ['#e74c3c', '#2ecc71', '#3498db', '#f39c12', '#9b59b6']
-
-    metrics_ranges = {}
-    for metric in metrics:
-        if metric in pos_data.columns and pos_data[metric].notna().sum() > 0:
-            metrics_ranges[metric] = {
-                'min': pos_data[metric].min(),
-                'max': pos_data[metric].max()
-            }
     
-    for i, player_name in enumerate(player_names):
-        player_data = pos_data[pos_data['Player'] == player_name]
+    key = key or player_key(pos_data)
+    for i, player in enumerate(players):
+        player_data = pos_data[pos_data[key] == player]
         
         if player_data.empty:
             continue
@@ -180,21 +192,12 @@ def create_radar_chart(data, player_names, position):
         hover_texts = []
         
         for metric in metrics:
-            if metric in player_data.columns and player_data[metric].notna().any():
-                value = player_data[metric].iloc[0]
-                
-                if metric in metrics_ranges:
-                    min_val = metrics_ranges[metric]['min']
-                    max_val = metrics_ranges[metric]['max']
-                    if max_val > min_val:
-                        normalized_value = ((value - min_val) / (max_val - min_val)) * 100
-                    else:
-                        normalized_value = 50
-                    
-                    values.append(normalized_value)
-                    labels.append(metric_labels.get(metric, metric))
-                    # Ajouter la valeur réelle au hover
-                    hover_texts.append(f"{value:.2f}")
+            percentile = f'{metric}_percentile'
+            if percentile in player_data.columns and player_data[percentile].notna().any():
+                values.append(player_data[percentile].iloc[0])
+                labels.append(metric_labels.get(metric, metric))
+                # Ajouter la valeur réelle au hover
+                hover_texts.append(f"{player_data[metric].iloc[0]:.2f}")
         
         if values:
             values.append(values[0])
@@ -205,10 +208,10 @@ def create_radar_chart(data, player_names, position):
                 r=values,
                 theta=labels,
                 fill='toself',
-                name=player_name,
+                name=str(player_data['Player'].iloc[0]),
                 line_color=colors[i % len(colors)],
                 text=hover_texts,
-                hovertemplate='<b>%{theta}</b><br>Valeur: %{text}<br><extra></extra>'
+                hovertemplate='<b>%{theta}</b><br>Percentile: %{r:.0f}<br>Valeur: %{text}<br><extra></extra>'
             ))
     
     fig.update_layout(
@@ -218,7 +221,7 @@ def create_radar_chart(data, player_names, position):
                 range=[0, 100]
             )),
         showlegend=True,
-        title=f"Profil {position} (Normalisé 0-100)",
+        title=f"Profil {position} (percentiles du poste)",
         height=600
     )
     
@@ -472,9 +475,11 @@ def show_player_comparison(data):
     
     pos_data = data[data['Position'] == selected_position]
     
+    options, labels = player_choices(pos_data)
     players = st.multiselect(
         "Choisir des joueurs à comparer (max 4)",
-        options=sorted(pos_data['Player'].unique()),
+        options=options,
+        format_func=labels.get,
         max_selections=4
     )
     
@@ -490,16 +495,17 @@ def show_player_comparison(data):
             all_metrics = position_metrics[selected_position]['primary'] + position_metrics[selected_position]['secondary']
             available_metrics = [m for m in all_metrics if m in pos_data.columns]
             
-            comparison_data = pos_data[pos_data['Player'].isin(players)][['Player', 'Squad', 'League'] + available_metrics]
+            comparison_data = pos_data[pos_data[player_key(pos_data)].isin(players)][['Player', 'Squad', 'League'] + available_metrics]
             comparison_data = comparison_data.round(2)
             st.dataframe(comparison_data, use_container_width=True)
 
 def show_player_profile(data):
     st.header("👤 Fiche joueur")
     
-    player_name = st.selectbox("Choisir un joueur", sorted(data['Player'].unique()))
+    options, labels = player_choices(data)
+    player = st.selectbox("Choisir un joueur", options, format_func=labels.get)
     
-    player_data = data[data['Player'] == player_name]
+    player_data = data[data[player_key(data)] == player]
     
     if not player_data.empty:
         player_info = player_data.iloc[0]
@@ -550,7 +556,7 @@ def show_player_profile(data):
 
         
         st.subheader("Profil vs moyenne du poste")
-        fig_radar = create_radar_chart(data, [player_name], position)
+        fig_radar = create_radar_chart(data, [player], position, key=player_key(data))
         st.plotly_chart(fig_radar, use_container_width=True)
 
         st.subheader("Comparaison détaillée avec la moyenne du poste")
@@ -686,7 +692,7 @@ def show_methodology():
 
 @st.cache_data
 def load_kpi_data():
-    """Charge les données KPI depuis les fichiers CSV."""
+    """Charge les données KPI (Parquet, ou CSV à défaut)."""
     kpi_data = {}
     base_path = os.path.join(os.path.dirname(__file__), '..', 'ressources', 'KPI')
     
@@ -697,9 +703,9 @@ def load_kpi_data():
     
     for position, filename in kpi_files.items():
         filepath = os.path.join(base_path, filename)
-        if os.path.exists(filepath):
+        if table_exists(filepath):
             try:
-                df = pd.read_csv(filepath)
+                df = read_table(filepath)
                 kpi_data[position] = df
             except Exception as e:
                 st.warning(f"Erreur lors du chargement de {filename}: {e}")
@@ -766,14 +772,11 @@ def show_kpi_analysis(data):
     kpi_df = kpi_data[selected_position]
     kpi_def = kpi_definitions.get(selected_position, {})
     
-    if selected_position == 'FW':
-        player_col = 'Player'
-        squad_col = 'Squad'
-        exclude_cols = ['Age', 'Min', '90s', 'MainPos']
-    else:
-        player_col = 'Nom du joueur'
-        squad_col = 'Équipe'  
-        exclude_cols = ['Poste']
+    # Tables du moteur de KPI (kpi_engine.py) : Player / Squad ; anciennes
+    # tables défenseurs : libellés français
+    player_col = 'Player' if 'Player' in kpi_df.columns else 'Nom du joueur'
+    squad_col = 'Squad' if 'Squad' in kpi_df.columns else 'Équipe'
+    exclude_cols = ['PlayerID', 'Age', 'Min', '90s', 'MainPos', 'Pos', 'Poste']
     
     numeric_cols = kpi_df.select_dtypes(include=[np.number]).columns.tolist()
     kpi_metrics = [col for col in numeric_cols if col not in exclude_cols]
@@ -861,7 +864,8 @@ def show_kpi_analysis(data):
         show_kpi_detailed(filtered_df, kpi_metrics, kpi_def, player_col, squad_col)
     
     elif analysis_mode == "Comparaisons":
-        show_kpi_comparisons(filtered_df, kpi_metrics, kpi_def, player_col, squad_col)
+        kpi_ranks = load_kpi_ranks(kpi_data)[selected_position]
+        show_kpi_comparisons(filtered_df, kpi_metrics, kpi_def, player_col, squad_col, kpi_ranks)
     
     elif analysis_mode == "Tendances":
         show_kpi_trends(filtered_df, kpi_metrics, kpi_def, player_col, squad_col)
@@ -1172,7 +1176,7 @@ def show_kpi_detailed(df, metrics, definitions, player_col, squad_col):
         st.markdown("##### Classement détaillé")
         st.dataframe(ranking_table, use_container_width=True)
 
-def show_kpi_comparisons(df, metrics, definitions, player_col, squad_col):
+def show_kpi_comparisons(df, metrics, definitions, player_col, squad_col, ranks):
     st.markdown("### Comparaisons avancées")
     
     if not metrics:
@@ -1216,10 +1220,9 @@ def show_kpi_comparisons(df, metrics, definitions, player_col, squad_col):
                 for i, player in enumerate(selected_players):
                     player_data = players_data[players_data[player_col] == player]
                     if not player_data.empty:
-                        values = []
-                        for metric in comparison_metrics:
-                            percentile = (df[metric] <= player_data[metric].iloc[0]).mean() * 100
-                            values.append(percentile)
+                        # Percentiles précalculés (load_kpi_ranks), alignés sur df
+                        row = player_data.index[0]
+                        values = [ranks.at[row, f'{metric}_percentile'] for metric in comparison_metrics]
                         
                         values.append(values[0])
                         metrics_labels = comparison_metrics + [comparison_metrics[0]]
@@ -1,8 +1,15 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import streamlit as st
 
+# storage.py (racine du dépôt) : lecture Parquet des artefacts du pipeline
+ROOT_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT_PATH)
+from storage import compact_dtypes, exists as table_exists, read_table
+from percentiles import KPI_FILES, kpi_metrics, kpi_ranks, kpi_ranks_path, rank_metrics, ranks_path
+
 @st.cache_data
 def load_kpi_natural_names():
     """Charge les noms naturels des KPI depuis les fichiers CSV."""
@@ -54,7 +61,7 @@ def get_natural_name(technical_name, natural_names_map=None):
 def load_and_prepare_data():
     """Charge et prépare toutes les données des 4 postes."""
     # Chemin vers ressources à partir de ce fichier
-    base_path = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'ressources', 'normalized_data'))
+    base_path = os.path.join(ROOT_PATH, 'ressources', 'normalized_data')
 
     files = {
         'FW': 'assembled_data_FW_normalized.csv',
@@ -66,9 +73,9 @@ def load_and_prepare_data():
     all_data = []
     for position, filename in files.items():
         filepath = os.path.join(base_path, filename)
-        if os.path.exists(filepath):
+        if table_exists(filepath):
             try:
-                df = pd.read_csv(filepath)
+                df = read_table(filepath)
             except Exception as e:
                 st.warning(f"Impossible de lire {filename} : {e}")
                 continue
@@ -88,8 +95,10 @@ def load_and_prepare_data():
         st.error("Aucun fichier de données trouvé dans ressources/normalized_data.")
         return pd.DataFrame()
 
-    # Concaténation
-    data = pd.concat(all_data, ignore_index=True, sort=False)
+    # Concaténation au profil compact (float32, int16, catégories) : les
+    # colonnes absentes d'un poste et les catégories propres à chaque poste
+    # repassent en float64 / texte au concat
+    data = compact_dtypes(pd.concat(all_data, ignore_index=True, sort=False))
 
     # Nettoyage et enrichissement
     data = clean_and_enrich_data(data)
@@ -173,8 +182,19 @@ def clean_and_enrich_data(data: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
+@st.cache_data
+def load_ranks(scope):
+    """Table de percentiles / z-scores précalculée (percentiles.py) d'une
+    portée : 'position', 'position_league' ou 'all' ; None si absente."""
+    path = os.path.join(ROOT_PATH, ranks_path(scope))
+    return read_table(path) if table_exists(path) else None
+
 def calculate_percentiles(data: pd.DataFrame, position: str = None, league: str = None) -> pd.DataFrame:
-    """Calcule les percentiles pour les métriques clés (_per_90)."""
+    """
+    Ajoute les percentiles des métriques (_per_90...) : lus dans les
+    tables précalculées au build (percentiles.py) pour le poste, le poste
+    et la ligue, ou tous les joueurs ; calculés en une passe à défaut.
+    """
     df = data.copy()
 
     if position:
@@ -184,11 +204,51 @@ def calculate_percentiles(data: pd.DataFrame, position: str = None, league: str
 
     metric_cols = [col for col in df.columns if col.endswith('_per_90') and df[col].notna().sum() > 0]
 
-    for col in metric_cols:
-        # Percentile par colonne
-        df[f'{col}_percentile'] = df[col].rank(pct=True, method='max') * 100
+    scope = ('position_league' if league else 'position') if position else (None if league else 'all')
+    ranks = load_ranks(scope) if scope else None
+    if ranks is not None and 'PlayerID' in df.columns:
+        # Percentiles des seules métriques renseignées de df ; join (et non
+        # merge) pour garder l'index de l'appelant
+        percentile_cols = [f'{col}_percentile' for col in metric_cols if f'{col}_percentile' in ranks.columns]
+        return df.join(ranks.set_index(['PlayerID', 'Position'])[percentile_cols], on=['PlayerID', 'Position'])
 
-    return df
+    percentiles = rank_metrics(df, metric_cols).filter(like='_percentile')
+    return pd.concat([df, percentiles], axis=1)
+
+def kpi_ranks_match(table, kpi, position):
+    """
+    La table précalculée correspond-elle à la table KPI chargée : mêmes
+    joueurs (PlayerID, Position) dans le même ordre et une colonne de
+    percentile pour chaque KPI ?
+    """
+    if table is None or len(table) != len(kpi) or 'PlayerID' not in kpi.columns:
+        return False
+    if not {'PlayerID', 'Position'} <= set(table.columns):
+        return False
+    expected = [f'{metric}_percentile' for metric in kpi_metrics(kpi)]
+    if any(col not in table.columns for col in expected):
+        return False
+    same_players = np.array_equal(table['PlayerID'].to_numpy(dtype='float64', na_value=np.nan),
+                                  kpi['PlayerID'].to_numpy(dtype='float64', na_value=np.nan), equal_nan=True)
+    return same_players and (table['Position'].astype(str) == position).all()
+
+@st.cache_data
+def load_kpi_ranks(kpi_data):
+    """
+    Percentiles / z-scores des KPI par poste, alignés ligne à ligne sur
+    les tables KPI : tables précalculées (percentiles.py --kpi) si elles
+    correspondent à la table chargée (kpi_ranks_match), calculés une fois
+    sinon.
+    """
+    ranks = {}
+    for position, kpi in kpi_data.items():
+        path = os.path.join(ROOT_PATH, kpi_ranks_path(KPI_FILES.get(position, '')))
+        table = read_table(path) if position in KPI_FILES and table_exists(path) else None
+        if not kpi_ranks_match(table, kpi, position):
+            table = kpi_ranks(kpi, position)
+        table.index = kpi.index
+        ranks[position] = table
+    return ranks
 
 def get_position_metrics():
     """Retourne les métriques importantes par poste."""
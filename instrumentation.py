@@ -0,0 +1,133 @@
+"""
+Instrumentation des étapes du pipeline : temps, mémoire, lignes.
+
+    report = RunReport("assembler_v2")
+    with report.stage("assemble", rows_in=n) as stage:
+        df = assemble_data(dataframes, metrics=stage.metrics)
+        stage.output(df)
+    report.write("run.json")
+
+Pour chaque étape : temps écoulé et temps CPU, pic de mémoire allouée
+pendant l'étape (tracemalloc, numpy et pandas compris), pic RSS du
+processus, lignes en entrée et en sortie, et métriques propres à l'étape
+(taux d'appariement des jointures, octets lus...). Le rapport JSON a des
+clés triées et un ordre d'étapes stable : deux runs se comparent avec diff.
+"""
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def max_rss_mb():
+    """Pic RSS du processus depuis son démarrage (Mo), arrondi ; None si
+    le module resource est absent (Windows)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux : Ko ; macOS : octets
+    return round(rss / (1 << 20) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def count_rows(obj):
+    """Nombre de lignes d'un DataFrame, ou total d'un dict / tuple de DataFrames
+    (un entier est renvoyé tel quel)."""
+    if obj is None or isinstance(obj, int):
+        return obj
+    if isinstance(obj, dict):
+        obj = list(obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(len(df) for df in obj)
+    return len(obj)
+
+
+@dataclass
+class StageRecord:
+    name: str
+    rows_in: int = None
+    rows_out: int = None
+    columns_out: int = None
+    wall_s: float = None
+    cpu_s: float = None
+    peak_mb: float = None
+    max_rss_mb: float = None
+    metrics: dict = field(default_factory=dict)
+
+    def output(self, obj):
+        """Enregistre la taille de la sortie de l'étape."""
+        self.rows_out = count_rows(obj)
+        if hasattr(obj, "shape"):
+            self.columns_out = obj.shape[1]
+
+
+class RunReport:
+    def __init__(self, name, trace_memory=True):
+        """
+        trace_memory : mesure le pic de mémoire de chaque étape avec
+        tracemalloc (ralentit un peu les allocations).
+        """
+        self.name = name
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.started_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        record = StageRecord(name, rows_in=count_rows(rows_in))
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_s = round(time.perf_counter() - wall, 4)
+            record.cpu_s = round(time.process_time() - cpu, 4)
+            if self.trace_memory:
+                record.peak_mb = round((tracemalloc.get_traced_memory()[1] - base) / 1e6, 2)
+            record.max_rss_mb = max_rss_mb()
+            self.stages.append(record)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "argv": sys.argv[1:],
+            "python": platform.python_version(),
+            "total": {
+                "wall_s": round(time.perf_counter() - self._wall, 4),
+                "cpu_s": round(time.process_time() - self._cpu, 4),
+                "max_rss_mb": max_rss_mb(),
+            },
+            "stages": [asdict(stage) for stage in self.stages],
+        }
+
+    def write(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1, sort_keys=True, default=str)
+        return path
+
+    def summary(self):
+        """Tableau texte des étapes."""
+        lines = [f"{'étape':24s} {'temps':>8s} {'CPU':>8s} {'pic Mo':>8s} {'lignes':>15s}"]
+        for s in self.stages:
+            rows = f"{s.rows_in if s.rows_in is not None else '-'} -> {s.rows_out if s.rows_out is not None else '-'}"
+            peak = f"{s.peak_mb:8.1f}" if s.peak_mb is not None else f"{'-':>8s}"
+            lines.append(f"{s.name:24s} {s.wall_s:7.3f}s {s.cpu_s:7.3f}s {peak} {rows:>15s}")
+        return "\n".join(lines)
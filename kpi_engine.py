@@ -0,0 +1,352 @@
+"""
+Moteur de KPI déclaratif : les KPI d'un poste sont les lignes de son
+fichier de définitions (ressources/KPI/kpi_sum_FW.csv, KPI_sum_DF.csv).
+
+    python kpi_engine.py                  # tous les postes
+    python kpi_engine.py --positions FW --check
+
+Colonnes utilisées d'une définition :
+    KPI       nom de la colonne produite
+    Calcul    formule : opérations + - * /, parenthèses, nombres et noms
+              de colonnes de la table normalisée du poste, noms à espaces
+              ou à symboles compris (Att 3rd_possession, Sh/90, xG+/-90) ;
+              des variantes séparées par « sinon » ("KP_per_90 si dispo
+              sinon KP/90s") : la première dont toutes les colonnes existent
+              est retenue
+    Colonnes  colonnes dont dépend la formule ("KP[, KP_per_90], 90s",
+              "Tkl, Int, 90s ou Tkl+Int_per_90") ; une formule qui en
+              utilise une autre est une définition invalide. Une colonne
+              dont le nom dépend de l'ordre de jointure s'écrit par sa
+              statistique logique famille:nom ("misc:Lost", "passing:Att"),
+              traduite en nom physique (Lost_misc, Att_passing) par le
+              schéma des colonnes (ressources/cleaned_data/column_schema.json)
+
+Les noms de colonnes de la formule sont reconnus d'après Colonnes (nom
+déclaré le plus long d'abord) : "Sh/90" est une colonne et non Sh / 90.
+Toutes les formules d'un poste sont évaluées en une passe sur les
+colonnes (tableaux NumPy extraits une fois) ; une division par zéro ou une
+valeur manquante donne NaN. Un KPI dont aucune variante n'est calculable
+est signalé avec les colonnes manquantes (--strict : erreur).
+
+Ajouter un KPI : ajouter une ligne au fichier de définitions.
+"""
+import argparse
+import os
+import re
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from column_schema import load_schemas
+from storage import read_table, table_columns, write_table
+
+KPI_DIR = './ressources/KPI'
+NORMALIZED_DIR = './ressources/normalized_data'
+COLUMN_SCHEMA = './ressources/cleaned_data/column_schema.json'
+
+
+@dataclass
+class KPISet:
+    definitions: str
+    source: str
+    output: str
+    # Colonnes d'identification reprises en tête de la table KPI
+    id_cols: list
+
+
+KPI_SETS = {
+    'FW': KPISet('kpi_sum_FW.csv', 'assembled_data_FW_normalized.csv', 'kpi_fw.csv',
+                 id_cols=['PlayerID', 'Season', 'Player', 'Squad', 'Comp', 'Age', 'MainPos', 'Min', '90s']),
+    'DF': KPISet('KPI_sum_DF.csv', 'assembled_data_DF_normalized.csv', 'KPI_df.csv',
+                 id_cols=['PlayerID', 'Season', 'Player', 'Squad', 'Comp', 'Pos', 'Min', '90s']),
+}
+
+NUMBER = re.compile(r'\d+(?:\.\d+)?')
+IDENTIFIER = re.compile(r'[A-Za-z0-9_%]+')
+OPERATORS = '+-*/()'
+
+
+class KPIDefinitionError(ValueError):
+    pass
+
+
+def _continues(text, end):
+    """Le caractère en end prolonge-t-il un nom ou un nombre ?"""
+    return end < len(text) and (text[end].isalnum() or text[end] in '_%')
+
+
+def tokenize(text, names):
+    """Jetons (type, valeur) d'une formule ; names : noms de colonnes
+    connus, reconnus en priorité (le plus long d'abord)."""
+    names = sorted(names, key=len, reverse=True)
+    tokens, i = [], 0
+    while i < len(text):
+        if text[i].isspace():
+            i += 1
+            continue
+        name = next((name for name in names
+                     if text.startswith(name, i) and not _continues(text, i + len(name))), None)
+        if name is not None:
+            tokens.append(('col', name))
+            i += len(name)
+            continue
+        number = NUMBER.match(text, i)
+        if number and not _continues(text, number.end()):
+            tokens.append(('num', float(number.group())))
+            i = number.end()
+            continue
+        identifier = IDENTIFIER.match(text, i)
+        if identifier:
+            tokens.append(('col', identifier.group()))
+            i = identifier.end()
+            continue
+        if text[i] in OPERATORS:
+            tokens.append(('op', text[i]))
+            i += 1
+            continue
+        raise KPIDefinitionError(f"Caractère inattendu {text[i]!r} dans {text!r}")
+    return tokens
+
+
+class _Parser:
+    """Descente récursive : expr := terme (+|- terme)*, terme := facteur
+    (*|/ facteur)*, facteur := -facteur | (expr) | nombre | colonne."""
+
+    def __init__(self, tokens, text):
+        self.tokens, self.text, self.pos = tokens, text, 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        tree = self.expr()
+        if self.pos != len(self.tokens):
+            raise KPIDefinitionError(f"Jeton inattendu {self.peek()[1]!r} dans {self.text!r}")
+        return tree
+
+    def expr(self):
+        tree = self.term()
+        while self.peek() in (('op', '+'), ('op', '-')):
+            tree = (self.take()[1], tree, self.term())
+        return tree
+
+    def term(self):
+        tree = self.factor()
+        while self.peek() in (('op', '*'), ('op', '/')):
+            tree = (self.take()[1], tree, self.factor())
+        return tree
+
+    def factor(self):
+        kind, value = self.take()
+        if (kind, value) == ('op', '-'):
+            return ('neg', self.factor())
+        if (kind, value) == ('op', '('):
+            tree = self.expr()
+            if self.take() != ('op', ')'):
+                raise KPIDefinitionError(f"Parenthèse non fermée dans {self.text!r}")
+            return tree
+        if kind in ('num', 'col'):
+            return (kind, value)
+        raise KPIDefinitionError(f"Formule incomplète : {self.text!r}")
+
+
+def _columns_of(tree):
+    if tree[0] == 'col':
+        return [tree[1]]
+    if tree[0] == 'num':
+        return []
+    return [col for child in tree[1:] for col in _columns_of(child)]
+
+
+@dataclass
+class Formula:
+    text: str
+    tree: tuple
+    columns: list
+
+    @classmethod
+    def parse(cls, text, names=(), aliases=None):
+        """aliases : nom de la formule -> colonne physique (noms logiques)."""
+        aliases = aliases or {}
+        tokens = [(kind, aliases.get(value, value)) if kind == 'col' else (kind, value)
+                  for kind, value in tokenize(text, names)]
+        tree = _Parser(tokens, text).parse()
+        return cls(text, tree, list(dict.fromkeys(_columns_of(tree))))
+
+
+@dataclass
+class KPI:
+    name: str
+    formulas: list
+    columns: list
+    label: str = None
+
+    def formula_for(self, available):
+        """Première variante dont toutes les colonnes sont disponibles."""
+        return next((f for f in self.formulas if all(col in available for col in f.columns)), None)
+
+    def missing(self, available):
+        return [[col for col in f.columns if col not in available] for f in self.formulas]
+
+
+def parse_columns(text):
+    """'KP[, KP_per_90], 90s' ou 'Tkl, Int, 90s ou Tkl+Int_per_90' -> noms."""
+    text = text.replace('[', '').replace(']', '')
+    names = [name.strip() for part in re.split(r'\s+ou\s+', text) for name in part.split(',')]
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def logical_aliases(names, schema=None):
+    """Noms famille:nom connus du schéma -> nom physique ('misc:Lost' ->
+    'Lost_misc') ; les autres noms (np:G-xG...) sont des noms physiques."""
+    if schema is None:
+        return {}
+    refs = {name: tuple(name.split(':', 1)) for name in names if ':' in name}
+    return {name: schema.physical(*ref) for name, ref in refs.items() if ref in schema}
+
+
+def parse_kpi(name, calcul, columns, label=None, schema=None):
+    declared = parse_columns(columns)
+    aliases = logical_aliases(declared, schema)
+    # 'A si dispo sinon B', 'A si brut sinon B' : variantes par ordre de préférence
+    variants = [re.sub(r'\s+si\s+\w+\s*$', '', part.strip()) for part in re.split(r'\s+sinon\s+', calcul.strip())]
+    formulas = [Formula.parse(variant, declared, aliases) for variant in variants]
+    declared = [aliases.get(col, col) for col in declared]
+    undeclared = [col for f in formulas for col in f.columns if col not in declared]
+    if undeclared:
+        raise KPIDefinitionError(f"{name} : colonnes {undeclared} absentes de Colonnes ({columns!r})")
+    return KPI(name, formulas, declared, label)
+
+
+def load_definitions(path, schema=None):
+    """KPI d'un fichier de définitions, dans l'ordre des lignes ; toutes les
+    erreurs de définition sont signalées ensemble. schema : ColumnSchema
+    des noms logiques famille:nom."""
+    definitions = pd.read_csv(path)
+    kpis, errors = [], []
+    for row in definitions.itertuples(index=False):
+        try:
+            kpis.append(parse_kpi(row.KPI, row.Calcul, row.Colonnes, getattr(row, 'natural_name', None), schema))
+        except KPIDefinitionError as e:
+            errors.append(str(e))
+    if errors:
+        raise KPIDefinitionError(f"{path} :\n  " + "\n  ".join(errors))
+    return kpis
+
+
+def _evaluate(tree, columns):
+    kind = tree[0]
+    if kind == 'col':
+        return columns[tree[1]]
+    if kind == 'num':
+        return tree[1]
+    if kind == 'neg':
+        return -_evaluate(tree[1], columns)
+    left, right = np.broadcast_arrays(_evaluate(tree[1], columns), _evaluate(tree[2], columns))
+    if kind == '+':
+        return left + right
+    if kind == '-':
+        return left - right
+    if kind == '*':
+        return left * right
+    # Division : NaN pour un dénominateur nul ou manquant
+    return np.divide(left, right, out=np.full(left.shape, np.nan), where=right != 0)
+
+
+def resolve(kpis, available):
+    """(KPI -> variante retenue, KPI -> colonnes manquantes de chaque variante)."""
+    available = set(available)
+    chosen, unavailable = {}, {}
+    for kpi in kpis:
+        formula = kpi.formula_for(available)
+        if formula is None:
+            unavailable[kpi.name] = kpi.missing(available)
+        else:
+            chosen[kpi.name] = formula
+    return chosen, unavailable
+
+
+def evaluate(df, kpis):
+    """
+    Valeur de chaque KPI calculable pour chaque ligne de df, en un bloc
+    (index de df) ; renvoie aussi les KPI non calculables et leurs colonnes
+    manquantes.
+    """
+    chosen, unavailable = resolve(kpis, df.columns)
+    needed = list(dict.fromkeys(col for formula in chosen.values() for col in formula.columns))
+    # Colonnes extraites une fois, partagées par toutes les formules
+    values = df[needed].to_numpy(dtype='float64', na_value=np.nan)
+    columns = {col: values[:, j] for j, col in enumerate(needed)}
+    n = len(df)
+    block = {name: np.broadcast_to(_evaluate(formula.tree, columns), (n,)).astype('float64')
+             for name, formula in chosen.items()}
+    return pd.DataFrame(block, index=df.index), unavailable
+
+
+def build_kpi_table(df, kpis, id_cols=(), min_minutes=0):
+    """Table KPI d'un poste : colonnes d'identification puis un KPI par colonne.
+    Les joueurs sont ceux de la table normalisée (plus de 180 minutes) ;
+    min_minutes relève ce seuil."""
+    if min_minutes and 'Min' in df.columns:
+        df = df[df['Min'].fillna(0) >= min_minutes]
+    block, unavailable = evaluate(df, kpis)
+    ids = df[[col for col in id_cols if col in df.columns]]
+    return pd.concat([ids, block], axis=1).reset_index(drop=True), unavailable
+
+
+def _describe_missing(missing):
+    return ' ou '.join('(' + ', '.join(cols) + ')' for cols in missing)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calcul des KPI par poste à partir des fichiers de définitions")
+    parser.add_argument('--positions', nargs='+', choices=list(KPI_SETS), default=list(KPI_SETS),
+                        help="Postes à calculer (défaut : tous)")
+    parser.add_argument('--check', action='store_true',
+                        help="Vérifier les définitions et leurs colonnes sans rien écrire")
+    parser.add_argument('--strict', action='store_true', help="Échouer si un KPI n'est pas calculable")
+    parser.add_argument('--min-minutes', type=float, default=0,
+                        help="Minutes jouées minimales (défaut : celles de la table normalisée)")
+    parser.add_argument('--csv', action='store_true', help="Écrire aussi les sorties en CSV")
+    args = parser.parse_args()
+
+    # Schéma écrit par assembler_v2.py : noms logiques des définitions
+    schema = load_schemas(COLUMN_SCHEMA)['players'] if os.path.exists(COLUMN_SCHEMA) else None
+
+    failed = []
+    for position in args.positions:
+        kpi_set = KPI_SETS[position]
+        start = time.perf_counter()
+        kpis = load_definitions(f'{KPI_DIR}/{kpi_set.definitions}', schema)
+        source = f'{NORMALIZED_DIR}/{kpi_set.source}'
+
+        if args.check:
+            chosen, unavailable = resolve(kpis, table_columns(source))
+            print(f"{position} : {len(chosen)}/{len(kpis)} KPI calculables")
+            for name, formula in chosen.items():
+                print(f"  {name} = {formula.text}")
+        else:
+            needed = {col for kpi in kpis for col in kpi.columns} | set(kpi_set.id_cols)
+            df = read_table(source, columns=needed)
+            table, unavailable = build_kpi_table(df, kpis, kpi_set.id_cols, args.min_minutes)
+            output = write_table(table, f'{KPI_DIR}/{kpi_set.output}', csv=args.csv)
+            print(f"{position} : {len(kpis) - len(unavailable)}/{len(kpis)} KPI, {len(table)} joueurs "
+                  f"en {(time.perf_counter() - start) * 1000:.0f} ms -> {output}")
+
+        for name, missing in unavailable.items():
+            print(f"  {name} non calculable, colonnes manquantes : {_describe_missing(missing)}")
+        if unavailable:
+            failed.append(position)
+
+    if args.strict and failed:
+        raise SystemExit(f"KPI non calculables pour {', '.join(failed)} (--strict)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Appariement approximatif de joueurs entre deux tables (record linkage).
+
+    matches = link(keepers_df, goalieadv_df)
+    merged = merge_matches(keepers_df, goalieadv_df, matches, columns=['PSxG', 'Cmp'])
+
+Les noms sont normalisés (accents, translittérations courantes, casse,
+ponctuation) puis indexés par blocs : trigrammes du nom et code phonétique
+(Soundex) de chaque mot. Seules les paires qui partagent au moins
+`min_shared` clés de bloc sont comparées, et les clés trop fréquentes
+(plus de `max_block` noms d'un côté) sont ignorées : le coût reste
+proche du linéaire, même sur plusieurs saisons ou des sources externes.
+L'indexation se fait sur les noms distincts, pas sur les lignes.
+
+Chaque paire candidate reçoit un score pondéré (nom, année de naissance,
+club, nationalité) ; l'appariement est un-pour-un, glouton par score
+décroissant, avec départage par position : le résultat ne dépend que du
+contenu des tables (table de correspondance stable).
+
+Les colonnes `exact` (ex. saison, compétition) doivent être égales des
+deux côtés : elles sont ajoutées aux clés de bloc.
+
+    python linkage.py ScrapeData/keepers_cleaned.csv ScrapeData/goalieadv_cleaned.csv -o matches.csv
+"""
+import argparse
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from storage import read_table, write_table
+
+# Poids des composantes du score ; une colonne absente d'un des deux côtés
+# est retirée et les poids restants sont renormalisés.
+WEIGHTS = {'name': 0.55, 'born': 0.2, 'squad': 0.15, 'nation': 0.1}
+
+# Lettres que la décomposition Unicode ne ramène pas à l'ASCII
+TRANSLITERATION = str.maketrans({
+    'ø': 'o', 'Ø': 'O', 'đ': 'dj', 'Đ': 'Dj', 'ł': 'l', 'Ł': 'L', 'ß': 'ss',
+    'æ': 'ae', 'Æ': 'Ae', 'œ': 'oe', 'Œ': 'Oe', 'ı': 'i', 'þ': 'th', 'Þ': 'Th', 'ð': 'd',
+})
+
+# Mots sans valeur pour comparer deux clubs
+CLUB_STOPWORDS = {'fc', 'cf', 'ac', 'afc', 'sc', 'ssc', 'as', 'us', 'ss', 'rc', 'sv', 'vfb', 'vfl',
+                  'tsg', 'ud', 'cd', 'rcd', 'ogc', 'club', 'de', 'calcio', '1'}
+
+_SOUNDEX = str.maketrans("bfpvcgjkqsxzdtlmnr", "111122222222334556")
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(name):
+    """'Łukasz Skorupski' -> 'lukasz skorupski' ; None / NaN -> ''."""
+    if not isinstance(name, str):
+        return ''
+    name = unicodedata.normalize('NFKD', name.translate(TRANSLITERATION))
+    name = ''.join(c for c in name if not unicodedata.combining(c)).lower()
+    return _NON_ALNUM.sub(' ', name).strip()
+
+
+def phonetic_key(token):
+    """Code Soundex d'un mot normalisé ('skorupski' -> 's261')."""
+    codes = token.translate(_SOUNDEX)
+    key, previous = token[0], codes[0]
+    for code in codes[1:]:
+        if code.isdigit() and code != previous:
+            key += code
+        # h et w ne séparent pas deux consonnes du même groupe
+        if code not in 'hw':
+            previous = code
+    return (key + '000')[:4]
+
+
+def block_keys(norm):
+    """Clés de bloc d'un nom normalisé : trigrammes et codes phonétiques."""
+    if not norm:
+        return []
+    compact = f" {norm.replace(' ', '')} "
+    keys = {f"g:{compact[i:i + 3]}" for i in range(len(compact) - 2)}
+    keys.update(f"p:{phonetic_key(token)}" for token in norm.split() if token[0].isalpha())
+    return sorted(keys)
+
+
+def name_similarity(a, b):
+    """Similarité de deux noms normalisés, tolérante aux prénoms omis
+    ('alisson' / 'alisson becker')."""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    ratio = SequenceMatcher(None, a, b).ratio()
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    if tokens_a <= tokens_b or tokens_b <= tokens_a:
+        # Tous les mots du nom le plus court se retrouvent dans l'autre
+        ratio = max(ratio, 0.9)
+    return ratio
+
+
+def nation_code(nation):
+    """'es ESP' -> 'ESP'."""
+    if not isinstance(nation, str) or not nation.strip():
+        return None
+    return nation.split()[-1].upper()
+
+
+def club_tokens(squad):
+    return frozenset(normalize_name(squad).split()) - CLUB_STOPWORDS
+
+
+def _units(df, name_col, exact):
+    """Noms distincts (par valeurs des colonnes exact) et ligne -> unité."""
+    norm = df[name_col].map(normalize_name)
+    frame = pd.DataFrame({col: df[col].to_numpy() for col in exact})
+    frame['norm'] = norm.to_numpy()
+    frame['row'] = np.arange(len(df))
+    unit_cols = list(exact) + ['norm']
+    frame['unit'] = frame.groupby(unit_cols, sort=True, dropna=False).ngroup()
+    units = frame.drop_duplicates('unit').set_index('unit').sort_index()[unit_cols]
+    return frame[['row', 'unit']], units
+
+
+def _explode_keys(units, exact):
+    prefix = units[list(exact)].astype(str).agg('|'.join, axis=1) + '|' if exact else ''
+    keys = units['norm'].map(block_keys)
+    exploded = keys.explode().dropna()
+    if exact:
+        exploded = prefix.loc[exploded.index] + exploded
+    return pd.DataFrame({'unit': exploded.index.to_numpy(), 'key': exploded.to_numpy()})
+
+
+def candidate_units(left_units, right_units, exact=(), min_shared=2, max_block=50, min_dice=0.4,
+                    min_name_score=0.6):
+    """Paires de noms distincts (unit_l, unit_r, name) à comparer, via l'index de blocs.
+
+    Les paires sont d'abord filtrées sur le coefficient de Dice de leurs clés
+    (calcul vectorisé), la similarité de chaînes n'est calculée que sur les
+    paires restantes."""
+    left_keys = _explode_keys(left_units, exact)
+    right_keys = _explode_keys(right_units, exact)
+
+    # Clés trop fréquentes : peu discriminantes et quadratiques
+    sizes_l = left_keys['key'].value_counts()
+    sizes_r = right_keys['key'].value_counts()
+    frequent = set(sizes_l.index[sizes_l > max_block]) | set(sizes_r.index[sizes_r > max_block])
+    left_keys = left_keys[~left_keys['key'].isin(frequent)]
+    right_keys = right_keys[~right_keys['key'].isin(frequent)]
+
+    n_keys_l = left_keys.groupby('unit')['key'].size()
+    n_keys_r = right_keys.groupby('unit')['key'].size()
+
+    shared = (left_keys.merge(right_keys, on='key', suffixes=('_l', '_r'))
+              .groupby(['unit_l', 'unit_r'], sort=True).size())
+    pairs = shared[shared >= min_shared].index.to_frame(index=False)
+    shared = shared[shared >= min_shared].to_numpy()
+    dice = 2 * shared / (n_keys_l.loc[pairs['unit_l']].to_numpy() + n_keys_r.loc[pairs['unit_r']].to_numpy())
+    pairs = pairs[dice >= min_dice]
+
+    names_l = left_units['norm'].to_numpy()[pairs['unit_l'].to_numpy()]
+    names_r = right_units['norm'].to_numpy()[pairs['unit_r'].to_numpy()]
+    pairs['name'] = [name_similarity(a, b) for a, b in zip(names_l, names_r)]
+    return pairs[pairs['name'] >= min_name_score]
+
+
+def _born_score(left, right):
+    """1 si même année, 0.5 à un an près (saison à cheval), 0 sinon ; 0.5 si inconnue."""
+    diff = np.abs(pd.to_numeric(left, errors='coerce') - pd.to_numeric(right, errors='coerce'))
+    return np.where(np.isnan(diff), 0.5, np.where(diff == 0, 1.0, np.where(diff <= 1, 0.5, 0.0)))
+
+
+def _nation_score(left, right):
+    codes_l = pd.Series(left).map(nation_code).to_numpy()
+    codes_r = pd.Series(right).map(nation_code).to_numpy()
+    missing = pd.isna(codes_l) | pd.isna(codes_r)
+    return np.where(missing, 0.5, (codes_l == codes_r).astype(float))
+
+
+def _squad_score(left, right):
+    """Jaccard des mots significatifs des noms de clubs."""
+    scores = []
+    for a, b in zip(pd.Series(left).map(club_tokens), pd.Series(right).map(club_tokens)):
+        scores.append(len(a & b) / len(a | b) if a and b else 0.5)
+    return np.asarray(scores, dtype=float)
+
+
+def link(left, right, name_col='Player', born_col='Born', squad_col='Squad', nation_col='Nation',
+         exact=(), threshold=0.75, min_name_score=0.6, min_shared=2, max_block=50, verbose=True):
+    """
+    Apparie les lignes de left et right (un-pour-un). min_name_score :
+    similarité minimale des noms, quels que soient les autres critères.
+
+    Renvoie la table de correspondance triée par position dans left :
+    left, right (positions des lignes), left_name, right_name, score et une
+    colonne par composante du score.
+    """
+    exact = list(exact)
+    rows_l, units_l = _units(left, name_col, exact)
+    rows_r, units_r = _units(right, name_col, exact)
+    pairs = candidate_units(units_l, units_r, exact, min_shared=min_shared, max_block=max_block,
+                            min_name_score=min_name_score)
+
+    # Paires de noms -> paires de lignes
+    candidates = (pairs.merge(rows_l.rename(columns={'row': 'left', 'unit': 'unit_l'}), on='unit_l')
+                  .merge(rows_r.rename(columns={'row': 'right', 'unit': 'unit_r'}), on='unit_r'))
+    li, ri = candidates['left'].to_numpy(), candidates['right'].to_numpy()
+
+    scorers = {'born': (born_col, _born_score), 'squad': (squad_col, _squad_score),
+               'nation': (nation_col, _nation_score)}
+    weights = {'name': WEIGHTS['name']}
+    for component, (col, scorer) in scorers.items():
+        if col in left.columns and col in right.columns:
+            candidates[component] = scorer(left[col].to_numpy()[li], right[col].to_numpy()[ri])
+            weights[component] = WEIGHTS[component]
+    total = sum(weights.values())
+    candidates['score'] = sum(candidates[c] * w for c, w in weights.items()) / total
+
+    # Appariement un-pour-un : score décroissant, puis positions croissantes
+    candidates = candidates[candidates['score'] >= threshold].sort_values(
+        ['score', 'left', 'right'], ascending=[False, True, True], kind='mergesort')
+    used_l, used_r, keep = set(), set(), []
+    for pos, (l, r) in enumerate(zip(candidates['left'].to_numpy(), candidates['right'].to_numpy())):
+        if l not in used_l and r not in used_r:
+            used_l.add(l)
+            used_r.add(r)
+            keep.append(pos)
+    matches = candidates.iloc[keep].sort_values('left', kind='mergesort')
+
+    matches = matches.assign(left_name=left[name_col].to_numpy()[matches['left'].to_numpy()],
+                             right_name=right[name_col].to_numpy()[matches['right'].to_numpy()])
+    columns = ['left', 'right', 'left_name', 'right_name', 'score'] + list(weights)
+    matches = matches[columns].round({c: 4 for c in ['score'] + list(weights)}).reset_index(drop=True)
+
+    if verbose:
+        exact_names = (matches['name'] == 1.0).sum()
+        print(f"  Linkage : {len(pairs)} paires de noms comparées (sur {len(units_l) * len(units_r)} possibles), "
+              f"{len(matches)}/{len(left)} lignes appariées dont {len(matches) - exact_names} par nom approché")
+    return matches
+
+
+def merge_matches(left, right, matches, columns):
+    """Ajoute à left les colonnes de right des lignes appariées (jointure à gauche)."""
+    picked = right[columns].iloc[matches['right'].to_numpy()]
+    picked.index = left.index[matches['left'].to_numpy()]
+    return left.join(picked)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Appariement approximatif de joueurs entre deux tables")
+    parser.add_argument('left')
+    parser.add_argument('right')
+    parser.add_argument('-o', '--output', required=True, help="Table de correspondance à écrire")
+    parser.add_argument('--exact', nargs='*', default=[], help="Colonnes qui doivent être égales (ex. Season)")
+    parser.add_argument('--threshold', type=float, default=0.75)
+    parser.add_argument('--csv', action='store_true', help="Écrire aussi la sortie en CSV")
+    args = parser.parse_args()
+
+    matches = link(read_table(args.left), read_table(args.right), exact=args.exact, threshold=args.threshold)
+    write_table(matches, args.output, csv=args.csv)
+    fuzzy = matches[matches['left_name'] != matches['right_name']]
+    if len(fuzzy):
+        print(fuzzy.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,274 @@
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
-def normalize_stats(df, min_col='Min', exclude_cols=None):
+from column_schema import load_schemas, stats
+from storage import check_compact, compact_dtypes, exists, read_table, table_columns, write_table
+
+# Registre des tables scrapées (ScrapeData/specs.py) : chemin de la table
+# d'équipes selon la disposition (partitionnée ou historique)
+SCRAPE_DIR = Path(__file__).resolve().parent / 'ScrapeData'
+sys.path.insert(0, str(SCRAPE_DIR))
+from specs import COMPETITIONS, DEFAULT_COMPETITION, DEFAULT_DATA_DIR, DEFAULT_SEASON, TableSpec
+
+CLEANED_DIR = './ressources/cleaned_data'
+NORMALIZED_DIR = './ressources/normalized_data'
+SCHEMA_PATH = f'{CLEANED_DIR}/column_schema.json'
+
+# fichier d'entrée -> fichier normalisé
+FILES = {
+    'assembled_data_DF.csv': 'assembled_data_DF_normalized.csv',
+    'assembled_data_MF.csv': 'assembled_data_MF_normalized.csv',
+    'assembled_data_FW.csv': 'assembled_data_FW_normalized.csv',
+    'keepers_enrichis.csv': 'keepers_enrichis_normalized.csv',
+}
+
+# Statistiques défensives ajustées à la possession (références logiques,
+# résolues par le schéma des colonnes : 'Def 3rd' des tacles et non des touches)
+POSSESSION_ADJUSTED_STATS = stats('defensive', 'Tkl', 'TklW', 'Def 3rd', 'Mid 3rd', 'Att 3rd',
+                                  'Blocks', 'Int', 'Tkl+Int', 'Clr') + [('misc', 'Recov')]
+
+DEFAULT_EXCLUDE_COLS = ['PlayerID', 'Season', 'Player', 'Nation', 'Pos', 'Squad', 'Comp', 'Age', 'Born', 'MP', 'Starts', '90s']
+
+
+def squads_table_path(season=DEFAULT_SEASON, competition=DEFAULT_COMPETITION):
+    """Table d'équipes (possession, squads_for) scrapée par scrape_all.py :
+    disposition partitionnée (défaut), sinon historique ; None si absente."""
+    spec = TableSpec('possession', season, competition, kind='squads_for')
+    for path in (spec.output_path(DEFAULT_DATA_DIR), spec.output_path(SCRAPE_DIR, layout='legacy')):
+        if exists(path):
+            return path
+    return None
+
+
+def ratio_block(df, target_cols, denominator, scale, suffix):
+    """
+    Bloc {col}{suffix} = valeur / dénominateur * scale, en une opération
+    NumPy. Une valeur manquante donne NaN, de même qu'un dénominateur nul,
+    négatif ou manquant (pas de division par zéro).
+    """
+    denominator = np.asarray(denominator, dtype='float64')[:, None]
+    values = df[target_cols].to_numpy(dtype='float64', na_value=np.nan)
+    valid = np.broadcast_to(denominator > 0, values.shape)
+    ratio = np.divide(values, denominator, out=np.full(values.shape, np.nan), where=valid) * scale
+    return pd.DataFrame(ratio, index=df.index, columns=[f'{col}{suffix}' for col in target_cols])
+
+
+def team_keys(*frames):
+    """Clé d'une équipe : (Squad, Comp) si toutes les tables ont Comp, Squad
+    seul sinon (table d'une seule compétition)."""
+    return ['Squad', 'Comp'] if all('Comp' in df.columns for df in frames) else ['Squad']
+
+
+def team_possession(frames, squads=None, verbose=True):
+    """
+    Possession (%) de chaque équipe, Series indexée par la clé d'équipe
+    (team_keys) : un même nom de club dans deux compétitions reste deux
+    équipes.
+
+    squads : table d'équipes scrapée (possession_squads_for) avec Squad,
+    Comp et Poss ; une équipe en double y est une erreur. Sans elle, la
+    possession est estimée sur les tables de joueurs de tous les postes :
+    taux de touches de l'équipe (touches / minutes, par groupby-transform)
+    rapporté à la moyenne des équipes de sa compétition, 50 % pour une
+    équipe dans la moyenne.
+    """
+    if squads is not None:
+        keys = team_keys(squads, *frames)
+        teams = squads.astype({key: 'object' for key in keys})
+        duplicated = teams[teams.duplicated(keys, keep=False)]
+        if len(duplicated):
+            raise ValueError(f"Table d'équipes : équipes en double {duplicated[keys].drop_duplicates().values.tolist()}")
+        poss = teams.set_index(keys)['Poss'].astype('float64')
+        if verbose:
+            print(f"  possession : {len(poss)} équipes (table d'équipes)")
+        return poss
+
+    keys = team_keys(*frames)
+    players = pd.concat([df[[col for col in keys + ['Min', 'Touches'] if col in df.columns]]
+                         for df in frames], ignore_index=True)
+    players = players.astype({key: 'object' for key in keys})
+    if 'Touches' not in players.columns:
+        raise KeyError("Possession introuvable : ni table d'équipes ni colonne Touches")
+    touches = players['Touches'].astype('float64')
+    # Minutes des seuls joueurs dont les touches sont connues (pas les gardiens)
+    minutes = players['Min'].astype('float64').where(touches.notna())
+    by_team = players.assign(_touches=touches, _minutes=minutes).groupby(keys)
+    players['rate'] = by_team['_touches'].transform('sum') / by_team['_minutes'].transform('sum')
+
+    teams = players.drop_duplicates(keys).set_index(keys)['rate']
+    if 'Comp' in keys:
+        league_rate = teams.groupby(level='Comp').transform('mean')
+    else:
+        league_rate = teams.mean()
+    poss = 50 * teams / league_rate
+    if verbose:
+        print(f"  possession : {len(poss)} équipes (estimée par les touches, "
+              f"{poss.min():.1f} à {poss.max():.1f} %)")
+    return poss.rename('Poss')
+
+
+def team_values(df, values):
+    """Valeur de l'équipe de chaque ligne de df ; values : Series indexée
+    par la clé d'équipe (team_possession)."""
+    keys = list(values.index.names)
+    rows = df[keys].astype('object').reset_index(drop=True)
+    return rows.merge(values.rename('_value').reset_index(), on=keys, how='left')['_value'] \
+        .to_numpy(dtype='float64', na_value=np.nan)
+
+
+def per_90(df, target_cols, min_col='Min', **context):
+    return ratio_block(df, target_cols, df[min_col], 90, '_per_90')
+
+
+def per_100_touches(df, target_cols, touches_col='Touches', **context):
+    if touches_col not in df.columns:
+        return pd.DataFrame(index=df.index)
+    target_cols = [col for col in target_cols if col != touches_col]
+    return ratio_block(df, target_cols, df[touches_col], 100, '_per_100_touches')
+
+
+def possession_adjusted(df, target_cols, possession=None, schema=None, min_col='Min', **context):
+    """
+    Statistiques défensives par 90 minutes ajustées à la possession de
+    l'équipe (méthode StatsBomb) : stat * 2 / (1 + exp(-0.1 * (Poss - 50))).
+    Une équipe qui a le ballon défend moins : ses joueurs sont rehaussés,
+    ceux d'une équipe qui le subit sont ramenés vers la moyenne.
+    """
+    if possession is None:
+        raise ValueError("possession_adjusted : possession des équipes requise (team_possession)")
+    if schema is not None:
+        candidates = [schema.physical(*ref) for ref in POSSESSION_ADJUSTED_STATS if ref in schema]
+    else:
+        candidates = [raw for _, raw in POSSESSION_ADJUSTED_STATS]
+    target_cols = [col for col in candidates if col in target_cols]
+
+    poss = team_values(df, possession)
+    factor = 2 / (1 + np.exp(-0.1 * (poss - 50)))
+    per_90 = ratio_block(df, target_cols, df[min_col], 90, '_padj_per_90')
+    return per_90.mul(factor, axis=0)
+
+
+# Stratégies de normalisation : nom -> fonction(df, colonnes, **contexte) -> bloc
+STRATEGIES = {
+    'per90': per_90,
+    'per100touches': per_100_touches,
+    'padj': possession_adjusted,
+}
+
+SUFFIXES = ('_padj_per_90', '_per_100_touches', '_per_90')
+
+
+def base_column(col):
+    """'TklW_padj_per_90' -> 'TklW'."""
+    for suffix in SUFFIXES:
+        if col.endswith(suffix):
+            return col.removesuffix(suffix)
+    return col
+
+
+def normalize(df, strategies=('per90',), min_col='Min', min_minutes=180, exclude_cols=None,
+              columns=None, **context):
+    """
+    Applique les stratégies demandées aux joueurs à plus de min_minutes
+    minutes ; chaque stratégie produit son bloc de colonnes en une passe,
+    ajoutés en une seule concaténation.
+
+    columns : colonnes à produire ('TklW_per_90', 'TklW_padj_per_90' ou
+    'TklW') ; None : toutes.
+    context : données partagées par les stratégies (possession : Series
+    équipe -> possession, team_possession ; schema : ColumnSchema de la
+    table).
+    """
     if exclude_cols is None:
-        exclude_cols = ['Player', 'Nation', 'Pos', 'Squad', 'Comp', 'Age', 'Born', 'MP', 'Starts', '90s']
+        exclude_cols = DEFAULT_EXCLUDE_COLS
 
-    df = df[df[min_col] > 180].copy()
+    df = df[df[min_col] > min_minutes].copy()
 
     numeric_cols = df.select_dtypes(include='number').columns
     target_cols = [col for col in numeric_cols if col not in exclude_cols and col != min_col]
-    
-    for col in target_cols:
-        df[f'{col}_per_90'] = df[col] / df[min_col] * 90
-    
-    return df
-
-df_def = pd.read_csv('./ressources/cleaned_data/assembled_data_DF.csv')
-df_mid = pd.read_csv('./ressources/cleaned_data/assembled_data_MF.csv')
-df_fw = pd.read_csv('./ressources/cleaned_data/assembled_data_FW.csv')
-df_gk = pd.read_csv('./ressources/cleaned_data/keepers_enrichis.csv')
-
-df_def_norm = normalize_stats(df_def)
-df_mid_norm = normalize_stats(df_mid)
-df_fw_norm = normalize_stats(df_fw)
-df_gk_norm = normalize_stats(df_gk)
-
-df_def_norm.to_csv('./ressources/normalized_data/assembled_data_DF_normalized.csv', index=False)
-df_mid_norm.to_csv('./ressources/normalized_data/assembled_data_MF_normalized.csv', index=False)
-df_fw_norm.to_csv('./ressources/normalized_data/assembled_data_FW_normalized.csv', index=False)
-df_gk_norm.to_csv('./ressources/normalized_data/keepers_enrichis_normalized.csv', index=False)
\ No newline at end of file
+
+    if columns is not None:
+        wanted = set(columns)
+        target_cols = [col for col in target_cols if col in {base_column(c) for c in wanted}]
+
+    blocks = [STRATEGIES[name](df, target_cols, min_col=min_col, **context) for name in strategies]
+    if columns is not None:
+        blocks = [block[[col for col in block.columns if col in wanted or base_column(col) in wanted]]
+                  for block in blocks]
+    return pd.concat([df, *blocks], axis=1)
+
+
+def normalize_stats(df, min_col='Min', exclude_cols=None, columns=None):
+    """
+    Ajoute une colonne {col}_per_90 par statistique numérique (joueurs à
+    plus de 180 minutes). Le bloc est calculé en une opération NumPy
+    (valeurs / minutes * 90) et ajouté en une seule concaténation.
+
+    Une valeur manquante donne NaN, de même que des minutes nulles,
+    négatives ou manquantes (pas de division par zéro).
+    columns : colonnes per-90 à produire ('TklW_per_90' ou 'TklW') ;
+    None : toutes.
+    """
+    return normalize(df, ('per90',), min_col=min_col, exclude_cols=exclude_cols, columns=columns)
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalisation des statistiques (par 90 minutes, par 100 touches, ajustée à la possession)")
+    parser.add_argument('--csv', action='store_true', help="Écrire aussi les sorties en CSV")
+    parser.add_argument('--files', nargs='+', choices=list(FILES), default=list(FILES),
+                        help="Fichiers à normaliser (défaut : tous)")
+    parser.add_argument('--columns', nargs='+', default=None,
+                        help="Colonnes à produire, ex. TklW_per_90 Int_padj_per_90 (défaut : toutes)")
+    parser.add_argument('--strategies', nargs='+', choices=list(STRATEGIES), default=['per90'],
+                        help="Stratégies de normalisation (défaut : per90)")
+    parser.add_argument('--min-minutes', type=float, default=180,
+                        help="Minutes jouées minimales (défaut : 180)")
+    parser.add_argument('--compact', action='store_true',
+                        help="Profil compact : float32, entiers int16, métadonnées en catégories "
+                             "(précision vérifiée contre le float64)")
+    parser.add_argument('--squads', default=None,
+                        help="Table d'équipes avec la possession (défaut : table possession "
+                             "squads_for scrapée pour --season / --competition ; absente : "
+                             "possession estimée par les touches)")
+    parser.add_argument('--season', default=DEFAULT_SEASON, help="Saison de la table d'équipes (défaut : %(default)s)")
+    parser.add_argument('--competition', choices=list(COMPETITIONS), default=DEFAULT_COMPETITION,
+                        help="Compétition de la table d'équipes (défaut : %(default)s)")
+    args = parser.parse_args()
+
+    tables = {source: read_table(f'{CLEANED_DIR}/{source}') for source in args.files}
+
+    possession, schemas = None, {}
+    if 'padj' in args.strategies:
+        # Agrégats d'équipe calculés une fois, sur les tables de tous les postes
+        squads_path = args.squads or squads_table_path(args.season, args.competition)
+        squads = None
+        if squads_path is not None and exists(squads_path):
+            squads = read_table(squads_path, columns=['Squad', 'Comp', 'Poss'])
+        others = []
+        for source in FILES:
+            path = f'{CLEANED_DIR}/{source}'
+            if source not in tables and exists(path):
+                columns = [col for col in table_columns(path) if col in ('Squad', 'Comp', 'Min', 'Touches')]
+                others.append(read_table(path, columns=columns))
+        possession = team_possession(list(tables.values()) + others, squads)
+        if exists(SCHEMA_PATH):
+            schemas = load_schemas(SCHEMA_PATH)
+
+    for source, df in tables.items():
+        schema = schemas.get('keepers' if source == 'keepers_enrichis.csv' else 'players')
+        normalized = normalize(df, args.strategies, min_minutes=args.min_minutes, columns=args.columns,
+                               possession=possession, schema=schema)
+        if args.compact:
+            compacted = compact_dtypes(normalized)
+            errors = check_compact(normalized, compacted)
+            before, after = (frame.memory_usage(deep=True).sum() / 1e6 for frame in (normalized, compacted))
+            print(f"  {FILES[source]} : {before:.2f} -> {after:.2f} Mo, "
+                  f"erreur relative max {errors.max() if len(errors) else 0:.1e}")
+            normalized = compacted
+        write_table(normalized, f'{NORMALIZED_DIR}/{FILES[source]}', csv=args.csv)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Tables de percentiles et de z-scores, précalculées au build pour le dashboard.
+
+    python percentiles.py          # tables des joueurs (tables normalisées)
+    python percentiles.py --kpi    # tables des KPI (kpi_fw, KPI_df)
+
+Pour chaque métrique des tables normalisées (_per_90, _padj_per_90,
+_per_100_touches), trois portées :
+
+    position         parmi les joueurs du même poste
+    position_league  parmi les joueurs du même poste et de la même compétition
+    all              parmi tous les joueurs
+
+Chaque portée est une table (ressources/normalized_data/ranks_<portée>)
+avec PlayerID, Position, Comp puis, par métrique, {métrique}_percentile
+(rang en pourcentage, ex aequo au rang le plus haut, comme
+data/loader.calculate_percentiles) et {métrique}_z (écart à la moyenne du
+groupe en écarts-types). Le calcul se fait en une passe groupby par
+portée, toutes métriques ensemble. Seuls les joueurs retenus par le
+dashboard (MIN_MINUTES) entrent dans les groupes.
+
+Les tables des KPI ont la même forme (PlayerID, Position puis les
+colonnes de chaque KPI), une ligne par ligne de la table KPI et dans le
+même ordre (ressources/KPI/<table>_ranks).
+"""
+import argparse
+
+import pandas as pd
+
+from normalize_ratio import base_column
+from storage import exists, read_table, write_table
+
+NORMALIZED_DIR = './ressources/normalized_data'
+KPI_DIR = './ressources/KPI'
+
+# poste -> table normalisée
+POSITION_FILES = {
+    'FW': 'assembled_data_FW_normalized.csv',
+    'MF': 'assembled_data_MF_normalized.csv',
+    'DF': 'assembled_data_DF_normalized.csv',
+    'GK': 'keepers_enrichis_normalized.csv',
+}
+
+# poste -> table KPI
+KPI_FILES = {
+    'FW': 'kpi_fw.csv',
+    'DF': 'KPI_df.csv',
+}
+# Colonnes numériques des tables KPI qui ne sont pas des KPI
+KPI_EXCLUDE = ['PlayerID', 'Age', 'Min', '90s']
+
+# portée -> colonnes de regroupement
+SCOPES = {
+    'position': ['Position'],
+    'position_league': ['Position', 'Comp'],
+    'all': [],
+}
+
+ID_COLS = ['PlayerID', 'Position', 'Comp']
+
+# Seuil de minutes du dashboard (data/loader.clean_and_enrich_data)
+MIN_MINUTES = 450
+
+
+def ranks_path(scope):
+    return f'{NORMALIZED_DIR}/ranks_{scope}.csv'
+
+
+def kpi_ranks_path(filename):
+    return f"{KPI_DIR}/{filename.replace('.csv', '_ranks.csv')}"
+
+
+def metric_columns(df):
+    """Colonnes normalisées de df (TklW_per_90, Tkl_padj_per_90...)."""
+    return [col for col in df.columns if base_column(col) != col and pd.api.types.is_numeric_dtype(df[col])]
+
+
+def rank_metrics(df, metrics, by=()):
+    """
+    Percentile (0-100) et z-score de chaque métrique au sein des groupes
+    définis par les colonnes by (aucune : tout df). Un écart-type nul ou
+    un groupe d'un joueur donne un z-score manquant.
+    """
+    values = df[metrics].astype('float64')
+    if by:
+        groups = values.groupby([df[col] for col in by], observed=True, sort=False)
+        percentile = groups.rank(pct=True, method='max')
+        mean, std = groups.transform('mean'), groups.transform('std')
+    else:
+        percentile = values.rank(pct=True, method='max')
+        mean, std = values.mean(), values.std()
+    z = (values - mean) / std.where(std > 0)
+    return pd.concat([(percentile * 100).add_suffix('_percentile'), z.add_suffix('_z')], axis=1)
+
+
+def load_players(files=POSITION_FILES, min_minutes=MIN_MINUTES):
+    """Joueurs des tables normalisées, avec leur poste, au seuil du dashboard."""
+    frames = []
+    for position, filename in files.items():
+        path = f'{NORMALIZED_DIR}/{filename}'
+        if not exists(path):
+            print(f"  {filename} absent, poste {position} ignoré")
+            continue
+        df = read_table(path)
+        df = df[df['Min'].fillna(0) >= min_minutes]
+        frames.append(df.assign(Position=position))
+    players = pd.concat(frames, ignore_index=True, sort=False)
+    players['Comp'] = players['Comp'].astype('object')
+    return players
+
+
+def player_ranks(players, scopes=SCOPES):
+    """Table de percentiles et z-scores de chaque portée."""
+    metrics = metric_columns(players)
+    ids = players[[col for col in ID_COLS if col in players.columns]]
+    return {scope: pd.concat([ids, rank_metrics(players, metrics, by)], axis=1)
+            for scope, by in scopes.items()}
+
+
+def kpi_metrics(kpi):
+    """Colonnes KPI d'une table KPI (numériques, hors KPI_EXCLUDE)."""
+    return [col for col in kpi.select_dtypes(include='number').columns if col not in KPI_EXCLUDE]
+
+
+def kpi_ranks(kpi, position):
+    """Percentiles et z-scores des KPI d'une table, ligne à ligne, avec la
+    clé (PlayerID, Position) de chaque ligne."""
+    ids = kpi[['PlayerID']].assign(Position=position) if 'PlayerID' in kpi.columns \
+        else pd.DataFrame({'Position': position}, index=kpi.index)
+    return pd.concat([ids, rank_metrics(kpi, kpi_metrics(kpi))], axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tables de percentiles et de z-scores pour le dashboard")
+    parser.add_argument('--kpi', action='store_true', help="Tables des KPI au lieu des tables des joueurs")
+    parser.add_argument('--csv', action='store_true', help="Écrire aussi les sorties en CSV")
+    args = parser.parse_args()
+
+    if args.kpi:
+        for position, filename in KPI_FILES.items():
+            kpi = read_table(f'{KPI_DIR}/{filename}')
+            ranks = kpi_ranks(kpi, position)
+            write_table(ranks, kpi_ranks_path(filename), csv=args.csv, compact=True)
+            print(f"  {position} : {len(kpi_metrics(kpi))} KPI, {len(ranks)} joueurs")
+        return
+
+    players = load_players()
+    for scope, ranks in player_ranks(players).items():
+        write_table(ranks, ranks_path(scope), csv=args.csv, compact=True)
+        print(f"  {scope} : {len(ranks)} joueurs, {(ranks.shape[1] - len(ID_COLS)) // 2} métriques")
+
+if __name__ == "__main__":
+    main()
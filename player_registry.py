@@ -0,0 +1,165 @@
+"""
+Registre persistant des joueurs : un identifiant entier (PlayerID) par personne.
+
+    registry = PlayerRegistry()
+    df = add_player_ids(df, registry)
+    registry.save()
+
+Le registre (ressources/player_registry) garde une ligne par variante
+connue d'un joueur : identifiant FBref, nom tel qu'écrit, nom normalisé,
+année de naissance, nationalité, dernier club vu. Résolution d'une ligne :
+
+    1. identifiant FBref (colonne FbrefID des tables scrapées) déjà connu
+       -> son identifiant : deux homonymes nés la même année et de même
+       nationalité restent deux joueurs, un joueur transféré ou dont le nom
+       change d'orthographe reste un seul joueur ;
+    2. identifiant FBref inconnu : rattaché au joueur du registre qui n'a
+       pas encore d'identifiant FBref et qui a la même variante (nom
+       normalisé, naissance, nationalité), si un seul identifiant FBref de
+       la table la revendique (registres antérieurs à la colonne FbrefID) ;
+    3. ligne sans identifiant FBref (repli) : variante déjà connue (nom
+       normalisé, naissance, nationalité ; le club n'en fait pas partie)
+       portée par un seul joueur, sinon appariement approché (linkage.py)
+       avec les joueurs du registre ;
+    4. sinon nouvel identifiant.
+
+Les identifiants ne sont jamais réattribués. Les nouveaux sont numérotés
+dans l'ordre des variantes (identifiant FBref, nom normalisé, naissance,
+nationalité) : deux runs sur les mêmes tables donnent les mêmes
+identifiants. Les jointures et recherches sur PlayerID se font sur un
+int64 plutôt que sur des chaînes, et l'historique multi-saisons d'un
+joueur a une clé simple.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from linkage import link, nation_code, normalize_name
+from storage import exists, read_table, write_table
+
+REGISTRY_PATH = Path(__file__).resolve().parent / "ressources" / "player_registry.csv"
+
+REGISTRY_COLUMNS = ['PlayerID', 'FbrefID', 'Player', 'Key', 'Born', 'Nation', 'Squad']
+ID_KEY = 'FbrefID'
+# Clé de repli, pour les lignes sans identifiant FBref
+ALIAS_KEY = ['Key', 'Born', 'Nation']
+
+
+class PlayerRegistry:
+    def __init__(self, path=REGISTRY_PATH, threshold=0.85, min_name_score=0.9):
+        """
+        threshold, min_name_score : score global et similarité des noms
+        minimaux (linkage.link) pour rattacher une nouvelle variante à un
+        joueur existant ; plus hauts que pour un appariement ponctuel, une
+        fusion à tort de deux joueurs étant durable.
+        """
+        self.path = Path(path)
+        self.threshold = threshold
+        self.min_name_score = min_name_score
+        if exists(self.path):
+            # Registre antérieur à la colonne FbrefID : variantes sans identifiant FBref
+            self.table = read_table(self.path).reindex(columns=REGISTRY_COLUMNS)
+        else:
+            self.table = pd.DataFrame({col: pd.Series(dtype='object') for col in REGISTRY_COLUMNS})
+        self.table = self.table.astype({'PlayerID': 'int64', ID_KEY: 'object', 'Born': 'Int64'})
+        self.added = 0
+
+    def __len__(self):
+        return self.table['PlayerID'].nunique()
+
+    def _aliases(self, df, name_col, born_col, nation_col, squad_col, id_col):
+        """Variantes distinctes de df et, pour chaque ligne, le numéro de sa variante."""
+        names = df[name_col].astype('object')
+        keys = {name: normalize_name(name) for name in pd.unique(names)}
+        frame = pd.DataFrame({
+            'FbrefID': (df[id_col].astype('object').where(df[id_col].notna(), None) if id_col in df.columns
+                        else pd.Series(None, index=df.index, dtype='object')).to_numpy(),
+            'Player': names.to_numpy(),
+            'Key': names.map(keys).to_numpy(),
+            'Born': (pd.to_numeric(df[born_col], errors='coerce') if born_col in df.columns
+                     else pd.Series(np.nan, index=df.index)).round().astype('Int64').to_numpy(),
+            'Nation': (df[nation_col].astype('object').map(nation_code) if nation_col in df.columns
+                       else pd.Series(None, index=df.index, dtype='object')).to_numpy(),
+            'Squad': df[squad_col].astype('object').to_numpy() if squad_col in df.columns else None,
+        })
+        alias = frame.groupby([ID_KEY] + ALIAS_KEY, sort=True, dropna=False).ngroup().to_numpy()
+        # Dernière ligne vue de chaque variante (nom affiché, dernier club)
+        aliases = frame.assign(alias=alias).drop_duplicates('alias', keep='last').sort_values('alias')
+        return aliases.drop(columns='alias').reset_index(drop=True), alias
+
+    def _by_alias_key(self, aliases, known):
+        """PlayerID (float, NaN sinon) des variantes par (nom normalisé,
+        naissance, nationalité) parmi les lignes known du registre, et
+        masque des variantes ambiguës (portées par plusieurs joueurs), qui
+        ne sont pas résolues."""
+        players = known.drop_duplicates(ALIAS_KEY + ['PlayerID'])[ALIAS_KEY + ['PlayerID']]
+        shared = players.duplicated(ALIAS_KEY, keep=False)
+        found = aliases[ALIAS_KEY].merge(players[~shared], on=ALIAS_KEY, how='left')['PlayerID']
+        ambiguous = aliases[ALIAS_KEY].merge(players[shared].drop_duplicates(ALIAS_KEY), on=ALIAS_KEY, how='left')
+        return found.to_numpy(dtype='float64'), ambiguous['PlayerID'].notna().to_numpy()
+
+    def assign(self, df, name_col='Player', born_col='Born', nation_col='Nation', squad_col='Squad',
+               id_col='FbrefID'):
+        """PlayerID (int64) de chaque ligne de df ; le registre est complété
+        en mémoire (save() pour l'écrire)."""
+        aliases, alias = self._aliases(df, name_col, born_col, nation_col, squad_col, id_col)
+        has_id = aliases[ID_KEY].notna().to_numpy()
+        with_id = self.table[ID_KEY].notna()
+
+        # 1. Identifiant FBref connu
+        by_id = self.table[with_id].drop_duplicates(ID_KEY).set_index(ID_KEY)['PlayerID']
+        ids = aliases[ID_KEY].map(by_id).to_numpy(dtype='float64', copy=True)
+
+        # 2. Identifiant FBref nouveau : joueur du registre encore sans identifiant FBref
+        legacy_rows = self.table[~self.table['PlayerID'].isin(self.table.loc[with_id, 'PlayerID'])]
+        legacy = np.where(has_id & np.isnan(ids), self._by_alias_key(aliases, legacy_rows)[0], np.nan)
+        claimed = ~np.isnan(legacy)
+        claims = pd.Series(aliases[ID_KEY].to_numpy()[claimed]).groupby(legacy[claimed]).nunique()
+        legacy[np.isin(legacy, claims.index[claims > 1])] = np.nan
+        ids = np.where(np.isnan(ids), legacy, ids)
+
+        # 3. Sans identifiant FBref : variante connue, puis appariement approché
+        # (sauf variante ambiguë : une fusion à tort est durable)
+        fallback, ambiguous = self._by_alias_key(aliases, self.table)
+        ids = np.where(np.isnan(ids) & ~has_id, fallback, ids)
+
+        unresolved = np.flatnonzero(np.isnan(ids) & ~has_id & ~ambiguous)
+        if len(unresolved) and len(self.table):
+            # Un joueur du registre = sa dernière variante enregistrée ; le club
+            # n'entre pas dans le score (transferts)
+            players = self.table.drop_duplicates('PlayerID', keep='last').reset_index(drop=True)
+            matches = link(aliases.iloc[unresolved].reset_index(drop=True), players,
+                           squad_col=None, threshold=self.threshold,
+                           min_name_score=self.min_name_score, verbose=False)
+            ids[unresolved[matches['left'].to_numpy()]] = players['PlayerID'].to_numpy()[matches['right'].to_numpy()]
+
+        # 4. Nouveaux joueurs
+        new = np.isnan(ids)
+        next_id = int(self.table['PlayerID'].max()) + 1 if len(self.table) else 1
+        ids[new] = np.arange(next_id, next_id + new.sum())
+
+        # Variantes (identifiant FBref compris) absentes du registre
+        variant = [ID_KEY] + ALIAS_KEY
+        recorded = aliases[variant].merge(self.table[variant].drop_duplicates(), on=variant, how='left',
+                                          indicator=True)['_merge'].eq('both').to_numpy()
+        added = aliases[~recorded].assign(PlayerID=ids[~recorded].astype('int64'))
+        if len(added):
+            self.table = pd.concat([self.table, added[REGISTRY_COLUMNS]], ignore_index=True)
+            self.added += len(added)
+        return ids.astype('int64')[alias]
+
+    def save(self, csv=False):
+        return write_table(self.table, self.path, csv=csv)
+
+
+def add_player_ids(df, registry=None, verbose=True, **columns):
+    """Copie de df avec la colonne PlayerID en tête."""
+    registry = registry if registry is not None else PlayerRegistry()
+    before = len(registry)
+    ids = pd.Series(registry.assign(df, **columns), index=df.index, name='PlayerID')
+    df = pd.concat([ids, df.drop(columns='PlayerID', errors='ignore')], axis=1)
+    if verbose:
+        print(f"  PlayerID : {df['PlayerID'].nunique()} joueurs, dont {len(registry) - before} "
+              f"nouveaux dans le registre ({len(registry)} au total)")
+    return df
@@ -0,0 +1,249 @@
+"""
+Stockage columnar (Parquet / Arrow) des artefacts du pipeline.
+
+Chaque étape (assembleurs, normalize_ratio.py, exports KPI, dashboard)
+lit et écrit ses tables avec read_table / write_table :
+
+    - format d'échange : Parquet, types conservés d'une étape à l'autre ;
+    - projection : read_table(path, columns=[...]) ne lit que les colonnes
+      demandées ; read_tables lit plusieurs tables en parallèle et mesure
+      les octets lus et le temps par fichier ;
+    - les colonnes de métadonnées répétées (Nation, Pos, Squad, Comp,
+      MainPos) sont stockées en catégories (encodage par dictionnaire) ;
+    - l'export CSV reste disponible (write_table(..., csv=True)) pour les
+      notebooks et les outils externes.
+    - profil compact (compact_dtypes, write_table(..., compact=True)) :
+      réels en float32, compteurs entiers en int16 (int32 si les valeurs
+      dépassent), métadonnées en catégories.
+
+Précision du profil compact : un float32 garde 24 bits de mantisse, soit
+une erreur relative d'au plus 6e-8 par valeur (environ 7 chiffres
+significatifs), sans effet sur les statistiques par 90 minutes affichées ;
+deux valeurs qui ne diffèrent qu'au-delà du 7e chiffre deviennent égales
+(ex aequo dans un classement). check_compact compare une table compacte à
+sa version float64 et échoue au-delà de COMPACT_RTOL ; les entiers sont
+convertis sans perte (plage vérifiée).
+
+Les chemins s'écrivent avec l'extension historique (.csv) : la version
+Parquet est le fichier de même nom en .parquet. À la lecture, le Parquet
+est préféré sauf si le CSV est plus récent (fichier régénéré à la main) ;
+en son absence, le CSV est lu.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CATEGORY_COLUMNS = ('Nation', 'Pos', 'Squad', 'Comp', 'MainPos')
+# Identifiants laissés en int64 par le profil compact
+COMPACT_EXCLUDE = ('PlayerID',)
+# Erreur relative tolérée par le passage en float32 (arrondi : 6e-8)
+COMPACT_RTOL = 1e-6
+
+
+def parquet_path(path):
+    return Path(path).with_suffix('.parquet')
+
+
+def csv_path(path):
+    return Path(path).with_suffix('.csv')
+
+
+def _source(path):
+    """Fichier à lire pour ce chemin : Parquet si à jour, CSV sinon."""
+    pq_file, csv_file = parquet_path(path), csv_path(path)
+    if pq_file.exists():
+        if not csv_file.exists() or pq_file.stat().st_mtime >= csv_file.stat().st_mtime:
+            return pq_file
+    if csv_file.exists():
+        return csv_file
+    raise FileNotFoundError(f"Ni {pq_file} ni {csv_file} n'existent")
+
+
+def exists(path):
+    return parquet_path(path).exists() or csv_path(path).exists()
+
+
+def encode_categories(df):
+    """Convertit les colonnes de métadonnées textuelles en catégories."""
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype) \
+                and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _smallest_int(values, nullable):
+    """Type entier le plus petit (int16, sinon int32) qui contient les valeurs."""
+    low, high = values.min(), values.max()
+    for bits in (16, 32):
+        info = np.iinfo(f'int{bits}')
+        if pd.isna(low) or (low >= info.min and high <= info.max):
+            return f'Int{bits}' if nullable else f'int{bits}'
+    return values.dtype
+
+
+def compact_dtypes(df):
+    """
+    Profil compact : réels en float32, entiers en int16 (int32 si
+    nécessaire), métadonnées en catégories. Renvoie une copie.
+    """
+    df = encode_categories(df.copy())
+    dtypes = {}
+    for col, dtype in df.dtypes.items():
+        if col in COMPACT_EXCLUDE or isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype):
+            continue
+        nullable = isinstance(dtype, pd.api.extensions.ExtensionDtype)
+        if pd.api.types.is_float_dtype(dtype):
+            dtypes[col] = 'Float32' if nullable else 'float32'
+        elif pd.api.types.is_integer_dtype(dtype):
+            dtypes[col] = _smallest_int(df[col], nullable)
+    dtypes = {col: dtype for col, dtype in dtypes.items() if str(df[col].dtype) != str(dtype)}
+    if not dtypes:
+        return df
+    # astype colonne par colonne fragmente les blocs : copie consolidée
+    return df.astype(dtypes).copy()
+
+
+def check_compact(original, compacted, rtol=COMPACT_RTOL):
+    """
+    Vérifie une table compacte contre sa version d'origine (float64) :
+    valeurs manquantes aux mêmes places, entiers identiques, réels à moins
+    de rtol en erreur relative. Renvoie l'erreur relative maximale de chaque
+    colonne réelle ; ValueError au-delà de la tolérance.
+    """
+    floats = [col for col in compacted.columns if pd.api.types.is_float_dtype(compacted[col].dtype)]
+    ints = [col for col in compacted.columns
+            if pd.api.types.is_integer_dtype(compacted[col].dtype) and col in original.columns]
+
+    expected = original[floats].to_numpy(dtype='float64', na_value=np.nan)
+    actual = compacted[floats].to_numpy(dtype='float64', na_value=np.nan)
+    if not np.array_equal(np.isnan(expected), np.isnan(actual)):
+        raise ValueError("Profil compact : valeurs manquantes modifiées")
+    scale = np.maximum(np.abs(expected), np.finfo('float32').tiny)
+    with np.errstate(invalid='ignore'):
+        error = np.abs(actual - expected) / scale
+    errors = pd.Series(np.nanmax(np.where(np.isnan(error), 0, error), axis=0, initial=0), index=floats)
+
+    too_far = errors[errors > rtol]
+    if len(too_far):
+        raise ValueError(f"Profil compact : erreur relative > {rtol} sur {too_far.to_dict()}")
+    changed = [col for col in ints if not original[col].astype('Int64').equals(compacted[col].astype('Int64'))]
+    if changed:
+        raise ValueError(f"Profil compact : entiers modifiés dans {changed}")
+    return errors
+
+
+def read_table(path, columns=None, row_filter=None):
+    """
+    Lit une table du pipeline.
+
+    columns : colonnes à charger (projection) ; les colonnes absentes du
+    fichier sont ignorées, l'ordre du fichier est conservé.
+    row_filter : prédicat pyarrow (pyarrow.compute.Expression) sur les lignes,
+    appliqué pendant la lecture du Parquet (après lecture pour un CSV).
+    """
+    source = _source(path)
+    if source.suffix == '.parquet':
+        if columns is not None:
+            available = pq.read_schema(source).names
+            wanted = set(columns)
+            columns = [col for col in available if col in wanted]
+        return pd.read_parquet(source, columns=columns, filters=row_filter)
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda col: col in wanted
+    df = encode_categories(pd.read_csv(source, usecols=usecols))
+    if row_filter is not None:
+        # Numéros des lignes retenues par le prédicat, évalué par Arrow
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.append_column('__row', pa.array(np.arange(len(df))))
+        df = df.iloc[table.filter(row_filter)['__row'].to_numpy()].reset_index(drop=True)
+    return df
+
+
+def table_columns(path):
+    """Colonnes de la table, sans lire les données."""
+    source = _source(path)
+    if source.suffix == '.parquet':
+        return pq.read_schema(source).names
+    return list(pd.read_csv(source, nrows=0).columns)
+
+
+def bytes_to_read(path, columns=None):
+    """Octets lus sur disque pour charger ces colonnes : en Parquet, taille
+    des seules colonnes projetées ; en CSV, tout le fichier."""
+    source = _source(path)
+    if source.suffix != '.parquet':
+        return source.stat().st_size
+    metadata = pq.ParquetFile(source).metadata
+    wanted = None if columns is None else set(columns)
+    total = 0
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            chunk = row_group.column(j)
+            if wanted is None or chunk.path_in_schema in wanted:
+                total += chunk.total_compressed_size
+    return total
+
+
+def read_tables(paths, columns=None, row_filters=None, workers=4):
+    """
+    Lit plusieurs tables en parallèle (pool de threads : pyarrow et le
+    parseur CSV de pandas libèrent le GIL).
+
+    columns : None (tout lire) ou dict chemin -> colonnes à charger.
+    row_filters : None ou dict chemin -> prédicat sur les lignes (voir read_table).
+    Renvoie (dict chemin -> DataFrame, rapport) ; le rapport contient une
+    ligne par fichier : octets lus, temps de lecture, lignes, colonnes.
+    Les fichiers absents sont ignorés.
+    """
+    columns = columns or {}
+    row_filters = row_filters or {}
+
+    def load(path):
+        start = time.perf_counter()
+        df = read_table(path, columns.get(path), row_filters.get(path))
+        return df, {
+            'file': Path(path).name,
+            'bytes': bytes_to_read(path, columns.get(path)),
+            'seconds': time.perf_counter() - start,
+            'rows': df.shape[0],
+            'columns': df.shape[1],
+        }
+
+    paths = [path for path in paths if exists(path)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(load, paths))
+    tables = {path: df for path, (df, _) in zip(paths, results)}
+    return tables, [stats for _, stats in results]
+
+
+def _replace_atomic(write, target):
+    tmp = target.with_name(target.name + '.tmp')
+    write(tmp)
+    os.replace(tmp, target)
+
+
+def write_table(df, path, csv=False, compact=False):
+    """
+    Écrit la table en Parquet (et en CSV si csv=True) ; renvoie le chemin
+    du fichier Parquet. Les écritures sont atomiques.
+    compact : écrire au profil compact (voir compact_dtypes).
+    """
+    target = parquet_path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    df = compact_dtypes(df) if compact else encode_categories(df.copy())
+    if csv:
+        _replace_atomic(lambda tmp: df.to_csv(tmp, index=False), csv_path(path))
+    # Parquet écrit en dernier : il reste la version préférée à la lecture
+    _replace_atomic(lambda tmp: df.to_parquet(tmp, index=False), target)
+    return target
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# Modules du pipeline à la racine du dépôt (storage.py, kpi_engine.py...)
+# et modules du scraping (ScrapeData/extract.py...), importés à plat
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "ScrapeData"))
+sys.path.insert(0, str(ROOT))
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from assembler_v2 import add_season, aggregate_transfers
+
+
+def rows(records):
+    return pd.DataFrame(records, columns=['PlayerID', 'Season', 'Player', 'Squad', 'Comp', 'Min', 'Gls', 'Cmp%'])
+
+
+def test_seasons_of_one_player_stay_separate():
+    df = rows([
+        [7, '2022-2023', 'Vitinha', 'Porto', 'pt Primeira Liga', 2000, 3, 90.0],
+        [7, '2023-2024', 'Vitinha', 'Genoa', 'it Serie A', 285, 2, 80.0],
+        [7, '2023-2024', 'Vitinha', 'Marseille', 'fr Ligue 1', 923, 3, 70.0],
+    ])
+    out = aggregate_transfers(df, verbose=False).set_index('Season')
+    assert list(out.index) == ['2022-2023', '2023-2024']
+    assert (out['PlayerID'] == 7).all()
+    assert out.loc['2022-2023', 'Min'] == 2000
+    assert out.loc['2023-2024', 'Min'] == 1208
+    assert out.loc['2023-2024', 'Gls'] == 5
+    # Moyenne pondérée par les minutes de la saison seulement
+    assert out.loc['2023-2024', 'Cmp%'] == pytest.approx((80.0 * 285 + 70.0 * 923) / 1208)
+    assert out.loc['2023-2024', 'Squad'] == 'Marseille'
+
+
+def test_without_season_column_groups_on_player_only():
+    df = rows([
+        [7, '2023-2024', 'Vitinha', 'Genoa', 'it Serie A', 285, 2, 80.0],
+        [7, '2023-2024', 'Vitinha', 'Marseille', 'fr Ligue 1', 923, 3, 70.0],
+    ]).drop(columns='Season')
+    out = aggregate_transfers(df, verbose=False)
+    assert len(out) == 1 and out.loc[0, 'Min'] == 1208
+
+
+def test_add_season_puts_column_first():
+    df = add_season(pd.DataFrame({'Player': ['Vitinha']}), '2023-2024')
+    assert list(df.columns) == ['Season', 'Player']
@@ -0,0 +1,38 @@
+from assembler_v2 import MAIN_TABLE, OUTFIELD_FILTER, PIPELINE_COLS, LazyAssembly, assembly_plan
+
+
+def ops(nodes):
+    return [node.op for node in nodes]
+
+
+def test_plan_is_deferred():
+    plan = assembly_plan("/nonexistent")
+    assert ops(plan.nodes) == ['scan', 'assemble', 'filter', 'player_ids', 'goalkeepers', 'aggregate_transfers',
+                               'extract_main_position', 'split', 'project']
+    assert plan.nodes[0].args['columns'] is None
+
+
+def test_optimize_pushes_projection_and_predicate_and_fuses():
+    plan = assembly_plan("/nonexistent")
+    scan, *nodes = plan.optimize()
+    assert scan.args['columns'] == PIPELINE_COLS
+    assert scan.args['row_filters'] == {MAIN_TABLE: OUTFIELD_FILTER}
+    assert ops(nodes) == ['assemble', 'player_ids', 'goalkeepers', 'aggregate_transfers',
+                          'extract_main_position', 'split_project']
+    # Le plan écrit n'est pas modifié
+    assert 'filter' in ops(plan.nodes)
+
+
+def test_filter_after_row_changes_stays_in_place():
+    plan = LazyAssembly("/nonexistent").assemble().aggregate_transfers().filter(OUTFIELD_FILTER).split().project()
+    scan, *nodes = plan.optimize()
+    assert scan.args['row_filters'] == {}
+    assert ops(nodes) == ['assemble', 'aggregate_transfers', 'filter', 'split_project']
+
+
+def test_explain_reflects_plan():
+    plan = assembly_plan("/nonexistent")
+    assert "filter(" in plan.explain(optimize=False)
+    optimized = plan.explain()
+    assert "filter(" not in optimized and "filtre players_cleaned.csv" in optimized
+    assert "split_project(DF, MF, FW)" in optimized
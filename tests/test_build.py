@@ -0,0 +1,17 @@
+import build
+
+
+def test_code_dependencies_follow_imports():
+    deps = build.code_dependencies("normalize_ratio.py")
+    assert deps[0] == "ScrapeData/specs.py"
+    assert {"normalize_ratio.py", "storage.py", "column_schema.py"} <= set(deps)
+
+
+def test_code_dependencies_are_transitive():
+    # percentiles -> normalize_ratio -> ScrapeData/specs
+    assert "ScrapeData/specs.py" in build.code_dependencies("percentiles.py")
+
+
+def test_every_step_depends_on_its_script():
+    for step in build.STEPS:
+        assert step.script in build.code_dependencies(step.script)
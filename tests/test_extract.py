@@ -0,0 +1,37 @@
+import pandas as pd
+
+from engine import clean_table, parse_document, table_from_document
+from extract import read_table
+from replay import _table_html
+
+PAGE = """<html><body><div><!--
+<table id="stats_standard"><thead>
+<tr><th colspan="3"></th><th>Playing Time</th></tr>
+<tr><th data-stat="ranker">Rk</th><th data-stat="player">Player</th><th data-stat="born">Born</th><th data-stat="minutes">Min</th></tr>
+</thead><tbody>
+<tr><th>1</th><td data-stat="player" data-append-csv="b08c7f94"><a href="/en/players/b08c7f94/Vitinha">Vitinha</a></td><td>2000</td><td>2,126</td></tr>
+<tr class="thead"><th>Rk</th><th data-stat="player">Player</th><th>Born</th><th>Min</th></tr>
+<tr><th>2</th><td data-stat="player" data-append-csv="a3c8a3d5"><a href="/en/players/a3c8a3d5/Vitinha">Vitinha</a></td><td>2000</td><td>285</td></tr>
+</tbody></table>
+--></div></body></html>"""
+
+
+def test_targeted_read_adds_fbref_ids():
+    df = clean_table(read_table(PAGE, "stats_standard", player_ids=True))
+    assert list(df.columns) == ['Rk', 'Player', 'Born', 'Min', 'FbrefID']
+    assert df['FbrefID'].tolist() == ['b08c7f94', 'a3c8a3d5']
+    assert df['Min'].tolist() == [2126, 285]
+
+
+def test_document_read_adds_fbref_ids_without_changing_document():
+    doc = parse_document(PAGE)
+    df = table_from_document(doc, "stats_standard", player_ids=True)
+    assert df['FbrefID'].tolist() == ['b08c7f94', 'a3c8a3d5']
+    assert 'FbrefID' not in table_from_document(doc, "stats_standard").columns
+
+
+def test_replay_pages_carry_fbref_ids():
+    source = pd.DataFrame({'Player': ['Vitinha', 'Vitinha'], 'Born': [2000, 2000],
+                           'FbrefID': ['b08c7f94', 'a3c8a3d5']})
+    df = clean_table(read_table(_table_html("stats_standard", source), "stats_standard", player_ids=True))
+    assert df[['Player', 'Born', 'FbrefID']].equals(source[['Player', 'Born', 'FbrefID']])
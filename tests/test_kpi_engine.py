@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from column_schema import Column, ColumnSchema
+from kpi_engine import Formula, KPIDefinitionError, evaluate, parse_kpi, tokenize
+
+
+# --- tokenize ---
+
+def test_tokenize_declared_name_with_symbols():
+    assert tokenize("Sh/90", ["Sh/90"]) == [('col', 'Sh/90')]
+
+
+def test_tokenize_undeclared_division():
+    assert tokenize("Sh/90", []) == [('col', 'Sh'), ('op', '/'), ('num', 90.0)]
+
+
+def test_tokenize_longest_declared_name_first():
+    tokens = tokenize("xG+/-90 - xG", ["xG", "xG+/-90"])
+    assert tokens == [('col', 'xG+/-90'), ('op', '-'), ('col', 'xG')]
+
+
+def test_tokenize_name_with_space():
+    assert tokenize("Att 3rd_possession / 90s", ["Att 3rd_possession", "90s"]) == [
+        ('col', 'Att 3rd_possession'), ('op', '/'), ('col', '90s')]
+
+
+def test_tokenize_number_prefix_is_a_name():
+    # 90s est une colonne, pas le nombre 90 suivi de s
+    assert tokenize("Gls / 90s", []) == [('col', 'Gls'), ('op', '/'), ('col', '90s')]
+
+
+def test_tokenize_declared_name_is_not_a_prefix():
+    # Sh déclaré ne doit pas couper ShBlocks
+    assert tokenize("ShBlocks", ["Sh"]) == [('col', 'ShBlocks')]
+
+
+def test_tokenize_unexpected_character():
+    with pytest.raises(KPIDefinitionError, match="inattendu"):
+        tokenize("Gls ^ 2", [])
+
+
+# --- Formula.parse ---
+
+def test_parse_precedence():
+    assert Formula.parse("a + b * c").tree == ('+', ('col', 'a'), ('*', ('col', 'b'), ('col', 'c')))
+
+
+def test_parse_left_associative():
+    assert Formula.parse("a - b - c").tree == ('-', ('-', ('col', 'a'), ('col', 'b')), ('col', 'c'))
+
+
+def test_parse_parentheses_and_negation():
+    formula = Formula.parse("-(Gls - PK) / 90s")
+    assert formula.tree == ('/', ('neg', ('-', ('col', 'Gls'), ('col', 'PK'))), ('col', '90s'))
+    assert formula.columns == ['Gls', 'PK', '90s']
+
+
+def test_parse_columns_deduplicated():
+    assert Formula.parse("Won / (Won + Lost)").columns == ['Won', 'Lost']
+
+
+@pytest.mark.parametrize("text, message", [
+    ("(a + b", "non fermée"),
+    ("a +", "incomplète"),
+    ("a b", "inattendu"),
+])
+def test_parse_errors(text, message):
+    with pytest.raises(KPIDefinitionError, match=message):
+        Formula.parse(text)
+
+
+# --- variantes « sinon » ---
+
+def test_sinon_variants_in_order():
+    kpi = parse_kpi("KP90", "KP_per_90 si dispo sinon KP/90s", "KP[, KP_per_90], 90s")
+    assert [f.text for f in kpi.formulas] == ["KP_per_90", "KP/90s"]
+    assert kpi.formula_for({'KP_per_90', 'KP', '90s'}).text == "KP_per_90"
+    assert kpi.formula_for({'KP', '90s'}).text == "KP/90s"
+    assert kpi.formula_for({'KP'}) is None
+    assert kpi.missing({'KP'}) == [['KP_per_90'], ['90s']]
+
+
+def test_sinon_with_ou_columns():
+    kpi = parse_kpi("TklInt", "(Tkl + Int)/90s si brut sinon Tkl+Int_per_90", "Tkl, Int, 90s ou Tkl+Int_per_90")
+    assert kpi.columns == ['Tkl', 'Int', '90s', 'Tkl+Int_per_90']
+    assert kpi.formulas[1].columns == ['Tkl+Int_per_90']
+
+
+def test_undeclared_column_is_invalid():
+    with pytest.raises(KPIDefinitionError, match="absentes de Colonnes"):
+        parse_kpi("Shots", "Sh / 90s", "Sh")
+
+
+# --- noms logiques famille:nom ---
+
+@pytest.fixture
+def schema():
+    return ColumnSchema([Column('passing', 'Cmp', 'Cmp'), Column('passing', 'Att', 'Att_passing'),
+                         Column('misc', 'Won', 'Won'), Column('misc', 'Lost', 'Lost_misc')])
+
+
+def test_logical_names_resolved_through_schema(schema):
+    kpi = parse_kpi("AerialWin_pct", "misc:Won / (misc:Won + misc:Lost)", "misc:Won, misc:Lost", schema=schema)
+    assert kpi.columns == ['Won', 'Lost_misc']
+    assert kpi.formulas[0].columns == ['Won', 'Lost_misc']
+
+
+def test_unknown_family_is_a_physical_name(schema):
+    kpi = parse_kpi("npGxG", "np:G-xG", "np:G-xG", schema=schema)
+    assert kpi.columns == ['np:G-xG']
+
+
+def test_logical_names_without_schema_stay_unresolved():
+    kpi = parse_kpi("Pass_pct", "passing:Cmp / passing:Att", "passing:Cmp, passing:Att")
+    assert kpi.formula_for({'Cmp', 'Att_passing'}) is None
+
+
+# --- évaluation ---
+
+def test_evaluate_division_by_zero_is_nan(schema):
+    kpis = [parse_kpi("AerialWin_pct", "misc:Won / (misc:Won + misc:Lost)", "misc:Won, misc:Lost", schema=schema),
+            parse_kpi("Missing", "Press / 90s", "Press, 90s")]
+    df = pd.DataFrame({'Won': [3, 0, np.nan], 'Lost_misc': [1, 0, 2]}, index=[10, 11, 12])
+    block, unavailable = evaluate(df, kpis)
+    assert block.index.tolist() == [10, 11, 12]
+    np.testing.assert_array_equal(block['AerialWin_pct'].to_numpy(), [0.75, np.nan, np.nan])
+    assert unavailable == {'Missing': [['Press', '90s']]}
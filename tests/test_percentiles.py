@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from percentiles import kpi_ranks, rank_metrics
+
+
+def test_rank_metrics_percentile_ties_and_z():
+    df = pd.DataFrame({'x': [1.0, 2.0, 2.0, 5.0]})
+    ranks = rank_metrics(df, ['x'])
+    assert ranks['x_percentile'].tolist() == [25.0, 75.0, 75.0, 100.0]
+    np.testing.assert_allclose(ranks['x_z'], (df['x'] - df['x'].mean()) / df['x'].std())
+
+
+def test_rank_metrics_by_group():
+    df = pd.DataFrame({'Position': ['DF', 'DF', 'FW'], 'x': [1.0, 3.0, 0.0]})
+    ranks = rank_metrics(df, ['x'], by=['Position'])
+    assert ranks['x_percentile'].tolist() == [50.0, 100.0, 100.0]
+    assert np.isnan(ranks.loc[2, 'x_z'])
+
+
+def test_kpi_ranks_keys_and_columns():
+    kpi = pd.DataFrame({'PlayerID': [7, 3], 'Player': ['A', 'B'], 'Min': [900, 1800],
+                        'Tackles_per90': [1.0, 2.0]}, index=[10, 11])
+    ranks = kpi_ranks(kpi, 'DF')
+    assert ranks.columns.tolist() == ['PlayerID', 'Position', 'Tackles_per90_percentile', 'Tackles_per90_z']
+    assert ranks.index.tolist() == [10, 11]
+    assert ranks['PlayerID'].tolist() == [7, 3]
+    assert (ranks['Position'] == 'DF').all()
@@ -0,0 +1,70 @@
+import pandas as pd
+
+from player_registry import PlayerRegistry, add_player_ids
+
+
+def players(rows):
+    return pd.DataFrame(rows, columns=['FbrefID', 'Player', 'Born', 'Nation', 'Squad'])
+
+
+def registry(tmp_path):
+    return PlayerRegistry(tmp_path / "player_registry.csv")
+
+
+def test_namesakes_with_distinct_fbref_ids_are_distinct_players(tmp_path):
+    # Deux Vitinha, nés en 2000, portugais : l'un à Paris, l'autre de Genoa à Marseille
+    df = players([
+        ['b08c7f94', 'Vitinha', 2000, 'pt POR', 'Paris S-G'],
+        ['a3c8a3d5', 'Vitinha', 2000, 'pt POR', 'Genoa'],
+        ['a3c8a3d5', 'Vitinha', 2000, 'pt POR', 'Marseille'],
+    ])
+    ids = registry(tmp_path).assign(df)
+    assert ids[0] != ids[1]
+    assert ids[1] == ids[2]
+
+
+def test_fbref_id_wins_over_name_variants(tmp_path):
+    reg = registry(tmp_path)
+    first = reg.assign(players([['e06683ca', 'Vinicius Júnior', 2000, 'br BRA', 'Real Madrid']]))
+    again = reg.assign(players([['e06683ca', 'Vini Jr.', 2000, 'br BRA', 'Real Madrid']]))
+    assert first[0] == again[0]
+    # La nouvelle orthographe est gardée comme variante du joueur
+    assert set(reg.table['Player']) == {'Vinicius Júnior', 'Vini Jr.'}
+
+
+def test_rows_without_fbref_id_fall_back_to_name_key(tmp_path):
+    reg = registry(tmp_path)
+    first = reg.assign(players([['92e7e919', 'Son Heung-min', 1992, 'kr KOR', 'Tottenham']]))
+    df = players([[None, 'Son Heung-min', 1992, 'kr KOR', 'Tottenham']]).drop(columns='FbrefID')
+    assert reg.assign(df)[0] == first[0]
+
+
+def test_name_key_fallback_skips_ambiguous_namesakes(tmp_path):
+    reg = registry(tmp_path)
+    reg.assign(players([['b08c7f94', 'Vitinha', 2000, 'pt POR', 'Paris S-G'],
+                        ['a3c8a3d5', 'Vitinha', 2000, 'pt POR', 'Marseille']]))
+    ids = reg.assign(players([[None, 'Vitinha', 2000, 'pt POR', 'Paris S-G']]))
+    assert ids[0] == 3
+
+
+def test_legacy_registry_gains_fbref_ids_once(tmp_path):
+    path = tmp_path / "player_registry.csv"
+    legacy = PlayerRegistry(path)
+    old = legacy.assign(players([[None, 'Rodri', 1996, 'es ESP', 'Manchester City']]))
+    legacy.save(csv=True)
+
+    reg = PlayerRegistry(path)
+    ids = reg.assign(players([['6434f10d', 'Rodri', 1996, 'es ESP', 'Manchester City'],
+                              ['8ac36c0c', 'Rodri', 1990, 'es ESP', 'Real Betis']]))
+    assert ids[0] == old[0]
+    assert ids[1] != old[0]
+    # Un autre identifiant FBref ne peut plus revendiquer ce joueur
+    other = reg.assign(players([['ffffffff', 'Rodri', 1996, 'es ESP', 'Getafe']]))
+    assert other[0] not in (old[0], ids[1])
+
+
+def test_add_player_ids_puts_id_first(tmp_path):
+    df = add_player_ids(players([['b08c7f94', 'Vitinha', 2000, 'pt POR', 'Paris S-G']]),
+                        registry(tmp_path), verbose=False)
+    assert list(df.columns)[:2] == ['PlayerID', 'FbrefID']
+    assert df['PlayerID'].dtype == 'int64'
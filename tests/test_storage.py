@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from storage import COMPACT_RTOL, check_compact, compact_dtypes
+
+
+# --- compact_dtypes ---
+
+def test_compact_int16_when_in_range():
+    df = compact_dtypes(pd.DataFrame({'MP': np.array([0, 38, -5], dtype='int64')}))
+    assert df['MP'].dtype == 'int16'
+
+
+def test_compact_int32_on_int16_overflow():
+    df = compact_dtypes(pd.DataFrame({'Min': np.array([0, 3420, 40000], dtype='int64'),
+                                      'Low': np.array([-40000, 0, 1], dtype='int64')}))
+    assert df['Min'].dtype == 'int32'
+    assert df['Low'].dtype == 'int32'
+    assert df['Min'].tolist() == [0, 3420, 40000]
+
+
+def test_compact_int64_kept_beyond_int32():
+    df = compact_dtypes(pd.DataFrame({'TotDist': np.array([0, 2**40], dtype='int64')}))
+    assert df['TotDist'].dtype == 'int64'
+
+
+def test_compact_nullable_ints():
+    df = compact_dtypes(pd.DataFrame({'Born': pd.array([1998, None, 2001], dtype='Int64'),
+                                      'Big': pd.array([None, 70000, 1], dtype='Int64')}))
+    assert df['Born'].dtype == 'Int16'
+    assert df['Big'].dtype == 'Int32'
+    assert df['Born'].isna().tolist() == [False, True, False]
+
+
+def test_compact_all_missing_nullable_int():
+    df = compact_dtypes(pd.DataFrame({'PKwon': pd.array([None, None], dtype='Int64')}))
+    assert df['PKwon'].dtype == 'Int16'
+
+
+def test_compact_keeps_player_id_int64():
+    df = compact_dtypes(pd.DataFrame({'PlayerID': np.array([1, 2, 3], dtype='int64')}))
+    assert df['PlayerID'].dtype == 'int64'
+
+
+def test_compact_floats_and_categories():
+    df = compact_dtypes(pd.DataFrame({'xG': [0.5, np.nan], 'Squad': ['Arsenal', 'Lens'], 'Player': ['A', 'B']}))
+    assert df['xG'].dtype == 'float32'
+    assert isinstance(df['Squad'].dtype, pd.CategoricalDtype)
+    assert not isinstance(df['Player'].dtype, pd.CategoricalDtype)
+
+
+def test_compact_returns_a_copy():
+    original = pd.DataFrame({'xG': [0.5, 1.5]})
+    compact_dtypes(original)
+    assert original['xG'].dtype == 'float64'
+
+
+# --- check_compact ---
+
+def test_check_compact_within_tolerance():
+    original = pd.DataFrame({'xG': [0.1, 1 / 3, np.nan, 1e6 + 0.1], 'MP': [1, 2, 3, 40000]})
+    errors = check_compact(original, compact_dtypes(original))
+    assert errors.index.tolist() == ['xG']
+    assert 0 < errors['xG'] <= COMPACT_RTOL
+
+
+def test_check_compact_tolerance_bound():
+    original = pd.DataFrame({'xG': [1.0, 2.0]})
+    compacted = pd.DataFrame({'xG': np.array([1.0, 2.0 * (1 + 1e-5)], dtype='float32')})
+    with pytest.raises(ValueError, match="erreur relative"):
+        check_compact(original, compacted)
+    errors = check_compact(original, compacted, rtol=1e-4)
+    assert errors['xG'] == pytest.approx(1e-5, rel=1e-2)
+
+
+def test_check_compact_detects_moved_nan():
+    original = pd.DataFrame({'xG': [0.5, np.nan, 1.0]})
+    compacted = pd.DataFrame({'xG': np.array([np.nan, 0.5, 1.0], dtype='float32')})
+    with pytest.raises(ValueError, match="valeurs manquantes"):
+        check_compact(original, compacted)
+
+
+def test_check_compact_detects_changed_ints():
+    original = pd.DataFrame({'MP': [1, 2, 70000]})
+    compacted = pd.DataFrame({'MP': np.array([1, 2, 70000], dtype='int64').astype('int16')})
+    with pytest.raises(ValueError, match="entiers modifiés"):
+        check_compact(original, compacted)